@@ -4,18 +4,35 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from app.schemas.user import UserResponse
 from app.models.user import User
+from app.auth.token_cache import token_cache, token_claims
+from app.auth.redis import is_blacklisted, sync_revocations
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme)
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    _revocations_synced: None = Depends(sync_revocations),
 ) -> UserResponse:
     """
     Dependency to get the current user from the JWT token without a database lookup.
     This function supports two types of payloads:
       - A full payload as a dict containing user info.
       - A minimal payload, either as a dict with only a 'sub' key or directly as a UUID.
+
+    Verified principals are cached per token (app.auth.token_cache) until the
+    token expires, so repeat requests skip decoding; revoked tokens are rejected.
+    On a cache miss the token's jti is checked against the blacklist (this
+    worker's Bloom filter, then Redis for probable positives).
+    Tokens revoked on other workers are pulled in by sync_revocations at most
+    BLACKLIST_SYNC_SECONDS after the revocation.
+
+    Nothing here blocks (a cache lookup and a JWT decode), so it is a
+    coroutine: authenticated requests do not take a threadpool slot.
     """
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -26,6 +43,18 @@ def get_current_user(
     if token_data is None:
         raise credentials_exception
 
+    claims = token_claims(token)
+    if claims is not None and claims[1] is not None:
+        if token_cache.is_revoked(claims[1]) or await is_blacklisted(claims[1]):
+            raise credentials_exception
+
+    user = _user_from_token_data(token_data, credentials_exception)
+    if claims is not None:
+        token_cache.put(token, user, *claims)
+    return user
+
+def _user_from_token_data(token_data, credentials_exception: HTTPException) -> UserResponse:
+    """Build the UserResponse principal from verify_token()'s result."""
     try:
         # If the token data is a dictionary:
         if isinstance(token_data, dict):
@@ -67,7 +96,7 @@ def get_current_user(
     except Exception:
         raise credentials_exception
 
-def get_current_active_user(
+async def get_current_active_user(
     current_user: UserResponse = Depends(get_current_user)
 ) -> UserResponse:
     """
@@ -0,0 +1,134 @@
+# app/auth/hashing.py
+"""
+Password hashing off the request path.
+
+bcrypt is deliberately slow (~250 ms of CPU per call at 12 rounds), so the
+async endpoints send hash/verify calls to a small, dedicated process pool
+instead of running them on the event loop or the shared threadpool. The pool
+is bounded: once PASSWORD_HASH_WORKERS calls are running and
+PASSWORD_HASH_MAX_QUEUE more are waiting, further calls are rejected at once
+with 503 rather than queueing behind the storm.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Password hashing
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+
+def _hash(password: str) -> str:
+    # Runs in a pool worker; must stay a picklable module-level function
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    # Runs in a pool worker; must stay a picklable module-level function
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasherPool:
+    """
+    Bounded executor for bcrypt work.
+
+    Args:
+        workers: Worker processes; 0 runs calls on the shared threadpool
+            instead (still bounded), e.g. where subprocesses are unavailable
+        max_queue: Calls allowed to wait for a free worker before new calls
+            are rejected with 503
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.limit = max(workers, 1) + max_queue
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: never fork a process that is running an event loop and threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self.in_flight >= self.limit:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service is busy, please retry shortly.",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    async def run(self, func: Callable, *args):
+        """
+        Run func(*args) on the pool and return its result.
+
+        Raises:
+            HTTPException: 503 if the pool and its queue are full
+        """
+        self._acquire()
+        try:
+            if self.workers == 0:
+                return await run_in_threadpool(func, *args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._release()
+
+    async def hash(self, password: str) -> str:
+        """Hash a password using bcrypt."""
+        return await self.run(_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a plain password against its hash."""
+        return await self.run(_verify, plain_password, hashed_password)
+
+    def stats(self) -> Dict:
+        """Current load of the pool."""
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (they are restarted on next use)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+password_hasher = PasswordHasherPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
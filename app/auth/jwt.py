@@ -2,13 +2,13 @@
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional, Union
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from uuid import UUID
 import secrets
 
 from app.core.config import get_settings
+from app.auth.hashing import pwd_context
 from app.auth.redis import add_to_blacklist, is_blacklisted
 from app.schemas.token import TokenType
 from app.database import get_db
@@ -17,13 +17,6 @@ from app.models.user import User
 
 settings = get_settings()
 
-# Password hashing
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=settings.BCRYPT_ROUNDS
-)
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -1,22 +1,141 @@
 # app/auth/redis.py
-from redis import asyncio as aioredis
+import time
+from typing import Dict, Optional
+
 from app.core.config import get_settings
+from app.core.redis_client import redis_client
+from app.auth.bloom import BloomFilter
+from app.auth.token_cache import TokenCache, token_cache
 
 settings = get_settings()
 
+# Sorted set of every blacklisted JTI, scored by the time it was added;
+# workers pull new members from it to keep their local filters in sync
+BLACKLIST_INDEX_KEY = "blacklist:index"
+
+# Re-read this many seconds before the last sync point to tolerate clock skew
+# between workers writing to the index
+SYNC_OVERLAP_SECONDS = 5.0
+
 async def get_redis():
-    if not hasattr(get_redis, "redis"):
-        get_redis.redis = await aioredis.from_url(
-            settings.REDIS_URL or "redis://localhost"
+    """The shared Redis client (falls back to memory while Redis is down)."""
+    return redis_client
+
+
+class BlacklistFilter:
+    """
+    Per-worker Bloom filter of revoked JTIs.
+
+    The filter is refreshed from BLACKLIST_INDEX_KEY at most every
+    sync_interval seconds (a delta pull of members added since the last sync),
+    and JTIs blacklisted by this worker are added immediately. A JTI that is
+    not in the filter is certainly not blacklisted, so only probable positives
+    are checked against Redis. A revocation made by another worker is seen
+    after at most sync_interval seconds.
+
+    Pulled JTIs are also revoked in the worker's token cache, which answers
+    get_current_user without consulting the filter.
+
+    Args:
+        capacity: JTIs the filter holds before it is rebuilt from Redis
+        error_rate: Target false-positive rate at capacity
+        sync_interval: Seconds between delta pulls from Redis
+        cache: The verified-token cache to revoke pulled JTIs in
+    """
+
+    def __init__(self, capacity: int, error_rate: float, sync_interval: float, cache: Optional[TokenCache] = None):
+        self.capacity = capacity
+        self.cache = cache if cache is not None else token_cache
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.filter = BloomFilter(capacity, error_rate)
+        self.checks = 0
+        self.redis_checks = 0
+        self.syncs = 0
+        self._high_water = 0.0
+        self._synced_at: Optional[float] = None
+
+    def add(self, jti: str) -> None:
+        """Record a JTI revoked by this worker."""
+        self.filter.add(jti)
+
+    def might_contain(self, jti: str) -> bool:
+        """False if jti is certainly not blacklisted."""
+        self.checks += 1
+        if jti in self.filter:
+            self.redis_checks += 1
+            return True
+        return False
+
+    def reset(self) -> None:
+        """Empty the filter; the next sync() pulls the full index."""
+        self.filter = BloomFilter(self.capacity, self.error_rate)
+        self._high_water = 0.0
+        self._synced_at = None
+
+    async def sync(self, redis, force: bool = False) -> None:
+        """Pull JTIs added to the index since the last sync, if one is due."""
+        now = time.monotonic()
+        if not force and self._synced_at is not None and now - self._synced_at < self.sync_interval:
+            return
+        if self.filter.count > self.capacity:
+            # Bloom filters cannot delete; start over from the (pruned) index
+            self.reset()
+        self._synced_at = now
+        members = await redis.zrangebyscore(
+            BLACKLIST_INDEX_KEY, max(self._high_water - SYNC_OVERLAP_SECONDS, 0), "+inf", withscores=True
         )
-    return get_redis.redis
+        # Access tokens expire at most this long after they were revoked
+        access_lifetime = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        wall_clock = time.time()
+        for member, score in members:
+            jti = member.decode() if isinstance(member, bytes) else member
+            self.filter.add(jti)
+            if score + access_lifetime > wall_clock:
+                self.cache.revoke(jti, score + access_lifetime - wall_clock)
+            self._high_water = max(self._high_water, score)
+        self.syncs += 1
+
+    def stats(self) -> Dict:
+        """Lookup counters and filter fill."""
+        return {
+            "filter_entries": self.filter.count,
+            "capacity": self.capacity,
+            "checks": self.checks,
+            "redis_checks": self.redis_checks,
+            "syncs": self.syncs,
+        }
+
+
+blacklist_filter = BlacklistFilter(
+    capacity=settings.BLACKLIST_BLOOM_CAPACITY,
+    error_rate=settings.BLACKLIST_BLOOM_ERROR_RATE,
+    sync_interval=settings.BLACKLIST_SYNC_SECONDS,
+)
 
 async def add_to_blacklist(jti: str, exp: int):
     """Add a token's JTI to the blacklist"""
+    token_cache.revoke(jti, exp)
+    blacklist_filter.add(jti)
     redis = await get_redis()
+    now = time.time()
+    max_token_lifetime = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
     await redis.set(f"blacklist:{jti}", "1", ex=exp)
+    await redis.zadd(BLACKLIST_INDEX_KEY, {jti: now})
+    # Every token revoked this long ago has expired on its own
+    await redis.zremrangebyscore(BLACKLIST_INDEX_KEY, "-inf", now - max_token_lifetime)
+
+async def sync_revocations() -> None:
+    """
+    Dependency of get_current_user: pull revocations made on other workers
+    into this worker's filter and token cache, if a sync is due.
+    """
+    await blacklist_filter.sync(await get_redis())
 
 async def is_blacklisted(jti: str) -> bool:
     """Check if a token's JTI is blacklisted"""
     redis = await get_redis()
-    return await redis.exists(f"blacklist:{jti}")
\ No newline at end of file
+    await blacklist_filter.sync(redis)
+    if not blacklist_filter.might_contain(jti):
+        return False
+    return bool(await redis.exists(f"blacklist:{jti}"))
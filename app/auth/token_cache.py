@@ -0,0 +1,144 @@
+# app/auth/token_cache.py
+"""
+In-process cache of verified access tokens.
+
+get_current_user runs on every authenticated request. Once a token has been
+verified, the resulting principal is kept here, keyed by the SHA-256 digest
+of the token (the raw token is never stored), until the token's own `exp`
+or TOKEN_CACHE_TTL_SECONDS, whichever comes first. The cache is a bounded
+LRU and is per worker process.
+
+Revocation: revoke(jti, ...) records the token id for the rest of its
+lifetime, so a cached or re-presented revoked token is rejected by this
+worker without a Redis round trip. app.auth.redis calls it for tokens
+revoked by this worker (add_to_blacklist) and for those its blacklist sync
+pulls in from other workers.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from jose import jwt, JWTError
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+def token_claims(token: str) -> Optional[Tuple[float, Optional[str]]]:
+    """
+    Read (exp, jti) from an already-verified token without re-checking it.
+
+    Returns:
+        tuple: (exp, jti), or None if the token carries no usable `exp`
+    """
+    try:
+        claims = jwt.get_unverified_claims(token)
+    except JWTError:
+        return None
+    exp = claims.get("exp")
+    if not isinstance(exp, (int, float)):
+        return None
+    return float(exp), claims.get("jti")
+
+
+class TokenCache:
+    """
+    Bounded LRU/TTL map of token digest -> verified principal.
+
+    Args:
+        max_entries: Entries kept before the least recently used is evicted
+        ttl_seconds: Upper bound on how long an entry is trusted
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[Any, float, Optional[str]]]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Any]:
+        """Return the cached principal for token, or None on a miss."""
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                principal, expires_at, jti = entry
+                if expires_at > now and not self._is_revoked(jti, now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return principal
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, principal: Any, exp: float, jti: Optional[str] = None) -> None:
+        """Cache principal for token until min(exp, now + ttl)."""
+        if self.max_entries <= 0:
+            return
+        now = time.time()
+        expires_at = min(exp, now + self.ttl_seconds)
+        if expires_at <= now:
+            return
+        key = self._key(token)
+        with self._lock:
+            if self._is_revoked(jti, now):
+                return
+            self._entries[key] = (principal, expires_at, jti)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def revoke(self, jti: str, expires_in: float) -> None:
+        """Reject the token with this jti for the next expires_in seconds."""
+        now = time.time()
+        with self._lock:
+            self._revoked[jti] = now + expires_in
+            # Drop revocations that have outlived their token
+            for stale in [j for j, until in self._revoked.items() if until <= now]:
+                del self._revoked[stale]
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """True if jti was revoked and its token has not yet expired."""
+        with self._lock:
+            return self._is_revoked(jti, time.time())
+
+    def _is_revoked(self, jti: Optional[str], now: float) -> bool:
+        return jti is not None and self._revoked.get(jti, 0) > now
+
+    def clear(self) -> None:
+        """Drop all cached principals, revocations and counters."""
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "revoked": len(self._revoked),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+token_cache = TokenCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
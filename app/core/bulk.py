@@ -0,0 +1,291 @@
+# app/core/bulk.py
+"""
+Set-based bulk mutations of a user's calculations.
+
+DELETE /calculations and PATCH /calculations change many rows without
+loading them into the session: every statement is a single Core DELETE or
+UPDATE whose WHERE clause includes user_id, so ownership is enforced by the
+database and a 100k-row cleanup is one round trip instead of 100k.
+
+Id lists are bound as one array parameter on PostgreSQL (id = ANY(:ids)),
+so their length is not limited by the driver's bind-parameter cap. Other
+databases get an expanding IN, issued in chunks below SQLite's limit.
+Batch edits likewise join one unnest() of arrays on PostgreSQL, and chunked
+VALUES lists elsewhere, and count the rows their RETURNING gives back.
+
+Single-row PUT and DELETE follow the same pattern: one ownership-checked
+UPDATE ... RETURNING or DELETE ... RETURNING id instead of SELECT, mutate,
+commit and refresh.
+"""
+
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Float, Integer, Text, any_, bindparam, case, cast, column, delete, func, literal, select, text, update
+from sqlalchemy.engine import Row
+from sqlalchemy.dialects.postgresql import ARRAY, DOUBLE_PRECISION
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.result_cache import result_cache
+from app.models.calculation import Calculation
+from app.operations.vectorized import evaluate_many
+from app.schemas.calculation import CalculationType
+
+# Ids per statement on databases without array parameters (SQLite allows 32766 binds)
+IN_CHUNK_SIZE = 30000
+
+CALCULATION_TYPES = [calc_type.value for calc_type in CalculationType]
+
+
+def _id_batches(dialect_name: str, ids: Sequence[UUID]) -> List:
+    """WHERE clauses that together match `ids`: one on PostgreSQL, chunks elsewhere."""
+    if dialect_name == "postgresql":
+        return [Calculation.id == any_(bindparam("ids", list(ids), type_=ARRAY(PG_UUID(as_uuid=True))))]
+    return [
+        Calculation.id.in_(ids[start:start + IN_CHUNK_SIZE])
+        for start in range(0, len(ids), IN_CHUNK_SIZE)
+    ]
+
+
+def _filters(user_id, calc_type: Optional[str], created_from: Optional[datetime], created_to: Optional[datetime]):
+    conditions = [Calculation.user_id == user_id]
+    if calc_type is not None:
+        conditions.append(Calculation.type == calc_type)
+    if created_from is not None:
+        conditions.append(Calculation.created_at >= created_from)
+    if created_to is not None:
+        conditions.append(Calculation.created_at < created_to)
+    return conditions
+
+
+async def delete_calculations(
+    db: AsyncSession,
+    user_id,
+    ids: Optional[Sequence[UUID]] = None,
+    calc_type: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> int:
+    """
+    Delete the user's calculations matching every given criterion.
+
+    Returns:
+        int: Number of rows deleted (the caller commits)
+    """
+    conditions = _filters(user_id, calc_type, created_from, created_to)
+    batches = [None] if ids is None else _id_batches(db.bind.dialect.name, list(dict.fromkeys(ids)))
+    deleted = 0
+    for id_condition in batches:
+        stmt = delete(Calculation.__table__).where(*conditions)
+        if id_condition is not None:
+            stmt = stmt.where(id_condition)
+        deleted += (await db.execute(stmt)).rowcount
+    return deleted
+
+
+async def calculation_types(db: AsyncSession, user_id, ids: Iterable[UUID]) -> Dict[UUID, str]:
+    """Map each of `ids` that the user owns to its calculation type."""
+    ids = list(dict.fromkeys(ids))
+    types: Dict[UUID, str] = {}
+    for id_condition in _id_batches(db.bind.dialect.name, ids):
+        result = await db.execute(
+            select(Calculation.id, Calculation.type).where(Calculation.user_id == user_id, id_condition)
+        )
+        types.update(result.tuples().all())
+    return types
+
+
+def evaluate_for_every_type(inputs_list: Sequence[Sequence[float]]) -> List[Tuple[Dict[str, float], Dict[str, str]]]:
+    """
+    Evaluate each inputs list as every calculation type, for updates made
+    without first reading the rows' types.
+
+    Returns:
+        list: ({type: result}, {type: error}) per inputs list
+    """
+    outcomes = evaluate_many([(calc_type, inputs) for inputs in inputs_list for calc_type in CALCULATION_TYPES])
+    evaluated = []
+    for start in range(0, len(outcomes), len(CALCULATION_TYPES)):
+        pairs = list(zip(CALCULATION_TYPES, outcomes[start:start + len(CALCULATION_TYPES)]))
+        evaluated.append((
+            {calc_type: result for calc_type, (result, error) in pairs if error is None},
+            {calc_type: error for calc_type, (result, error) in pairs if error is not None},
+        ))
+    return evaluated
+
+
+def _array_literal(values: Sequence[float]) -> str:
+    # PostgreSQL array literal; repr() round-trips every float exactly
+    names = {math.inf: "Infinity", -math.inf: "-Infinity"}
+    return "{" + ",".join("NaN" if math.isnan(v) else names.get(v, repr(float(v))) for v in values) + "}"
+
+
+def _edit_values(rows: List[dict], dialect_name: str) -> List:
+    """
+    The edits as derived tables v(id, inputs, r_<type>..., valid), one per
+    statement: a single unnest() of arrays on PostgreSQL, VALUES lists in
+    chunks below the bind-parameter limit elsewhere.
+
+    valid has bit i set when the inputs are valid for CALCULATION_TYPES[i].
+    """
+    table = Calculation.__table__
+    masks = [
+        sum(1 << bit for bit, calc_type in enumerate(CALCULATION_TYPES) if calc_type in row["results"])
+        for row in rows
+    ]
+    names = ["id", "inputs", *(f"r_{calc_type}" for calc_type in CALCULATION_TYPES), "valid"]
+    if dialect_name == "postgresql":
+        arrays = [
+            bindparam("v_id", [row["id"] for row in rows], type_=ARRAY(PG_UUID(as_uuid=True))),
+            bindparam("v_inputs", [_array_literal(row["inputs"]) for row in rows], type_=ARRAY(Text)),
+            *(
+                bindparam(f"v_r_{calc_type}", [row["results"].get(calc_type) for row in rows], type_=ARRAY(DOUBLE_PRECISION))
+                for calc_type in CALCULATION_TYPES
+            ),
+            bindparam("v_valid", masks, type_=ARRAY(Integer)),
+        ]
+        source = func.unnest(*arrays).table_valued(*names).render_derived(name="v")
+        return [(source, cast(source.c.inputs, ARRAY(DOUBLE_PRECISION)))]
+
+    per_row = len(names)
+    chunk_size = max(1, IN_CHUNK_SIZE // per_row)
+    sources = []
+    for start in range(0, len(rows), chunk_size):
+        params, tuples = [], []
+        for position, row in enumerate(rows[start:start + chunk_size], start):
+            values = [
+                (row["id"], table.c.id.type),
+                (row["inputs"], table.c.inputs.type),
+                *((row["results"].get(calc_type), Float()) for calc_type in CALCULATION_TYPES),
+                (masks[position], Integer()),
+            ]
+            keys = [f"v{position}_{column}" for column in range(per_row)]
+            params.extend(bindparam(key, value, type_=type_) for key, (value, type_) in zip(keys, values))
+            tuples.append("(" + ", ".join(f":{key}" for key in keys) + ")")
+        # SQLite names VALUES columns column1, column2, ...
+        labels = ", ".join(f"column{n} AS {name}" for n, name in enumerate(names, 1))
+        source = (
+            text(f"SELECT {labels} FROM (VALUES {', '.join(tuples)})")
+            .bindparams(*params)
+            .columns(*(column(name) for name in names))
+            .subquery("v")
+        )
+        sources.append((source, source.c.inputs))
+    return sources
+
+
+async def update_calculation_inputs(db: AsyncSession, user_id, rows: List[dict]) -> List[UUID]:
+    """
+    Store new inputs and results for the user's calculations.
+
+    One UPDATE ... FROM v per derived table of edits (see _edit_values): each
+    row takes the result computed for its stored type and is skipped if the
+    inputs are invalid for that type. Nothing is read beforehand.
+
+    Args:
+        rows: {"id", "inputs", "results": {type: result}} dicts with distinct
+            ids, results as from evaluate_for_every_type()
+
+    Returns:
+        list: Ids of the rows actually updated (the caller commits)
+    """
+    if not rows:
+        return []
+    table = Calculation.__table__
+    updated: List[UUID] = []
+    for source, inputs in _edit_values(rows, db.bind.dialect.name):
+        result = case(
+            {calc_type: source.c[f"r_{calc_type}"] for calc_type in CALCULATION_TYPES},
+            value=table.c.type,
+        )
+        valid = case(
+            {calc_type: source.c.valid.op("&")(1 << bit) for bit, calc_type in enumerate(CALCULATION_TYPES)},
+            value=table.c.type,
+            else_=0,
+        )
+        stmt = (
+            update(table)
+            .where(table.c.id == source.c.id, table.c.user_id == user_id, valid != 0)
+            .values(inputs=inputs, result=result, updated_at=datetime.utcnow())
+            .returning(table.c.id)
+        )
+        updated.extend((await db.execute(stmt)).scalars().all())
+    return updated
+
+
+def _evaluate_one(calc_type: str, inputs: Sequence[float]) -> float:
+    [(result, error)] = evaluate_many([(calc_type, inputs)])
+    if error is not None:
+        raise ValueError(error)
+    return result
+
+
+async def results_by_type(inputs: Sequence[float]) -> Tuple[object, Dict[str, str]]:
+    """
+    Evaluate `inputs` as every calculation type, before knowing the row's type.
+
+    Each result goes through result_cache, so repeating an edit (or editing
+    to inputs already computed for any type) recomputes nothing.
+
+    Returns:
+        tuple: (a CASE on calculations.type choosing the matching result,
+        or None if no type accepts the inputs; {type: error} for the types
+        the inputs are invalid for)
+    """
+    results: Dict[str, float] = {}
+    errors: Dict[str, str] = {}
+    for calc_type in CALCULATION_TYPES:
+        try:
+            results[calc_type] = await result_cache.get_or_compute(
+                calc_type, inputs, lambda calc_type=calc_type: _evaluate_one(calc_type, inputs)
+            )
+        except ValueError as e:
+            errors[calc_type] = str(e)
+    if not results:
+        return None, errors
+    return case(
+        {calc_type: literal(result) for calc_type, result in results.items()},
+        value=Calculation.type,
+        else_=None,
+    ), errors
+
+
+async def update_calculation_returning(
+    db: AsyncSession, user_id, calc_id: UUID, inputs: Optional[Sequence[float]]
+) -> Tuple[Optional[Row], Optional[str]]:
+    """
+    Update one of the user's calculations in a single UPDATE ... RETURNING.
+
+    With inputs, the result is computed up front for every type (memoized
+    in result_cache) and the statement picks the one matching the stored type.
+
+    Returns:
+        tuple: (the updated row or None if the user has no such calculation,
+        the evaluation error for its type, if any; the caller then rolls back)
+    """
+    table = Calculation.__table__
+    values = {"updated_at": datetime.utcnow()}
+    errors: Dict[str, str] = {}
+    if inputs is not None:
+        values["result"], errors = await results_by_type(inputs)
+        values["inputs"] = inputs
+    result = await db.execute(
+        update(table)
+        .where(table.c.id == calc_id, table.c.user_id == user_id)
+        .values(**values)
+        .returning(*table.c)
+    )
+    row = result.first()
+    return row, (errors.get(row.type) if row is not None else None)
+
+
+async def delete_calculation_returning(db: AsyncSession, user_id, calc_id: UUID) -> bool:
+    """Delete one of the user's calculations; False if they have no such calculation."""
+    table = Calculation.__table__
+    result = await db.execute(
+        delete(table).where(table.c.id == calc_id, table.c.user_id == user_id).returning(table.c.id)
+    )
+    return result.first() is not None
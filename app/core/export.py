@@ -0,0 +1,93 @@
+# app/core/export.py
+"""
+Streaming export of a user's calculation history.
+
+Rows are read through a server-side cursor (yield_per) and formatted one
+partition at a time, so memory use is bounded by EXPORT_YIELD_PER rows no
+matter how long the history is, and the first bytes go out as soon as the
+first partition arrives.
+"""
+
+import csv
+import io
+import json
+import math
+from typing import AsyncIterator, Iterable, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.models.calculation import Calculation
+
+EXPORT_COLUMNS = ("id", "type", "inputs", "result", "created_at", "updated_at")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _record(row: Sequence) -> dict:
+    calc_id, calc_type, inputs, result, created_at, updated_at = row
+    return {
+        "id": str(calc_id),
+        "type": calc_type,
+        "inputs": list(inputs),
+        "result": result,
+        "created_at": created_at.isoformat(),
+        "updated_at": updated_at.isoformat(),
+    }
+
+
+def _finite_or_none(value):
+    # JSON has no Infinity/NaN; write null like the API responses do
+    return value if value is None or math.isfinite(value) else None
+
+
+def format_ndjson(rows: Iterable[Sequence]) -> str:
+    """One JSON object per line; non-finite numbers are written as null."""
+    lines = []
+    for row in rows:
+        record = _record(row)
+        record["inputs"] = [_finite_or_none(value) for value in record["inputs"]]
+        record["result"] = _finite_or_none(record["result"])
+        lines.append(json.dumps(record, allow_nan=False) + "\n")
+    return "".join(lines)
+
+
+def format_csv(rows: Iterable[Sequence], header: bool = False) -> str:
+    """CSV lines; inputs are written as a JSON array in a single cell."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        record = _record(row)
+        record["inputs"] = json.dumps(record["inputs"])
+        writer.writerow(record[column] for column in EXPORT_COLUMNS)
+    return buffer.getvalue()
+
+
+async def stream_calculations(
+    bind: AsyncEngine, user_id, export_format: str, yield_per: int
+) -> AsyncIterator[bytes]:
+    """
+    Yield a user's calculations, newest first, as encoded NDJSON or CSV chunks.
+
+    The generator opens its own session on `bind`: a StreamingResponse keeps
+    reading after the request's own session has been closed.
+    """
+    if export_format == "csv":
+        yield format_csv([], header=True).encode()
+    formatter = format_csv if export_format == "csv" else format_ndjson
+
+    stmt = (
+        select(*(getattr(Calculation, column) for column in EXPORT_COLUMNS))
+        .where(Calculation.user_id == user_id)
+        .order_by(Calculation.created_at.desc(), Calculation.id.desc())
+        .execution_options(yield_per=yield_per)
+    )
+    async with AsyncSession(bind=bind) as session:
+        result = await session.stream(stmt)
+        async for partition in result.partitions():
+            yield formatter(partition).encode()
@@ -0,0 +1,127 @@
+# app/core/fast_json.py
+"""
+Fast JSON serialization of calculations.
+
+The default response path builds a CalculationResponse from every ORM object
+(re-validating data the database just handed back) and then encodes it. With
+FAST_JSON_RESPONSES enabled the calculation endpoints instead turn ORM
+objects, or plain Core rows, into dicts and encode them with msgspec in one
+call.
+
+The output is byte-for-byte what CalculationResponse.model_dump_json()
+produces: same field order, floats for inputs and result, canonical UUID
+strings, ISO 8601 datetimes ('Z' for UTC) and null for non-finite numbers.
+tests/unit/test_fast_json.py checks that parity.
+
+Sparse fieldsets (?fields=id,type,result) are encoded the same way from rows
+holding just those columns, through calculation_fields_model() or msgspec.
+
+msgspec is used rather than orjson because its float formatting (1e20,
+not 1e+20) matches pydantic's. It is optional; without it the functions
+fall back to pydantic.
+"""
+
+from array import array
+from functools import lru_cache
+from typing import Iterable, List, Sequence, Tuple
+
+from pydantic import TypeAdapter
+
+from app.models.calculation import Calculation
+from app.schemas.calculation import CALCULATION_RESPONSE_FIELDS, CalculationResponse, calculation_fields_model
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+# Response fields in CalculationResponse's serialization order
+CALCULATION_FIELDS = CALCULATION_RESPONSE_FIELDS
+
+# Columns to select for a Core query whose rows feed dumps_calculations()
+CALCULATION_COLUMNS = tuple(getattr(Calculation, field) for field in CALCULATION_FIELDS)
+
+_list_adapter = TypeAdapter(List[CalculationResponse])
+
+_encoder = msgspec.json.Encoder() if msgspec is not None else None
+
+
+def projection_columns(fields: Sequence[str], *required: str) -> Tuple:
+    """Columns to select for a sparse fieldset, plus any the endpoint itself needs."""
+    wanted = set(fields).union(required)
+    return tuple(getattr(Calculation, field) for field in CALCULATION_FIELDS if field in wanted)
+
+
+def _float_list(inputs) -> list:
+    # Always floats, as the float-typed schema fields would make them
+    return (inputs if isinstance(inputs, array) else array("d", inputs)).tolist()
+
+
+def calculation_record(row) -> dict:
+    """A CalculationResponse-shaped dict from an ORM Calculation or a Core row."""
+    inputs, result = row.inputs, row.result
+    return {
+        "type": row.type,
+        "inputs": _float_list(inputs),
+        "id": row.id,
+        "user_id": row.user_id,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+        "result": None if result is None else float(result),
+    }
+
+
+def fields_record(row, fields: Sequence[str]) -> dict:
+    """calculation_record() limited to `fields`; row only needs those attributes."""
+    record = {}
+    for field in fields:
+        value = getattr(row, field)
+        if field == "inputs":
+            value = _float_list(value)
+        elif field == "result" and value is not None:
+            value = float(value)
+        record[field] = value
+    return record
+
+
+def dumps_calculation(row) -> bytes:
+    """Encode one calculation as CalculationResponse JSON."""
+    if _encoder is None:  # pragma: no cover
+        return CalculationResponse.model_validate(row, from_attributes=True).model_dump_json().encode()
+    return _encoder.encode(calculation_record(row))
+
+
+def dumps_calculations(rows: Iterable) -> bytes:
+    """Encode calculations as a JSON array of CalculationResponse objects."""
+    if _encoder is None:  # pragma: no cover
+        return _list_adapter.dump_json(_list_adapter.validate_python(list(rows), from_attributes=True))
+    return _encoder.encode([calculation_record(row) for row in rows])
+
+
+@lru_cache(maxsize=None)
+def _fields_adapter(fields: Tuple[str, ...], many: bool) -> TypeAdapter:
+    model = calculation_fields_model(fields)
+    return TypeAdapter(List[model] if many else model)
+
+
+def _dumps_fields(records, fields: Tuple[str, ...], many: bool, validate: bool) -> bytes:
+    if validate or _encoder is None:
+        adapter = _fields_adapter(fields, many)
+        return adapter.dump_json(adapter.validate_python(records))
+    return _encoder.encode(records)
+
+
+def dumps_calculation_fields(row, fields: Tuple[str, ...], validate: bool = True) -> bytes:
+    """
+    Encode one calculation projected to a sparse fieldset.
+
+    With validate=True the record goes through calculation_fields_model(fields),
+    as full responses go through CalculationResponse; validate=False is the
+    FAST_JSON_RESPONSES path straight to msgspec. Both give the same bytes.
+    """
+    return _dumps_fields(fields_record(row, fields), fields, many=False, validate=validate)
+
+
+def dumps_calculations_fields(rows: Iterable, fields: Tuple[str, ...], validate: bool = True) -> bytes:
+    """Encode calculations projected to a sparse fieldset, as a JSON array."""
+    return _dumps_fields([fields_record(row, fields) for row in rows], fields, many=True, validate=validate)
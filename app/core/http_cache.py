@@ -0,0 +1,46 @@
+# app/core/http_cache.py
+"""
+ETag helpers for conditional GET.
+
+Endpoints build a strong ETag from whatever determines their response body
+(a row's id and updated_at, or a user's list version plus the query) and
+answer 304 Not Modified when the client's If-None-Match already holds it.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Response, status
+
+# Clients may keep responses but must revalidate them (private: per-user data)
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag (quoted) derived from the given parts."""
+    digest = hashlib.sha256("\0".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    True if an If-None-Match header value matches etag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    W/-prefixed copy of the tag also matches; "*" matches anything.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """An empty 304 response carrying the current validators."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
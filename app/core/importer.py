@@ -0,0 +1,214 @@
+# app/core/importer.py
+"""
+Bulk import of calculations from a streamed CSV or NDJSON upload.
+
+The upload is parsed line by line as it arrives (one record per line), the
+records are validated and evaluated in vectorized batches by the endpoint,
+and accepted rows are loaded with COPY ... FROM STDIN on PostgreSQL (a
+multi-row INSERT elsewhere). Rejected records are written to an NDJSON
+error file that the client can download afterwards.
+
+Error files are kept in IMPORT_ERROR_DIR (the system temp dir by default)
+for IMPORT_ERROR_TTL_SECONDS, then deleted by the next import or download.
+The directory is local to the host that ran the import, so downloads only
+work there unless IMPORT_ERROR_DIR points at storage every host mounts.
+
+Accepted formats (the export format of /calculations/export is accepted too,
+extra fields/columns are ignored):
+- ndjson: {"type": "addition", "inputs": [1, 2]} per line
+- csv: a header row naming at least `type` and `inputs`; inputs is a JSON
+  array in a single cell, e.g. addition,"[1, 2]"
+"""
+
+import csv
+import json
+import os
+import tempfile
+import time
+from typing import Any, AsyncIterator, List, Optional, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.calculation import Calculation
+
+settings = get_settings()
+
+# Column order used for COPY
+COPY_COLUMNS = ("id", "user_id", "type", "inputs", "result", "created_at", "updated_at")
+
+
+class RecordError(Exception):
+    """A line of the upload that could not be parsed into a record."""
+
+
+def _decode(line: bytes) -> str:
+    return line.decode("utf-8", errors="replace").rstrip("\r")
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: Optional[int] = None
+) -> AsyncIterator[Tuple[int, Union[str, RecordError]]]:
+    """
+    Split a byte stream into (line_number, text) pairs, skipping blank lines.
+
+    Only each new chunk is split; the unterminated tail is kept as a list of
+    pieces and joined once its newline arrives, so long lines cost linear
+    time. A line over max_line_bytes (IMPORT_MAX_LINE_BYTES) is dropped as it
+    streams in and yielded as a RecordError instead of its text.
+    """
+    if max_line_bytes is None:
+        max_line_bytes = settings.IMPORT_MAX_LINE_BYTES
+    too_long = RecordError(f"Line is longer than {max_line_bytes} bytes.")
+    pending: List[bytes] = []
+    pending_size = 0
+    overflowed = False
+    line_number = 0
+    async for chunk in chunks:
+        *ends, rest = chunk.split(b"\n")
+        for end in ends:
+            line_number += 1
+            if overflowed or pending_size + len(end) > max_line_bytes:
+                yield line_number, too_long
+            else:
+                line = b"".join(pending) + end if pending else end
+                if line.strip():
+                    yield line_number, _decode(line)
+            pending, pending_size, overflowed = [], 0, False
+        if rest and not overflowed:
+            if pending_size + len(rest) > max_line_bytes:
+                pending, pending_size, overflowed = [], 0, True
+            else:
+                pending.append(rest)
+                pending_size += len(rest)
+    if overflowed:
+        yield line_number + 1, too_long
+    elif pending:
+        line = b"".join(pending)
+        if line.strip():
+            yield line_number + 1, _decode(line)
+
+
+async def iter_records(chunks: AsyncIterator[bytes], import_format: str) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Yield (line_number, record) for every record in the upload.
+
+    record is a dict shaped like CalculationBase, or a RecordError for a line
+    that could not be parsed.
+
+    Raises:
+        ValueError: If a CSV upload's header lacks `type` or `inputs`, or is
+            longer than IMPORT_MAX_LINE_BYTES
+    """
+    header: Optional[List[str]] = None
+    async for line_number, line in iter_lines(chunks):
+        if isinstance(line, RecordError):
+            if import_format == "csv" and header is None:
+                raise ValueError(f"CSV header: {line}")
+            yield line_number, line
+            continue
+        if import_format == "ndjson":
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, RecordError(f"Invalid JSON: {e.msg}")
+            continue
+
+        cells = next(csv.reader([line]))
+        if header is None:
+            header = [cell.strip().lower() for cell in cells]
+            if "type" not in header or "inputs" not in header:
+                raise ValueError("CSV header must name 'type' and 'inputs' columns.")
+            continue
+        if len(cells) != len(header):
+            yield line_number, RecordError(f"Expected {len(header)} columns, got {len(cells)}.")
+            continue
+        record = dict(zip(header, cells))
+        try:
+            record["inputs"] = json.loads(record["inputs"])
+        except json.JSONDecodeError:
+            yield line_number, RecordError("Inputs must be a JSON array of numbers.")
+            continue
+        yield line_number, record
+
+
+async def load_rows(db: AsyncSession, rows: List[dict]) -> None:
+    """
+    Insert fully-populated calculation rows in the session's transaction.
+
+    PostgreSQL gets a binary COPY FROM STDIN through asyncpg; other databases
+    get one multi-row INSERT.
+    """
+    if not rows:
+        return
+    if db.bind.dialect.name == "postgresql":
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            Calculation.__tablename__,
+            records=[tuple(row[column] for column in COPY_COLUMNS) for row in rows],
+            columns=COPY_COLUMNS,
+        )
+    else:
+        await db.execute(insert(Calculation.__table__), rows)
+
+
+def error_file_dir() -> str:
+    """The directory import error files are kept in."""
+    directory = settings.IMPORT_ERROR_DIR or os.path.join(tempfile.gettempdir(), "calculation-import-errors")
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def error_file_path(user_id, import_id: UUID) -> str:
+    """Where the rejected rows of an import are kept."""
+    return os.path.join(error_file_dir(), f"{user_id}-{import_id}.ndjson")
+
+
+def prune_error_files(max_age_seconds: Optional[float] = None) -> int:
+    """
+    Delete error files last written more than max_age_seconds ago.
+
+    Returns:
+        int: The number of files deleted
+    """
+    if max_age_seconds is None:
+        max_age_seconds = settings.IMPORT_ERROR_TTL_SECONDS
+    cutoff = time.time() - max_age_seconds
+    deleted = 0
+    with os.scandir(error_file_dir()) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".ndjson"):
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    deleted += 1
+            except FileNotFoundError:
+                pass  # Pruned concurrently by another worker
+    return deleted
+
+
+class ErrorFile:
+    """NDJSON file of rejected records; created on the first rejection."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._handle = None
+
+    def write(self, line_number: int, detail: str, record: Any = None) -> None:
+        if self._handle is None:
+            self._handle = open(self.path, "w", encoding="utf-8")
+        entry = {"line": line_number, "detail": detail}
+        if record is not None:
+            entry["record"] = record
+        self._handle.write(json.dumps(entry, default=str) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
@@ -0,0 +1,163 @@
+# app/core/list_cache.py
+"""
+Per-user cache of serialized calculation list pages.
+
+GET /calculations stores the JSON body (and cursor headers) of each page it
+renders, keyed by (user, list version, query parameters). Every write to a
+user's calculations bumps that user's version counter, so pages rendered
+before the write are never served again; no page has to be found and
+patched individually.
+
+The version counters live in the shared Redis client, so a write handled by
+one worker invalidates the pages cached by every worker. That only holds
+while Redis is reachable: version() returns None whenever the counter was
+not read from Redis (REDIS_URL unset, or the client fell back to its
+in-memory store), and the endpoint then neither serves nor stores cached
+pages and sends no collection ETag. A worker-local counter would never see
+writes made on other workers, and no TTL would bound that staleness.
+
+Invalidations that only reached the in-memory store during an outage are
+replayed against Redis by the same worker once Redis answers again. Until
+that worker next touches the cache, other workers may still serve pages
+cached before the outage.
+
+The version also feeds the collection ETag of GET /calculations, so counters
+are kept (and bumped) even when the page cache itself is disabled.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import get_settings
+from app.core.redis_client import redis_client
+
+settings = get_settings()
+
+Page = Tuple[bytes, Dict[str, str]]
+
+
+class ListCache:
+    """
+    Bounded LRU of rendered list pages with per-owner version counters.
+
+    Args:
+        max_entries: Pages kept per worker; 0 disables the cache
+        ttl_seconds: Longest a page is served without re-querying
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, redis=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis if redis is not None else redis_client
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.unshared = 0
+        self._lost_invalidations: Set[str] = set()
+        self._entries: "OrderedDict[tuple, Tuple[Page, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def _version_key(owner_id) -> str:
+        return f"calculations:list_version:{owner_id}"
+
+    async def _read_version(self, owner_id) -> int:
+        key = self._version_key(owner_id)
+        raw = await self.redis.get(key)
+        if raw:
+            return int(raw)
+        # Seed new (or lost) counters from the clock rather than 0, so a
+        # counter that restarts never repeats a version clients saw before
+        # (versions double as collection ETags)
+        seed = time.time_ns() // 1000
+        await self.redis.set(key, seed)
+        return seed
+
+    async def _replay_lost_invalidations(self) -> None:
+        # Bump in Redis the counters this worker could only bump in memory
+        while self._lost_invalidations and self.redis.shared:
+            owner_id = self._lost_invalidations.pop()
+            await self.redis.incr(self._version_key(owner_id))
+            if not self.redis.shared:
+                self._lost_invalidations.add(owner_id)
+
+    async def version(self, owner_id) -> Optional[int]:
+        """
+        Current list version for owner_id, or None if it could not be read
+        from Redis (and so may not reflect other workers' writes).
+        """
+        version = await self._read_version(owner_id)
+        if self._lost_invalidations and self.redis.shared:
+            await self._replay_lost_invalidations()
+            version = await self._read_version(owner_id)
+        if not self.redis.shared:
+            self.unshared += 1
+            return None
+        return version
+
+    async def invalidate(self, owner_id) -> None:
+        """Bump owner_id's version so all of their cached pages go stale."""
+        await self._read_version(owner_id)
+        await self.redis.incr(self._version_key(owner_id))
+        if not self.redis.shared:
+            self._lost_invalidations.add(str(owner_id))
+        else:
+            await self._replay_lost_invalidations()
+        self.invalidations += 1
+
+    def get(self, owner_id, version: int, page_key: str) -> Optional[Page]:
+        """Return the cached (body, headers) for this page, if fresh."""
+        key = (str(owner_id), version, page_key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, owner_id, version: int, page_key: str, body: bytes, headers: Dict[str, str]) -> None:
+        """Cache a rendered page."""
+        if not self.enabled:
+            return
+        key = (str(owner_id), version, page_key)
+        with self._lock:
+            self._entries[key] = ((body, headers), time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all pages and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.invalidations = self.unshared = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and size."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "unshared": self.unshared,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+list_cache = ListCache(
+    max_entries=settings.LIST_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LIST_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,140 @@
+# app/core/metrics.py
+"""
+In-process metrics helpers.
+
+Metrics are kept per worker process (uvicorn --workers N runs N copies), in
+plain Python objects guarded by a lock, and are exposed as JSON by the
+/metrics endpoints in app.main.
+
+The endpoints reveal pool sizes, cache hit rates, the Redis breaker state
+and the replica topology, so they are not public: each requires
+`Authorization: Bearer <METRICS_TOKEN>` (require_metrics_token), and with
+METRICS_TOKEN unset they answer 404. Give the token to the scraper only.
+
+- Histogram: fixed-bucket latency histogram (cumulative bucket counts)
+- InstrumentedQueuePool / InstrumentedAsyncQueuePool: SQLAlchemy pools
+  that record how long each connection checkout waited and how many
+  checkouts timed out
+"""
+
+import secrets
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from fastapi import Header, HTTPException, status
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Upper bounds (seconds) for connection-wait buckets; +Inf is implied
+DEFAULT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """A thread-safe histogram with fixed, cumulative buckets."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_WAIT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        with self._lock:
+            self._sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+                    break
+            else:
+                self._counts[-1] += 1
+
+    def snapshot(self) -> Dict:
+        """Return cumulative bucket counts plus total count and sum."""
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip(list(self.buckets) + ["+Inf"], counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {"buckets": cumulative, "count": running, "sum": total}
+
+
+class _TimedCheckoutMixin:
+    """Pool mixin that times every checkout from the underlying queue."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = Histogram()
+        self.timeouts = 0
+
+    def recreate(self):
+        # Keep the metrics across pool re-creation (e.g. engine.dispose())
+        pool = super().recreate()
+        pool.wait_histogram, pool.timeouts = self.wait_histogram, self.timeouts
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_histogram.observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool that records connection wait times and timeouts."""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records connection wait times and timeouts."""
+
+
+def pool_stats(pool: Pool) -> Dict:
+    """
+    Summarize a connection pool's live state.
+
+    Args:
+        pool: The engine's pool (engine.pool)
+
+    Returns:
+        dict: size, checked-in/out and overflow counts for queue pools, plus
+        wait-time histogram and timeout count for instrumented pools
+    """
+    stats: Dict = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, _TimedCheckoutMixin):
+        stats.update(timeouts=pool.timeouts, wait_seconds=pool.wait_histogram.snapshot())
+    return stats
+
+
+async def require_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    """
+    Dependency of the /metrics endpoints: 404 while METRICS_TOKEN is unset,
+    401 unless the request carries `Authorization: Bearer <METRICS_TOKEN>`.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
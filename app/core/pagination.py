@@ -0,0 +1,55 @@
+# app/core/pagination.py
+"""
+Keyset (cursor) pagination helpers.
+
+Offset pagination gets slower with every page because the database still has
+to walk past all the skipped rows. Keyset pagination instead remembers the
+sort key of the last row that was returned, (created_at, id), and asks for
+rows strictly after it, which the composite index on
+(user_id, created_at, id) answers with a single range scan no matter how deep
+the page is.
+
+Cursors are opaque to clients: a URL-safe base64 encoding of the row's
+created_at timestamp and id.
+"""
+
+import base64
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """
+    Encode a row's sort key into an opaque cursor string.
+
+    Args:
+        created_at: The row's creation timestamp
+        row_id: The row's UUID (tie-breaker for identical timestamps)
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Args:
+        cursor: The opaque cursor string
+
+    Returns:
+        tuple: (created_at, id) sort key of the referenced row
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor.") from e
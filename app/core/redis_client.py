@@ -0,0 +1,268 @@
+# app/core/redis_client.py
+"""
+Shared Redis client with an in-memory fallback.
+
+One ManagedRedis instance per worker owns a sized connection pool (created in
+the FastAPI lifespan, or lazily on first use) and routes every command either
+to Redis or, while Redis is unavailable, to a process-local InMemoryTTLStore:
+
+- Commands time out after REDIS_SOCKET_TIMEOUT seconds and are not retried
+- REDIS_BREAKER_FAILURES consecutive failures open the circuit breaker; for
+  the next REDIS_BREAKER_RESET_SECONDS every command goes straight to the
+  in-memory store, then a single trial command decides whether to close it
+  again (concurrent commands keep using the store while the trial runs)
+- With REDIS_URL unset the in-memory store is used throughout
+
+The in-memory store only answers while Redis is failing. It is cleared when
+a command succeeds again, so nothing written during an outage is served
+once Redis is back: it would be stale and seen by this worker only. State
+that must survive an outage is kept by its owner (e.g. the token cache's
+revocations, the list cache's lost invalidations).
+"""
+
+import fnmatch
+import time
+from typing import Any, Dict, Optional
+
+from redis import asyncio as aioredis
+from redis.asyncio.retry import Retry
+from redis.backoff import NoBackoff
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class InMemoryTTLStore:
+    """
+    Process-local stand-in for the subset of Redis commands the app uses.
+
+    Values are stored as bytes, like redis-py returns them. Expired keys are
+    dropped when touched and swept every `sweep_every` writes.
+    """
+
+    def __init__(self, sweep_every: int = 1000):
+        self._values: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._writes = 0
+        self._sweep_every = sweep_every
+
+    @staticmethod
+    def _encode(value) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    def _alive(self, name: str) -> bool:
+        expires = self._expires.get(name)
+        if expires is not None and expires <= time.monotonic():
+            self._values.pop(name, None)
+            self._expires.pop(name, None)
+        return name in self._values
+
+    def _wrote(self, name: str, ex: Optional[float] = None) -> None:
+        if ex is not None:
+            self._expires[name] = time.monotonic() + ex
+        else:
+            self._expires.pop(name, None)
+        self._writes += 1
+        if self._writes % self._sweep_every == 0:
+            for key in list(self._expires):
+                self._alive(key)
+
+    async def ping(self) -> bool:
+        return True
+
+    async def get(self, name: str) -> Optional[bytes]:
+        return self._values[name] if self._alive(name) and isinstance(self._values[name], bytes) else None
+
+    async def set(self, name: str, value, ex: Optional[float] = None) -> bool:
+        self._values[name] = self._encode(value)
+        self._wrote(name, ex)
+        return True
+
+    async def exists(self, *names: str) -> int:
+        return sum(self._alive(name) for name in names)
+
+    async def delete(self, *names: str) -> int:
+        deleted = 0
+        for name in names:
+            deleted += self._alive(name)
+            self._values.pop(name, None)
+            self._expires.pop(name, None)
+        return deleted
+
+    async def incr(self, name: str, amount: int = 1) -> int:
+        value = int(self._values[name]) + amount if self._alive(name) else amount
+        self._values[name] = self._encode(value)
+        self._writes += 1
+        return value
+
+    async def expire(self, name: str, seconds: float) -> bool:
+        if not self._alive(name):
+            return False
+        self._expires[name] = time.monotonic() + seconds
+        return True
+
+    async def keys(self, pattern: str = "*"):
+        return [key.encode() for key in list(self._values) if self._alive(key) and fnmatch.fnmatchcase(key, pattern)]
+
+    async def zadd(self, name: str, mapping: Dict[str, float]) -> int:
+        zset = self._values.get(name) if self._alive(name) else None
+        if not isinstance(zset, dict):
+            zset = self._values[name] = {}
+        added = sum(self._encode(member) not in zset for member in mapping)
+        zset.update({self._encode(member): float(score) for member, score in mapping.items()})
+        self._wrote(name)
+        return added
+
+    async def zrangebyscore(self, name: str, min, max, withscores: bool = False):
+        zset = self._values.get(name) if self._alive(name) else None
+        if not isinstance(zset, dict):
+            return []
+        low, high = float(min), float(max)
+        members = sorted((score, member) for member, score in zset.items() if low <= score <= high)
+        if withscores:
+            return [(member, score) for score, member in members]
+        return [member for _, member in members]
+
+    async def zremrangebyscore(self, name: str, min, max) -> int:
+        zset = self._values.get(name) if self._alive(name) else None
+        if not isinstance(zset, dict):
+            return 0
+        low, high = float(min), float(max)
+        doomed = [member for member, score in zset.items() if low <= score <= high]
+        for member in doomed:
+            del zset[member]
+        return len(doomed)
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._expires.clear()
+
+
+class ManagedRedis:
+    """
+    Redis facade with connection pooling, a circuit breaker and fallback.
+
+    Call commands as methods (await client.get(...), client.zadd(...), ...);
+    see COMMANDS for the supported set.
+
+    Args:
+        url: Redis URL, or None to only use the in-memory store
+        client: An already-built async client (e.g. fakeredis in tests)
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    # Commands routed to Redis or the fallback store
+    COMMANDS = frozenset({
+        "ping", "get", "set", "exists", "delete", "incr", "expire", "keys",
+        "zadd", "zrangebyscore", "zremrangebyscore",
+    })
+
+    def __init__(self, url: Optional[str] = None, client=None):
+        self.url = url
+        self.fallback = InMemoryTTLStore()
+        self.failures = 0
+        self.fallback_ops = 0
+        self._client = client
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    async def connect(self) -> None:
+        """Create the connection pool and probe Redis (never raises)."""
+        if self._get_client() is None:
+            return
+        try:
+            await self._get_client().ping()
+            self._record_success()
+        except (RedisError, OSError):
+            self._record_failure()
+
+    async def close(self) -> None:
+        """Release the connection pool."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    def _get_client(self):
+        if self._client is None and self.url:
+            pool = aioredis.ConnectionPool.from_url(
+                self.url,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+                retry=Retry(NoBackoff(), 0),  # fail fast; the breaker decides what happens next
+            )
+            self._client = aioredis.Redis(connection_pool=pool)
+        return self._client
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at < settings.REDIS_BREAKER_RESET_SECONDS:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    @property
+    def shared(self) -> bool:
+        """
+        True while commands reach Redis, so what they read and write is seen by
+        every worker; False with REDIS_URL unset or once a command has fallen
+        back to the worker's in-memory store (until one succeeds again).
+        """
+        return bool(self.url or self._client is not None) and self.failures == 0 and self.state == self.CLOSED
+
+    def _record_success(self) -> None:
+        if self.failures or self._opened_at is not None:
+            self.fallback.clear()  # Outage-era values are stale now
+        self.failures = 0
+        self._opened_at = None
+
+    def _record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= settings.REDIS_BREAKER_FAILURES:
+            self._opened_at = time.monotonic()
+
+    async def _execute(self, command: str, *args, **kwargs):
+        client = self._get_client()
+        state = self.state
+        trial = state == self.HALF_OPEN
+        if client is not None and (state == self.CLOSED or (trial and not self._probing)):
+            self._probing = trial  # Only one trial command at a time
+            try:
+                result = await getattr(client, command)(*args, **kwargs)
+            except (RedisError, OSError):
+                self._record_failure()
+            else:
+                self._record_success()
+                return result
+            finally:
+                if trial:
+                    self._probing = False
+        self.fallback_ops += 1
+        return await getattr(self.fallback, command)(*args, **kwargs)
+
+    def __getattr__(self, command: str):
+        if command not in self.COMMANDS:
+            raise AttributeError(command)
+
+        async def run(*args, **kwargs):
+            return await self._execute(command, *args, **kwargs)
+        return run
+
+    def stats(self) -> Dict:
+        """Breaker state and how many commands were served from memory."""
+        return {
+            "backend": "redis" if self.url or self._client is not None else "memory",
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "fallback_ops": self.fallback_ops,
+        }
+
+
+redis_client = ManagedRedis(settings.REDIS_URL)
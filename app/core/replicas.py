@@ -0,0 +1,228 @@
+# app/core/replicas.py
+"""
+Routing of read-only queries to read replicas.
+
+With REPLICA_DATABASE_URLS set, the read-only calculation endpoints (list,
+get, stats, export) take their session from get_read_db instead of
+get_async_db. Each request goes to the next replica in round-robin order,
+with two exceptions that send it to the primary instead:
+
+- Read-your-writes: every write to a user's calculations marks the user
+  sticky for READ_YOUR_WRITES_SECONDS (a key in the shared Redis client, so
+  the mark is seen by every worker). Their reads go to the primary until
+  the mark expires, so a client never misses its own write. While Redis is
+  unreachable the marks are per worker, so all user reads go to the primary.
+- Lag: each replica's replication lag is probed at most every
+  REPLICA_LAG_CHECK_SECONDS. Replicas further behind than
+  REPLICA_MAX_LAG_SECONDS, or whose probe failed, are skipped; if none is
+  usable the primary serves the read.
+
+Logins always read the user from the primary: a password change or a
+deactivation must not be undone by a replica that has not replayed it.
+
+The sticky window is never shorter than the lag limit: once a user's mark
+expires, every replica still in rotation has caught up with their write.
+
+On PostgreSQL the lag is now() - pg_last_xact_replay_timestamp() on a
+standby that still has WAL to replay, and 0 on one that is caught up (or on
+a primary, e.g. another database standing in for a replica). Other backends
+have no replication to measure; the probe only checks the replica answers.
+"""
+
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+from fastapi import Depends
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.auth.dependencies import get_current_active_user
+from app.core.config import get_settings
+from app.core.redis_client import redis_client
+from app.database import get_async_db, get_async_engine, get_async_sessionmaker
+
+settings = get_settings()
+
+# Seconds the replica is behind the primary
+LAG_QUERIES = {
+    "postgresql": text(
+        "SELECT CASE WHEN NOT pg_is_in_recovery() "
+        "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    ),
+}
+DEFAULT_LAG_QUERY = text("SELECT 0")
+
+
+class Replica:
+    """One read replica: its engine, sessionmaker and last lag measurement."""
+
+    def __init__(self, url: str, engine: AsyncEngine):
+        self.url = url
+        self.engine = engine
+        self.sessionmaker = get_async_sessionmaker(engine)
+        self.lag: float = 0.0
+        self.checked_at: Optional[float] = None
+        self.reads = 0
+        self.probe_errors = 0
+
+    async def measure_lag(self) -> float:
+        """Replication lag in seconds, as reported by the replica."""
+        query = LAG_QUERIES.get(self.engine.dialect.name, DEFAULT_LAG_QUERY)
+        async with self.engine.connect() as connection:
+            return float((await connection.execute(query)).scalar() or 0)
+
+    def stats(self) -> Dict:
+        return {
+            "url": make_url(self.url).render_as_string(hide_password=True),
+            "lag_seconds": None if math.isinf(self.lag) else self.lag,
+            "healthy": not math.isinf(self.lag),
+            "reads": self.reads,
+            "probe_errors": self.probe_errors,
+        }
+
+
+class ReplicaRouter:
+    """
+    Chooses the database each read-only request is served from.
+
+    Args:
+        urls: Replica database URLs (sync or async); empty = always the primary
+        max_lag_seconds: Replicas further behind than this are skipped
+        sticky_seconds: How long a user's reads stay on the primary after a write
+        lag_check_seconds: How long a lag measurement is trusted
+        engine_factory: Builds the async engine for a replica URL
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        max_lag_seconds: float,
+        sticky_seconds: float,
+        lag_check_seconds: float,
+        redis=None,
+        engine_factory: Optional[Callable[[str], AsyncEngine]] = None,
+    ):
+        self.max_lag_seconds = max_lag_seconds
+        self.sticky_seconds = max(sticky_seconds, max_lag_seconds)
+        self.lag_check_seconds = lag_check_seconds
+        self.redis = redis if redis is not None else redis_client
+        self.configure(urls, engine_factory)
+
+    def configure(self, urls: Sequence[str], engine_factory: Optional[Callable[[str], AsyncEngine]] = None) -> None:
+        """
+        Replace the set of replicas and reset the counters.
+
+        Engines are created lazily by the driver, so this opens no
+        connections; dispose() the old engines first if they were used.
+        """
+        engine_factory = engine_factory or get_async_engine
+        self.replicas: List[Replica] = [Replica(url, engine_factory(url)) for url in urls]
+        self._turn = itertools.count()
+        self.primary_reads = 0
+        self.sticky_reads = 0
+        self.lagging_skips = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    @staticmethod
+    def _sticky_key(user_id) -> str:
+        return f"replicas:sticky:{user_id}"
+
+    async def mark_write(self, user_id) -> None:
+        """Keep user_id's reads on the primary until replicas have their write."""
+        if self.enabled:
+            await self.redis.set(self._sticky_key(user_id), 1, ex=math.ceil(self.sticky_seconds))
+
+    async def is_sticky(self, user_id) -> bool:
+        return bool(await self.redis.exists(self._sticky_key(user_id)))
+
+    async def _lag(self, replica: Replica) -> float:
+        """The replica's lag, re-measured if the last measurement is too old."""
+        now = time.monotonic()
+        if replica.checked_at is None or now - replica.checked_at >= self.lag_check_seconds:
+            # Claim the probe first so concurrent requests keep using the last value
+            replica.checked_at = now
+            try:
+                replica.lag = await replica.measure_lag()
+            except Exception:
+                replica.probe_errors += 1
+                replica.lag = math.inf  # Out of rotation until the next probe succeeds
+        return replica.lag
+
+    async def choose(self, user_id=None) -> Optional[Replica]:
+        """
+        The replica to read from, or None to read from the primary.
+
+        Args:
+            user_id: The reader, for read-your-writes; None for reads not tied
+                to a user's writes
+        """
+        if not self.enabled:
+            return None
+        if user_id is not None and (await self.is_sticky(user_id) or not self.redis.shared):
+            # Without shared Redis a write on another worker leaves no mark here
+            self.sticky_reads += 1
+            self.primary_reads += 1
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._turn) % len(self.replicas)]
+            if await self._lag(replica) <= self.max_lag_seconds:
+                replica.reads += 1
+                return replica
+            self.lagging_skips += 1
+        self.primary_reads += 1
+        return None
+
+    async def dispose(self) -> None:
+        """Close the replicas' pooled connections."""
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> Dict:
+        """Where reads went, and each replica's last measured lag."""
+        return {
+            "replicas": [replica.stats() for replica in self.replicas],
+            "max_lag_seconds": self.max_lag_seconds,
+            "sticky_seconds": self.sticky_seconds,
+            "replica_reads": sum(replica.reads for replica in self.replicas),
+            "primary_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+            "lagging_skips": self.lagging_skips,
+        }
+
+
+replica_router = ReplicaRouter(
+    urls=settings.REPLICA_DATABASE_URLS,
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    sticky_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    lag_check_seconds=settings.REPLICA_LAG_CHECK_SECONDS,
+)
+
+
+@asynccontextmanager
+async def _read_session(primary: AsyncSession, user_id) -> AsyncIterator[AsyncSession]:
+    replica = await replica_router.choose(user_id)
+    if replica is None:
+        yield primary
+        return
+    async with replica.sessionmaker() as session:
+        yield session
+
+
+async def get_read_db(
+    current_user=Depends(get_current_active_user),
+    primary: AsyncSession = Depends(get_async_db),
+):
+    """
+    Session for a read-only endpoint: a replica, or the primary while the
+    current user has recent writes (or no replica is fresh enough).
+    """
+    async with _read_session(primary, current_user.id) as session:
+        yield session
@@ -0,0 +1,140 @@
+# app/core/result_cache.py
+"""
+Content-addressed cache of calculation results.
+
+A result depends only on the calculation type and its inputs, so it is cached
+under a SHA-256 digest of (type, float64 bytes of the inputs). The float64
+encoding makes the key canonical: [2, 3] and [2.0, 3.0] share an entry while
+0.0 and -0.0 (which can give different results) do not.
+
+Two tiers:
+- An in-process LRU (RESULT_CACHE_MAX_ENTRIES entries, RESULT_CACHE_TTL_SECONDS)
+- Optionally the shared Redis client (RESULT_CACHE_REDIS), so workers reuse
+  each other's results; Redis outages fall back as described in
+  app.core.redis_client
+
+Only real, finite results are cached; anything that raises is recomputed
+(and re-raised) every time.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.redis_client import redis_client
+from app.models.types import pack_float64
+
+settings = get_settings()
+
+
+def result_key(calculation_type: str, inputs) -> str:
+    """Canonical cache key for a calculation."""
+    digest = hashlib.sha256(calculation_type.lower().encode() + b"\0" + pack_float64(inputs))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier (local LRU + optional Redis) memo of calculation results.
+
+    Args:
+        max_entries: Local entries kept before the least recently used is
+            evicted; 0 disables the cache entirely
+        ttl_seconds: How long an entry is reused, in both tiers
+        use_redis: Also read/write results through the shared Redis client
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, use_redis: bool = False, redis=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self.redis = redis if redis is not None else redis_client
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_local(self, key: str) -> Optional[float]:
+        """Look key up in the in-process tier only."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            result, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def put_local(self, key: str, result: float) -> None:
+        """Store result in the in-process tier."""
+        with self._lock:
+            self._entries[key] = (result, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_or_compute(self, calculation_type: str, inputs, compute: Callable[[], float]) -> float:
+        """
+        Return the cached result for (calculation_type, inputs), or call
+        compute() and cache what it returns.
+
+        Raises:
+            Whatever compute() raises (failures are not cached)
+        """
+        if self.max_entries <= 0:
+            return compute()
+        key = result_key(calculation_type, inputs)
+
+        result = self.get_local(key)
+        if result is not None:
+            self.local_hits += 1
+            return result
+
+        if self.use_redis:
+            cached = await self.redis.get(f"result:{key}")
+            if cached is not None:
+                result = float(cached)
+                self.redis_hits += 1
+                self.put_local(key, result)
+                return result
+
+        self.misses += 1
+        result = compute()
+        if isinstance(result, float) and math.isfinite(result):
+            self.put_local(key, result)
+            if self.use_redis:
+                await self.redis.set(f"result:{key}", repr(result), ex=int(self.ttl_seconds))
+        return result
+
+    def clear(self) -> None:
+        """Drop local entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.local_hits = self.redis_hits = self.misses = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters per tier and the overall hit rate."""
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": (self.local_hits + self.redis_hits) / lookups if lookups else 0.0,
+        }
+
+
+result_cache = ResultCache(
+    max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+    use_redis=settings.RESULT_CACHE_REDIS,
+)
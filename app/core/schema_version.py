@@ -0,0 +1,54 @@
+# app/core/schema_version.py
+"""
+Startup check of the database schema version.
+
+Migrations are applied once per deploy by `python -m app.database_init`
+(Alembic), never by the API workers. A worker only reads the revision
+Alembic stored in alembic_version and compares it with SCHEMA_VERSION, the
+revision this code was written against: one primary-key lookup instead of
+create_all's catalog queries and DDL locks, and no race between workers
+booting at the same time.
+
+Bump SCHEMA_VERSION whenever a migration is added (a test checks it matches
+the Alembic head).
+"""
+
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+SCHEMA_VERSION = "0002"
+
+VERSION_TABLE = "alembic_version"
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is not at the version this code expects."""
+
+
+def stored_version(connection: Connection) -> Optional[str]:
+    """The revision recorded by Alembic, or None if migrations never ran."""
+    try:
+        return connection.execute(text(f"SELECT version_num FROM {VERSION_TABLE}")).scalar()
+    except DBAPIError:
+        # No version table yet; leave the connection usable
+        connection.rollback()
+        return None
+
+
+def check_schema_version(connection: Connection) -> str:
+    """
+    Make sure the database has been migrated to SCHEMA_VERSION.
+
+    Raises:
+        SchemaVersionError: If migrations have not run, or ran to another revision
+    """
+    version = stored_version(connection)
+    if version != SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Database schema is at {version or 'no version'}, expected {SCHEMA_VERSION}. "
+            "Run `python -m app.database_init` to apply migrations."
+        )
+    return version
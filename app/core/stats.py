@@ -0,0 +1,103 @@
+# app/core/stats.py
+"""
+Aggregate statistics over a user's calculations.
+
+One GROUP BY (type, day) query returns count, min, max and sum of results
+per group; the per-type figures and the daily counts are rolled up from
+those groups in Python, so the table is scanned once.
+
+Unfiltered statistics are read from the user_calculation_stats summary
+table instead, which already holds those (type, day) groups.
+"""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.calculation import Calculation
+from app.models.calculation_stats import UserCalculationStats
+
+
+def _as_date(value) -> date:
+    # PostgreSQL returns date objects, SQLite returns 'YYYY-MM-DD' strings
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def rollup(groups: Iterable) -> Dict:
+    """
+    Combine (type, day, count, result_count, min, max, sum) groups into the
+    CalculationStatsResponse shape.
+    """
+    by_type: Dict[str, Dict] = {}
+    daily: Dict[date, int] = {}
+    for calc_type, day, count, result_count, min_result, max_result, sum_result in groups:
+        stats = by_type.setdefault(calc_type, {
+            "type": calc_type, "count": 0, "result_count": 0,
+            "min_result": None, "max_result": None, "sum_result": 0.0,
+        })
+        stats["count"] += count
+        if result_count:
+            stats["result_count"] += result_count
+            stats["sum_result"] += sum_result
+            stats["min_result"] = min_result if stats["min_result"] is None else min(stats["min_result"], min_result)
+            stats["max_result"] = max_result if stats["max_result"] is None else max(stats["max_result"], max_result)
+        day = _as_date(day)
+        daily[day] = daily.get(day, 0) + count
+
+    types = []
+    for stats in sorted(by_type.values(), key=lambda s: s["type"]):
+        result_count, sum_result = stats.pop("result_count"), stats.pop("sum_result")
+        stats["avg_result"] = sum_result / result_count if result_count else None
+        types.append(stats)
+    return {
+        "total": sum(daily.values()),
+        "by_type": types,
+        "daily": [{"date": day, "count": count} for day, count in sorted(daily.items())],
+    }
+
+
+async def calculation_stats(
+    db: AsyncSession,
+    user_id,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> Dict:
+    """Statistics for one user's calculations, optionally within a time range."""
+    day = func.date(Calculation.created_at)
+    query = (
+        select(
+            Calculation.type,
+            day,
+            func.count(),
+            func.count(Calculation.result),
+            func.min(Calculation.result),
+            func.max(Calculation.result),
+            func.sum(Calculation.result),
+        )
+        .where(Calculation.user_id == user_id)
+        .group_by(Calculation.type, day)
+    )
+    if created_from is not None:
+        query = query.where(Calculation.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Calculation.created_at < created_to)
+    result = await db.execute(query)
+    return rollup(result.all())
+
+
+async def summary_stats(db: AsyncSession, user_id) -> Dict:
+    """Statistics for all of one user's calculations, read from the summary table."""
+    result = await db.execute(
+        select(
+            UserCalculationStats.type,
+            UserCalculationStats.day,
+            UserCalculationStats.count,
+            UserCalculationStats.result_count,
+            UserCalculationStats.min_result,
+            UserCalculationStats.max_result,
+            UserCalculationStats.result_sum,
+        ).where(UserCalculationStats.user_id == user_id)
+    )
+    return rollup(result.all())
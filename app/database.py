@@ -1,15 +1,73 @@
 # app/database.py
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-# Create the default engine and sessionmaker
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Async drivers used for each sync DATABASE_URL backend
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Translate a sync database URL into its async-driver equivalent.
+
+    e.g. postgresql://... -> postgresql+asyncpg://...
+         sqlite:///app.db -> sqlite+aiosqlite:///app.db
+
+    URLs that already name an async driver are returned unchanged.
+    """
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None or url.get_driver_name() == driver:
+        return database_url
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+def get_pool_kwargs(database_url: str, async_driver: bool = False) -> dict:
+    """
+    Connection-pool arguments for an engine, taken from Settings.
+
+    SQLite keeps SQLAlchemy's default pool (there is no server to run out of
+    connections on), so no arguments are returned for it.
+
+    Args:
+        database_url: The URL the engine will connect to
+        async_driver: True to build the pool for an async engine
+
+    Returns:
+        dict: Keyword arguments for create_engine / create_async_engine
+    """
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if async_driver else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+# Create the default engine and sessionmaker (sync: scripts, migrations, tests)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **get_pool_kwargs(SQLALCHEMY_DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create the async engine and sessionmaker (used by the API endpoints)
+async_engine = create_async_engine(
+    get_async_database_url(SQLALCHEMY_DATABASE_URL),
+    **get_pool_kwargs(SQLALCHEMY_DATABASE_URL, async_driver=True)
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -19,11 +77,25 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Async counterpart of get_db(): yields an AsyncSession per request."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # --- New Functions Added ---
 def get_engine(database_url: str = SQLALCHEMY_DATABASE_URL):
     """Factory function to create a new SQLAlchemy engine."""
-    return create_engine(database_url)
+    return create_engine(database_url, **get_pool_kwargs(database_url))
 
 def get_sessionmaker(engine):
     """Factory function to create a new sessionmaker bound to the given engine."""
     return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_async_engine(database_url: str = SQLALCHEMY_DATABASE_URL, **engine_kwargs):
+    """Factory function to create a new async SQLAlchemy engine from a sync or async URL."""
+    engine_kwargs = {**get_pool_kwargs(database_url, async_driver=True), **engine_kwargs}
+    return create_async_engine(get_async_database_url(database_url), **engine_kwargs)
+
+def get_async_sessionmaker(engine):
+    """Factory function to create a new async sessionmaker bound to the given engine."""
+    return async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
@@ -1,11 +1,104 @@
+# app/database_init.py
+"""
+Apply the database migrations.
+
+Run once per deploy, before the API workers start (the workers only check
+the stored schema version, see app.core.schema_version):
+
+    python -m app.database_init
+
+Databases created by the old create_all-on-startup code have tables but no
+alembic_version; they are brought up to the baseline revision with the
+one-off upgrade scripts in app.scripts and stamped, then migrated as usual.
+
+On PostgreSQL both steps run under one session-level advisory lock, so
+containers deploying at once take turns: the first adopts and upgrades, the
+others then find the database stamped and at head.
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.core.schema_version import VERSION_TABLE
 from app.database import engine
 from app.models.user import Base
+from app.scripts import migrate_calculation_indexes, migrate_inputs_to_float64, rebuild_calculation_stats
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+# The revision that describes the schema create_all used to build
+BASELINE_REVISION = "0001"
+
+# Serializes migrations when several containers deploy at once (PostgreSQL)
+MIGRATION_LOCK_KEY = 7301
+
+
+def alembic_config(connection=None) -> Config:
+    """Alembic configuration, optionally bound to an open connection."""
+    config = Config(ALEMBIC_INI)
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def adopt_legacy_schema(bind: Engine) -> bool:
+    """
+    Upgrade and stamp a database built by create_all.
+
+    Returns:
+        bool: True if the database was adopted, False if it needed no adoption
+    """
+    inspector = inspect(bind)
+    if not inspector.has_table("users") or inspector.has_table(VERSION_TABLE):
+        return False
+    migrate_inputs_to_float64.migrate(bind)
+    migrate_calculation_indexes.migrate(bind)
+    rebuild_calculation_stats.rebuild(bind)
+    with bind.begin() as connection:
+        command.stamp(alembic_config(connection), BASELINE_REVISION)
+    return True
+
+
+@contextmanager
+def migration_lock(bind: Engine) -> Iterator[None]:
+    """
+    Hold the migration advisory lock (PostgreSQL; a no-op elsewhere).
+
+    The lock is session-level, on a connection of its own, so it spans the
+    adoption scripts and the upgrade, which open their own connections.
+    """
+    if bind.dialect.name != "postgresql":
+        yield
+        return
+    with bind.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        connection.commit()
+        try:
+            yield
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            connection.commit()
+
+
+def init_db(bind: Engine = engine) -> None:
+    """Bring the database schema to the latest revision."""
+    with migration_lock(bind):
+        adopt_legacy_schema(bind)
+        with bind.begin() as connection:
+            command.upgrade(alembic_config(connection), "head")
+
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
+def drop_db(bind: Engine = engine) -> None:
+    Base.metadata.drop_all(bind=bind)
+    with bind.begin() as connection:
+        connection.execute(text(f"DROP TABLE IF EXISTS {VERSION_TABLE}"))
 
-def drop_db():
-    Base.metadata.drop_all(bind=engine)
 
 if __name__ == "__main__":
-    init_db() # pragma: no cover
\ No newline at end of file
+    init_db() # pragma: no cover
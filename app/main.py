@@ -6,7 +6,7 @@ This module defines the main FastAPI application, including:
 - API endpoints for user authentication
 - API endpoints for calculation management (BREAD operations)
 - Web routes for HTML templates
-- Database table creation on startup
+- Database schema version check on startup
 
 The application follows a RESTful API design with proper separation of concerns:
 - Routes handle HTTP requests and responses
@@ -17,50 +17,78 @@ The application follows a RESTful API design with proper separation of concerns:
 
 from contextlib import asynccontextmanager  # Used for startup/shutdown events
 from datetime import datetime, timezone, timedelta
-from uuid import UUID  # For type validation of UUIDs in path parameters
-from typing import List
+import os  # Locating import error files
+from uuid import UUID, uuid4  # For type validation of UUIDs in path parameters
+from typing import Any, List, Literal, Optional
 
 # FastAPI imports
-from fastapi import Body, FastAPI, Depends, HTTPException, status, Request, Form
+from fastapi import Body, FastAPI, Depends, Header, HTTPException, status, Request, Form, Query, Response
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles  # For serving static files (CSS, JS)
 from fastapi.templating import Jinja2Templates  # For HTML templates
 
-from sqlalchemy.orm import Session  # SQLAlchemy database session
+from sqlalchemy import insert, select, tuple_  # Core insert for batches, row-value comparison for keyset pagination
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession  # Async SQLAlchemy database session
+from starlette.concurrency import run_in_threadpool  # Offload CPU-bound work from the event loop
+from pydantic import TypeAdapter, ValidationError
 
 import uvicorn  # ASGI server for running FastAPI apps
 
 # Application imports
-from app.auth.dependencies import get_current_active_user  # Authentication dependency
+from app.auth.dependencies import get_current_active_user, oauth2_scheme  # Authentication dependency
 from app.models.calculation import Calculation  # Database model for calculations
 from app.models.user import User  # Database model for users
-from app.schemas.calculation import CalculationBase, CalculationResponse, CalculationUpdate  # API request/response schemas
+from app.core.config import settings  # Application settings
+from app.core.metrics import pool_stats, require_metrics_token  # Connection-pool metrics and their access check
+from app.auth.hashing import password_hasher  # Bounded bcrypt process pool
+from app.auth.token_cache import token_cache, token_claims  # Verified-token cache
+from app.auth.redis import add_to_blacklist, blacklist_filter  # Token blacklist and its local Bloom filter
+from app.core.redis_client import redis_client  # Shared Redis client with in-memory fallback
+from app.core.result_cache import result_cache  # Memoized calculation results
+from app.core.list_cache import list_cache  # Rendered GET /calculations pages
+from app.core.replicas import get_read_db, replica_router  # Read-replica routing
+from app.core.http_cache import CACHE_CONTROL, etag_matches, make_etag, not_modified  # Conditional GET
+from app.core.bulk import calculation_types, delete_calculation_returning, delete_calculations, evaluate_for_every_type, update_calculation_inputs, update_calculation_returning  # Set-based and single-statement mutations
+from app.core.fast_json import CALCULATION_COLUMNS, dumps_calculation, dumps_calculation_fields, dumps_calculations, dumps_calculations_fields, projection_columns  # msgspec response path, sparse fieldsets
+from app.core.export import MEDIA_TYPES, stream_calculations  # Streaming history export
+from app.core.importer import ErrorFile, RecordError, error_file_path, iter_records, load_rows, prune_error_files  # Bulk import
+from app.core.stats import calculation_stats, summary_stats  # Aggregate statistics
+from app.core.schema_version import check_schema_version  # Startup schema check
+from app.operations.vectorized import evaluate_many  # Column-wise batch evaluation
+from app.core.pagination import encode_cursor, decode_cursor  # Keyset pagination cursors
+from app.schemas.calculation import CalculationBase, CalculationBatchResponse, CalculationBulkDelete, CalculationBulkDeleteResponse, CalculationBulkUpdateItem, CalculationBulkUpdateResponse, CalculationBatchResultResponse, CalculationImportResponse, CalculationResponse, CalculationResult, CalculationStatsResponse, CalculationType, CalculationUpdate, parse_calculation_fields  # API request/response schemas
 from app.schemas.token import TokenResponse  # API token schema
 from app.schemas.user import UserCreate, UserResponse, UserLogin  # User schemas
-from app.database import Base, get_db, engine  # Database connection
+from app.database import get_async_db, engine, async_engine  # Database connection
 
 
 # ------------------------------------------------------------------------------
-# Create tables on startup using the lifespan event
+# Check the schema version on startup using the lifespan event
 # ------------------------------------------------------------------------------
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan context manager for FastAPI.
     
-    This runs when the application starts and creates all database tables
-    defined in SQLAlchemy models. It's an alternative to using Alembic
-    for simpler applications.
+    Migrations are applied once per deploy by `python -m app.database_init`;
+    each worker only checks that the database is at the schema version this
+    code expects, so booting is one query and workers never race on DDL.
     
     Args:
         app: FastAPI application instance
     """
-    print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
-    print("Tables created successfully!")
+    if settings.SCHEMA_VERSION_CHECK:
+        with engine.connect() as connection:
+            check_schema_version(connection)  # Refuse to serve against an unmigrated database
+        engine.dispose()  # Don't keep the sync connection idle in every worker
+    await redis_client.connect()  # Never fails startup; falls back to memory if Redis is down
     yield  # This is where application runs
-    # Cleanup code would go here (after yield), but we don't need any
+    await redis_client.close()
+    await async_engine.dispose()  # Close pooled async connections on shutdown
+    await replica_router.dispose()
+    password_hasher.shutdown()  # Stop the bcrypt worker processes
 
 # Initialize the FastAPI application with metadata and lifespan
 app = FastAPI(
@@ -171,6 +199,65 @@ def read_health():
     return {"status": "ok"}
 
 
+# ------------------------------------------------------------------------------
+# Metrics Endpoints
+# ------------------------------------------------------------------------------
+# Internal: every endpoint requires the METRICS_TOKEN bearer token (see app.core.metrics)
+METRICS_ACCESS = [Depends(require_metrics_token)]
+
+@app.get("/metrics/db-pool", tags=["metrics"], dependencies=METRICS_ACCESS)
+def read_db_pool_metrics():
+    """
+    Connection-pool utilisation for the sync and async engines.
+
+    Reports pool size, checked-out/overflow counts, the checkout wait-time
+    histogram and the number of checkouts that hit DB_POOL_TIMEOUT. Numbers
+    are for the worker process that serves the request.
+    """
+    return {
+        "sync": pool_stats(engine.pool),
+        "async": pool_stats(async_engine.sync_engine.pool),
+    }
+
+@app.get("/metrics/password-hasher", tags=["metrics"], dependencies=METRICS_ACCESS)
+def read_password_hasher_metrics():
+    """
+    Load of the bcrypt worker pool: in-flight calls (running + queued) and
+    how many calls were rejected with 503 because the queue was full.
+    """
+    return password_hasher.stats()
+
+@app.get("/metrics/token-cache", tags=["metrics"], dependencies=METRICS_ACCESS)
+def read_token_cache_metrics():
+    """Hit/miss counters and size of the verified-token cache."""
+    return token_cache.stats()
+
+@app.get("/metrics/token-blacklist", tags=["metrics"], dependencies=METRICS_ACCESS)
+def read_token_blacklist_metrics():
+    """How many blacklist checks the local Bloom filter answered vs. sent to Redis."""
+    return blacklist_filter.stats()
+
+@app.get("/metrics/redis", tags=["metrics"], dependencies=METRICS_ACCESS)
+def read_redis_metrics():
+    """Circuit-breaker state and how many commands used the in-memory fallback."""
+    return redis_client.stats()
+
+@app.get("/metrics/result-cache", tags=["metrics"], dependencies=METRICS_ACCESS)
+def read_result_cache_metrics():
+    """Hit rate of the memoized-result cache (local and Redis tiers)."""
+    return result_cache.stats()
+
+@app.get("/metrics/list-cache", tags=["metrics"], dependencies=METRICS_ACCESS)
+def read_list_cache_metrics():
+    """Hit rate of the per-user GET /calculations page cache."""
+    return list_cache.stats()
+
+@app.get("/metrics/replicas", tags=["metrics"], dependencies=METRICS_ACCESS)
+def read_replica_metrics():
+    """Reads served by each replica vs. the primary, and each replica's lag."""
+    return replica_router.stats()
+
+
 # ------------------------------------------------------------------------------
 # User Registration Endpoint
 # ------------------------------------------------------------------------------
@@ -180,18 +267,18 @@ def read_health():
     status_code=status.HTTP_201_CREATED,
     tags=["auth"]
 )
-def register(user_create: UserCreate, db: Session = Depends(get_db)):
+async def register(user_create: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new user account.
     """
     user_data = user_create.dict(exclude={"confirm_password"})
     try:
-        user = User.register(db, user_data)
-        db.commit()
-        db.refresh(user)
+        user = await User.register_async(db, user_data)
+        await db.commit()
+        await db.refresh(user)
         return user
     except ValueError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
@@ -199,12 +286,18 @@ def register(user_create: UserCreate, db: Session = Depends(get_db)):
 # User Login Endpoints
 # ------------------------------------------------------------------------------
 @app.post("/auth/login", response_model=TokenResponse, tags=["auth"])
-def login_json(user_login: UserLogin, db: Session = Depends(get_db)):
+async def login_json(
+    user_login: UserLogin,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Login with JSON payload (username & password).
     Returns an access token, refresh token, and user info.
+
+    The user is read from the primary, never a replica: a password change
+    or deactivation must take effect before it has replicated.
     """
-    auth_result = User.authenticate(db, user_login.username, user_login.password)
+    auth_result = await User.authenticate_async(db, user_login.username, user_login.password)
     if auth_result is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -213,7 +306,7 @@ def login_json(user_login: UserLogin, db: Session = Depends(get_db)):
         )
 
     user = auth_result["user"]
-    db.commit()  # commit the last_login update
+    await db.commit()  # commit the last_login update
 
     # Ensure expires_at is timezone-aware
     expires_at = auth_result.get("expires_at")
@@ -237,12 +330,15 @@ def login_json(user_login: UserLogin, db: Session = Depends(get_db)):
     )
 
 @app.post("/auth/token", tags=["auth"])
-def login_form(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_form(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Login with form data (Swagger/UI).
-    Returns an access token.
+    Returns an access token. The user is read from the primary.
     """
-    auth_result = User.authenticate(db, form_data.username, form_data.password)
+    auth_result = await User.authenticate_async(db, form_data.username, form_data.password)
     if auth_result is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -255,6 +351,155 @@ def login_form(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = D
         "token_type": "bearer"
     }
 
+@app.post("/auth/logout", status_code=status.HTTP_204_NO_CONTENT, tags=["auth"])
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    current_user = Depends(get_current_active_user),
+):
+    """
+    Revoke the access token used for this request.
+
+    The token's jti is blacklisted in Redis until the token expires; every
+    worker rejects it from then on (see app.auth.redis).
+    """
+    exp, jti = token_claims(token) or (None, None)
+    remaining = int(exp - datetime.now(timezone.utc).timestamp()) if exp is not None else 0
+    if jti is not None and remaining > 0:
+        await add_to_blacklist(jti, remaining)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+# ------------------------------------------------------------------------------
+# Batch Evaluation Helper
+# ------------------------------------------------------------------------------
+def evaluate_batch_items(items: List[Any]):
+    """
+    Validate and evaluate a list of raw calculation items.
+
+    Each item is validated with CalculationBase on its own so one bad item
+    does not reject the whole request; the valid ones are then evaluated
+    column-wise with the vectorized engine.
+
+    Args:
+        items: Raw request items, each shaped like CalculationBase
+
+    Returns:
+        tuple: (computed, errors) where computed is a list of
+        {"type", "inputs", "result"} dicts in request order and errors is a
+        list of {"index", "detail"} dicts for the rejected items
+
+    Raises:
+        HTTPException: 413 if the batch exceeds CALCULATION_BATCH_MAX_ITEMS
+    """
+    if len(items) > settings.CALCULATION_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch may contain at most {settings.CALCULATION_BATCH_MAX_ITEMS} items."
+        )
+
+    validated, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            calculation_data = CalculationBase.model_validate(item)
+            validated.append((index, calculation_data.type.value, calculation_data.inputs))
+        except ValidationError as e:
+            errors.append({"index": index, "detail": "; ".join(err["msg"] for err in e.errors())})
+
+    # Evaluate every valid item column-wise, grouped by type
+    outcomes = evaluate_many([(calc_type, inputs) for _, calc_type, inputs in validated])
+    computed = []
+    for (index, calc_type, inputs), (result, error) in zip(validated, outcomes):
+        if error is not None:
+            errors.append({"index": index, "detail": error})
+        else:
+            computed.append({"type": calc_type, "inputs": inputs, "result": result})
+    errors.sort(key=lambda e: e["index"])
+    return computed, errors
+
+
+async def import_batch(db: AsyncSession, user_id, batch: List[Any], error_file: ErrorFile) -> int:
+    """
+    Evaluate one batch of uploaded records and load the valid ones.
+
+    Args:
+        db: The import's session (rows are committed by the caller)
+        user_id: Owner of the imported calculations
+        batch: (line_number, record) pairs
+        error_file: Receives the rejected records
+
+    Returns:
+        int: Number of rows loaded
+    """
+    computed, errors = await run_in_threadpool(evaluate_batch_items, [record for _, record in batch])
+    for error in errors:
+        line_number, record = batch[error["index"]]
+        error_file.write(line_number, error["detail"], record)
+
+    now = datetime.utcnow()
+    rows = [
+        dict(item, id=uuid4(), user_id=user_id, created_at=now, updated_at=now)
+        for item in computed
+    ]
+    await load_rows(db, rows)
+    return len(rows)
+
+
+async def record_write(user_id) -> None:
+    """
+    After a committed write to user_id's calculations: keep their reads on
+    the primary until the replicas have the write, then make their cached
+    list pages stale.
+
+    In that order: a read between the two steps must not see the new list
+    version while it can still be routed to a replica without the write, or
+    the stale page would be cached under the new version.
+    """
+    await replica_router.mark_write(user_id)
+    await list_cache.invalidate(user_id)
+
+
+# ------------------------------------------------------------------------------
+# Stateless Compute Endpoints
+# ------------------------------------------------------------------------------
+# These evaluate calculations without storing them: no ORM instances are
+# built and no database session is requested, so result previews never take
+# a connection away from real writes.
+@app.post("/compute", response_model=CalculationResult, tags=["compute"])
+async def compute_calculation(
+    calculation_data: CalculationBase,
+    current_user = Depends(get_current_active_user),
+):
+    """
+    Compute the result of a calculation without saving it.
+    """
+    try:
+        calculation_class = Calculation.get_class(calculation_data.type)
+        result = await result_cache.get_or_compute(
+            calculation_data.type.value, calculation_data.inputs,
+            lambda: calculation_class.compute(calculation_data.inputs),
+        )
+    except (ValueError, ArithmeticError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not isinstance(result, (int, float)):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Result is not a real number.")
+
+    return {"type": calculation_data.type, "inputs": calculation_data.inputs, "result": result}
+
+
+@app.post("/compute/batch", response_model=CalculationBatchResultResponse, tags=["compute"])
+async def compute_calculations_batch(
+    items: List[Any] = Body(..., description="List of calculations, each shaped like CalculationBase"),
+    current_user = Depends(get_current_active_user),
+):
+    """
+    Compute many calculations without saving them.
+
+    Rejected items are reported in 'errors' with their request positions.
+    """
+    # Validation and evaluation are CPU-bound; keep them off the event loop
+    results, errors = await run_in_threadpool(evaluate_batch_items, items)
+    return {"results": results, "errors": errors}
+
 
 # ------------------------------------------------------------------------------
 # Calculations Endpoints (BREAD)
@@ -266,10 +511,10 @@ def login_form(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = D
     status_code=status.HTTP_201_CREATED,
     tags=["calculations"],
 )
-def create_calculation(
+async def create_calculation(
     calculation_data: CalculationBase,
     current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new calculation for the authenticated user.
@@ -281,119 +526,520 @@ def create_calculation(
             user_id=current_user.id,
             inputs=calculation_data.inputs,
         )
-        new_calculation.result = new_calculation.get_result()
+        new_calculation.result = await result_cache.get_or_compute(
+            new_calculation.type, new_calculation.inputs, new_calculation.get_result
+        )
 
         db.add(new_calculation)
-        db.commit()
-        db.refresh(new_calculation)
+        await db.commit()
+        await record_write(current_user.id)
+        await db.refresh(new_calculation)
+        if settings.FAST_JSON_RESPONSES:
+            return Response(
+                content=dumps_calculation(new_calculation),
+                status_code=status.HTTP_201_CREATED,
+                media_type="application/json",
+            )
         return new_calculation
 
     except ValueError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
 
+# Batch Add Calculations
+@app.post(
+    "/calculations/batch",
+    response_model=CalculationBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["calculations"],
+)
+async def create_calculations_batch(
+    items: List[Any] = Body(..., description="List of calculations, each shaped like CalculationBase"),
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create many calculations for the authenticated user in one request.
+
+    Each item is validated and evaluated on its own; items that fail (bad
+    type, zero divisor, ...) are reported in 'errors' and the rest are stored
+    with a single multi-row INSERT ... RETURNING in one transaction.
+    """
+    # Validation and evaluation are CPU-bound; keep them off the event loop
+    computed, errors = await run_in_threadpool(evaluate_batch_items, items)
+    rows = [dict(item, user_id=current_user.id) for item in computed]
+
+    created = []
+    if rows:
+        table = Calculation.__table__
+        stmt = insert(table).returning(*table.c, sort_by_parameter_order=True)
+        try:
+            created = [dict(row._mapping) for row in await db.execute(stmt, rows)]
+            await db.commit()
+        except SQLAlchemyError:
+            await db.rollback()
+            raise
+        await record_write(current_user.id)
+
+    return {"created": created, "errors": errors}
+
+
 # Browse / List Calculations
+calculation_list_adapter = TypeAdapter(List[CalculationResponse])
+
+FIELDS_DESCRIPTION = "Comma-separated response fields to return, e.g. id,type,result (default: all)"
+
+def requested_fields(fields: Optional[str]):
+    """Parse ?fields=, turning unknown names into a 400."""
+    try:
+        return parse_calculation_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/calculations", response_model=List[CalculationResponse], tags=["calculations"])
-def list_calculations(
+async def list_calculations(
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of calculations to return"),
+    after: Optional[str] = Query(None, description="Cursor: return calculations older than this one"),
+    before: Optional[str] = Query(None, description="Cursor: return calculations newer than this one"),
+    type: Optional[CalculationType] = Query(None, description="Only return calculations of this type"),
+    created_from: Optional[datetime] = Query(None, description="Only return calculations created at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Only return calculations created before this time"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    List calculations belonging to the current authenticated user, newest first.
+
+    `fields` selects a subset of the response fields; only those columns
+    (plus the cursor columns) are read from the database.
+
+    Results are keyset-paginated on (created_at, id). Cursors for the
+    neighbouring pages are returned in the X-Next-Cursor (older rows, pass as
+    `after`) and X-Prev-Cursor (newer rows, pass as `before`) headers.
+
+    Rendered pages are cached per user (app.core.list_cache) until the user's
+    next create/update/delete. The ETag is derived from the user's list
+    version and the query, so If-None-Match gets a 304 until something changes.
+    Both need the version counters in Redis: without it (or while it is down)
+    every request is rendered from the database and no ETag is sent.
+    """
+    if after and before:
+        raise HTTPException(status_code=400, detail="Use either 'after' or 'before', not both.")
+    selected = requested_fields(fields)
+
+    page_key = repr((limit, after, before, type, created_from, created_to, selected))
+    list_version = await list_cache.version(current_user.id)  # None: not shared between workers
+    if list_version is not None:
+        etag = make_etag(current_user.id, list_version, page_key)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        cached_page = list_cache.get(current_user.id, list_version, page_key)
+        if cached_page is not None:
+            body, headers = cached_page
+            return Response(content=body, media_type="application/json", headers=headers)
+
+    # The fast path and sparse fieldsets read plain rows instead of ORM objects
+    fast_json = settings.FAST_JSON_RESPONSES
+    if selected:
+        query = select(*projection_columns(selected, "created_at", "id"))  # cursors need these
+    else:
+        query = select(*CALCULATION_COLUMNS) if fast_json else select(Calculation)
+    query = query.where(Calculation.user_id == current_user.id)
+    if type is not None:
+        query = query.where(Calculation.type == type.value)
+    if created_from is not None:
+        query = query.where(Calculation.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Calculation.created_at < created_to)
+
+    sort_key = tuple_(Calculation.created_at, Calculation.id)
+    try:
+        if after:
+            query = query.where(sort_key < tuple_(*decode_cursor(after)))
+        elif before:
+            query = query.where(sort_key > tuple_(*decode_cursor(before)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if before:
+        # Walk forwards from the cursor, then flip back to newest-first
+        query = query.order_by(Calculation.created_at.asc(), Calculation.id.asc())
+    else:
+        query = query.order_by(Calculation.created_at.desc(), Calculation.id.desc())
+
+    # Fetch one extra row to learn whether another page exists
+    result = await db.execute(query.limit(limit + 1))
+    calculations = list(result.all() if fast_json or selected else result.scalars().all())
+    has_more = len(calculations) > limit
+    calculations = calculations[:limit]
+    if before:
+        calculations.reverse()
+
+    headers = {"Cache-Control": CACHE_CONTROL}
+    if list_version is not None:
+        headers["ETag"] = etag
+    if calculations:
+        first, last = calculations[0], calculations[-1]
+        if has_more or before:
+            headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+        if (has_more and before) or after:
+            headers["X-Prev-Cursor"] = encode_cursor(first.created_at, first.id)
+
+    # Serialize once; the cached bytes are served as-is on later hits
+    if selected:
+        body = dumps_calculations_fields(calculations, selected, validate=not fast_json)
+    elif fast_json:
+        body = dumps_calculations(calculations)
+    else:
+        body = calculation_list_adapter.dump_json(
+            calculation_list_adapter.validate_python(calculations, from_attributes=True)
+        )
+    if list_version is not None:
+        list_cache.put(current_user.id, list_version, page_key, body, headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Bulk Import Calculations
+@app.post(
+    "/calculations/import",
+    response_model=CalculationImportResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["calculations"],
+)
+async def import_calculations(
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson (one JSON object per line) or csv"),
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Import calculations from a streamed CSV or NDJSON request body.
+
+    Records are evaluated in vectorized batches and loaded with COPY (on
+    PostgreSQL) in a single transaction. Records that fail parsing,
+    validation or evaluation are skipped and listed in an error file
+    available at 'errors_url' for IMPORT_ERROR_TTL_SECONDS.
+    """
+    await run_in_threadpool(prune_error_files)
+    import_id = uuid4()
+    error_file = ErrorFile(error_file_path(current_user.id, import_id))
+    batch_size = min(settings.IMPORT_BATCH_SIZE, settings.CALCULATION_BATCH_MAX_ITEMS)
+    imported, batch = 0, []
+    try:
+        async for line_number, record in iter_records(request.stream(), format):
+            if isinstance(record, RecordError):
+                error_file.write(line_number, str(record))
+                continue
+            batch.append((line_number, record))
+            if len(batch) >= batch_size:
+                imported += await import_batch(db, current_user.id, batch, error_file)
+                batch = []
+        if batch:
+            imported += await import_batch(db, current_user.id, batch, error_file)
+        await db.commit()
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except SQLAlchemyError:
+        await db.rollback()
+        raise
+    finally:
+        error_file.close()
+
+    if imported:
+        await record_write(current_user.id)
+    return {
+        "import_id": import_id,
+        "imported": imported,
+        "rejected": error_file.count,
+        "errors_url": f"/calculations/import/{import_id}/errors" if error_file.count else None,
+    }
+
+
+@app.get("/calculations/import/{import_id}/errors", tags=["calculations"])
+async def download_import_errors(
+    import_id: UUID,
     current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
 ):
     """
-    List all calculations belonging to the current authenticated user.
+    Download the rejected records of an import as NDJSON, one
+    {"line", "detail", "record"} object per rejected line.
+
+    Error files expire after IMPORT_ERROR_TTL_SECONDS. They live on the host
+    that ran the import, so behind a load balancer this only finds them if
+    IMPORT_ERROR_DIR is shared storage.
     """
-    calculations = db.query(Calculation).filter(Calculation.user_id == current_user.id).all()
-    return calculations
+    await run_in_threadpool(prune_error_files)
+    path = error_file_path(current_user.id, import_id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="No error file for this import.")
+    return FileResponse(path, media_type="application/x-ndjson", filename=f"import-{import_id}-errors.ndjson")
+
+
+# Aggregate Statistics
+@app.get("/calculations/stats", response_model=CalculationStatsResponse, tags=["calculations"])
+async def get_calculation_stats(
+    created_from: Optional[datetime] = Query(None, description="Only count calculations created at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Only count calculations created before this time"),
+    source: Literal["summary", "live"] = Query("summary", description="Read the summary table or aggregate the calculations"),
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Per-type counts and result min/max/avg, plus calculations per day, for
+    the current user.
+
+    Without a time range the figures come from the user_calculation_stats
+    summary table; with one (or with source=live) they are computed from
+    the calculations with a single GROUP BY.
+    """
+    if source == "summary" and created_from is None and created_to is None:
+        return await summary_stats(db, current_user.id)
+    return await calculation_stats(db, current_user.id, created_from, created_to)
+
+
+# Export a User's Full History
+# (declared before /calculations/{calc_id} so "export" is not taken as an id)
+@app.get("/calculations/export", tags=["calculations"])
+async def export_calculations(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson (one JSON object per line) or csv"),
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Stream every calculation of the current user, newest first.
+
+    Rows are read with a server-side cursor and written out as they arrive,
+    so memory stays flat however long the history is.
+    """
+    return StreamingResponse(
+        stream_calculations(db.bind, current_user.id, format, settings.EXPORT_YIELD_PER),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="calculations.{format}"'},
+    )
 
 
 # Read / Retrieve a Specific Calculation by ID
 @app.get("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
-def get_calculation(
+async def get_calculation(
     calc_id: str,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
     current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retrieve a single calculation by its UUID, if it belongs to the current user.
+
+    `fields` selects a subset of the response fields; only those columns
+    (plus id and updated_at for the ETag) are read from the database.
+
+    The ETag is derived from the calculation's id, updated_at and the
+    requested fields; a matching If-None-Match gets 304 Not Modified with
+    no body.
     """
     try:
         calc_uuid = UUID(calc_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid calculation id format.")
+    selected = requested_fields(fields)
 
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
-        Calculation.user_id == current_user.id
-    ).first()
+    query = select(*projection_columns(selected, "id", "updated_at")) if selected else select(Calculation)
+    result = await db.execute(
+        query.where(
+            Calculation.id == calc_uuid,
+            Calculation.user_id == current_user.id
+        )
+    )
+    calculation = result.first() if selected else result.scalars().first()
     if not calculation:
         raise HTTPException(status_code=404, detail="Calculation not found.")
 
+    etag = make_etag(calculation.id, calculation.updated_at.isoformat(), *selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if selected:
+        body = dumps_calculation_fields(calculation, selected, validate=not settings.FAST_JSON_RESPONSES)
+        return Response(content=body, media_type="application/json", headers=headers)
+    if settings.FAST_JSON_RESPONSES:
+        return Response(content=dumps_calculation(calculation), media_type="application/json", headers=headers)
+    response.headers.update(headers)
     return calculation
 
 
 # Edit / Update a Calculation
 @app.put("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
-def update_calculation(
+async def update_calculation(
     calc_id: str,
     calculation_update: CalculationUpdate,
     current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update the inputs (and thus the result) of a specific calculation.
+
+    One UPDATE ... WHERE id = :id AND user_id = :uid RETURNING statement: the
+    new result is computed beforehand for every calculation type and the
+    statement keeps the one matching the stored type.
     """
     try:
         calc_uuid = UUID(calc_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid calculation id format.")
 
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
-        Calculation.user_id == current_user.id
-    ).first()
-    if not calculation:
+    calculation, error = await update_calculation_returning(
+        db, current_user.id, calc_uuid, calculation_update.inputs
+    )
+    if calculation is None:
+        await db.rollback()
         raise HTTPException(status_code=404, detail="Calculation not found.")
-
-    if calculation_update.inputs is not None:
-        calculation.inputs = calculation_update.inputs
-        calculation.result = calculation.get_result()
-
-    calculation.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(calculation)
-    return calculation
+    if error is not None:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=error)
+    await db.commit()
+    await record_write(current_user.id)
+    if settings.FAST_JSON_RESPONSES:
+        return Response(content=dumps_calculation(calculation), media_type="application/json")
+    return dict(calculation._mapping)
 
 
 # Delete a Calculation
 @app.delete("/calculations/{calc_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["calculations"])
-def delete_calculation(
+async def delete_calculation(
     calc_id: str,
     current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Delete a calculation by its UUID, if it belongs to the current user.
+    Delete a calculation by its UUID, if it belongs to the current user,
+    with one DELETE ... WHERE id = :id AND user_id = :uid RETURNING id.
     """
     try:
         calc_uuid = UUID(calc_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid calculation id format.")
 
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
-        Calculation.user_id == current_user.id
-    ).first()
-    if not calculation:
+    if not await delete_calculation_returning(db, current_user.id, calc_uuid):
+        await db.rollback()
         raise HTTPException(status_code=404, detail="Calculation not found.")
-
-    db.delete(calculation)
-    db.commit()
+    await db.commit()
+    await record_write(current_user.id)
     return None
 
 
+# Bulk Delete Calculations
+@app.delete("/calculations", response_model=CalculationBulkDeleteResponse, tags=["calculations"])
+async def delete_calculations_bulk(
+    criteria: CalculationBulkDelete,
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete many of the current user's calculations: the given ids, and/or
+    those matching a type and creation-time range.
+
+    Runs as one DELETE ... WHERE user_id = :uid AND ... statement; ids that
+    do not exist or belong to someone else are simply not counted.
+    """
+    if criteria.ids is not None and len(criteria.ids) > settings.CALCULATION_BULK_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A bulk delete may name at most {settings.CALCULATION_BULK_MAX_IDS} ids."
+        )
+    try:
+        deleted = await delete_calculations(
+            db,
+            current_user.id,
+            ids=criteria.ids,
+            calc_type=criteria.type.value if criteria.type is not None else None,
+            created_from=criteria.created_from,
+            created_to=criteria.created_to,
+        )
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        raise
+    if deleted:
+        await record_write(current_user.id)
+    return {"deleted": deleted}
+
+
+# Bulk Update Calculations
+@app.patch("/calculations", response_model=CalculationBulkUpdateResponse, tags=["calculations"])
+async def update_calculations_bulk(
+    items: List[Any] = Body(..., description="List of {id, inputs} edits, each shaped like CalculationBulkUpdateItem"),
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Give many of the current user's calculations new inputs and recompute
+    their results.
+
+    The inputs are evaluated column-wise with the vectorized engine as every
+    calculation type, and all rows are written with one set-based UPDATE
+    ... FROM (the edits) WHERE user_id = :uid RETURNING id that keeps the
+    result for each row's stored type. 'updated' counts the rows it returned.
+    Items that are invalid, repeat an id, are unknown or fail to evaluate
+    for their type are reported in 'errors'; the rest are applied in one
+    transaction.
+    """
+    if len(items) > settings.CALCULATION_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch may contain at most {settings.CALCULATION_BATCH_MAX_ITEMS} items."
+        )
+
+    edits, errors, seen = [], [], set()
+    for index, item in enumerate(items):
+        try:
+            edit = CalculationBulkUpdateItem.model_validate(item)
+        except ValidationError as e:
+            errors.append({"index": index, "detail": "; ".join(err["msg"] for err in e.errors())})
+            continue
+        if edit.id in seen:
+            errors.append({"index": index, "detail": "Calculation appears more than once in the request."})
+            continue
+        seen.add(edit.id)
+        edits.append((index, edit))
+
+    # Evaluation is CPU-bound; keep it off the event loop
+    evaluated = await run_in_threadpool(evaluate_for_every_type, [edit.inputs for _, edit in edits])
+    rows = [
+        {"id": edit.id, "inputs": edit.inputs, "results": results}
+        for (_, edit), (results, _) in zip(edits, evaluated)
+    ]
+
+    try:
+        updated_ids = set(await update_calculation_inputs(db, current_user.id, rows))
+        types = {}
+        if len(updated_ids) < len(rows):
+            # Error path only: tell unknown ids from inputs invalid for the stored type
+            types = await calculation_types(db, current_user.id, [row["id"] for row in rows if row["id"] not in updated_ids])
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        raise
+    for (index, edit), (_, type_errors) in zip(edits, evaluated):
+        if edit.id not in updated_ids:
+            detail = type_errors.get(types.get(edit.id))
+            errors.append({"index": index, "detail": detail or "Calculation not found."})
+
+    updated = len(updated_ids)
+    if updated:
+        await record_write(current_user.id)
+    errors.sort(key=lambda e: e["index"])
+    return {"updated": updated, "errors": errors}
+
+
 # ------------------------------------------------------------------------------
 # Main Block to Run the Server
 # ------------------------------------------------------------------------------
@@ -1,3 +1,4 @@
 # This file makes the 'models' folder a package and loads all models.
 from .user import User
-from .calculation import Calculation
\ No newline at end of file
+from .calculation import Calculation
+from .calculation_stats import UserCalculationStats
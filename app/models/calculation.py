@@ -14,15 +14,21 @@ These models are designed for a calculator application that supports
 basic mathematical operations: addition, subtraction, multiplication, and division.
 """
 
+from array import array
 from datetime import datetime
 import uuid
-from typing import List
+from typing import Dict, List
 from app.operations import exponentiate, modulus
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Float
+from app.operations.vectorized import evaluate_many
+from sqlalchemy import Column, String, DateTime, ForeignKey, Float, Index, literal_column
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, declared_attr
 from sqlalchemy.ext.declarative import declared_attr
 from app.database import Base
+from app.models.types import Float64Array
+
+# Inputs arrive from the API as lists and are loaded from the database as array('d')
+INPUT_SEQUENCE_TYPES = (list, array)
 
 class AbstractCalculation:
     """
@@ -74,8 +80,7 @@ class AbstractCalculation:
         return Column(
             UUID(as_uuid=True), 
             ForeignKey('users.id', ondelete='CASCADE'),
-            nullable=False,
-            index=True  # Index for faster queries filtering by user_id
+            nullable=False  # Indexed as the leading column of the composite indexes below
         )
 
     @declared_attr
@@ -88,19 +93,20 @@ class AbstractCalculation:
         """
         return Column(
             String(50), 
-            nullable=False,
-            index=True  # Index for faster queries filtering by type
+            nullable=False  # Filtered together with user_id, see ix_calculations_user_id_type_created_at
         )
 
     @declared_attr
     def inputs(cls):
         """
-        JSON column storing the input values for the calculation.
+        Numeric array column storing the input values for the calculation.
         
-        Using JSON type allows flexible storage of any number of inputs.
+        Stored as DOUBLE PRECISION[] on PostgreSQL (so inputs can be
+        unnested and aggregated in SQL) and as a float64 blob elsewhere;
+        loaded values are array('d') rather than parsed JSON lists.
         """
         return Column(
-            JSON, 
+            Float64Array, 
             nullable=False
         )
 
@@ -171,6 +177,23 @@ class AbstractCalculation:
         Returns:
             An instance of the appropriate Calculation subclass
             
+        Raises:
+            ValueError: If the calculation_type is not supported
+        """
+        calculation_class = cls.get_class(calculation_type)
+        return calculation_class(user_id=user_id, inputs=inputs)
+
+    @classmethod
+    def get_class(cls, calculation_type: str) -> type:
+        """
+        Look up the calculation subclass for a calculation type.
+        
+        Args:
+            calculation_type: The type of calculation (e.g., "addition")
+            
+        Returns:
+            The Calculation subclass implementing that type
+            
         Raises:
             ValueError: If the calculation_type is not supported
         """
@@ -186,15 +209,21 @@ class AbstractCalculation:
         calculation_class = calculation_classes.get(calculation_type.lower())
         if not calculation_class:
             raise ValueError(f"Unsupported calculation type: {calculation_type}")
-        return calculation_class(user_id=user_id, inputs=inputs)
+        return calculation_class
 
-    def get_result(self) -> float:
+    @staticmethod
+    def compute(inputs: List[float]) -> float:
         """
-        Method to compute calculation result.
+        Compute a result directly from a list of inputs.
         
         This is an abstract method that must be implemented by subclasses.
-        It defines the interface that all calculation types must implement.
+        It holds the operation's business logic and needs no model instance,
+        so callers that only want the answer (e.g. POST /compute) can skip
+        building an ORM object.
         
+        Args:
+            inputs: List of numeric inputs for the calculation
+            
         Returns:
             float: The result of the calculation
             
@@ -203,6 +232,45 @@ class AbstractCalculation:
         """
         raise NotImplementedError
 
+    def get_result(self) -> float:
+        """
+        Method to compute calculation result.
+        
+        Delegates to the subclass's compute() with this calculation's inputs.
+        
+        Returns:
+            float: The result of the calculation
+            
+        Raises:
+            NotImplementedError: If not implemented by a subclass
+        """
+        return self.compute(self.inputs)
+
+    @staticmethod
+    def compute_results(calculations: List["Calculation"]) -> Dict[int, str]:
+        """
+        Compute and assign the result of many calculations at once.
+
+        Instead of calling get_result() on each instance, the inputs are
+        grouped by type and evaluated column-wise with NumPy (see
+        app.operations.vectorized). Results are identical to get_result().
+        Calculations that fail keep their current result and are reported.
+
+        Args:
+            calculations: Calculation instances of any mix of types
+
+        Returns:
+            Dict[int, str]: Error message per position of a failed calculation
+        """
+        outcomes = evaluate_many([(calc.type, calc.inputs) for calc in calculations])
+        errors = {}
+        for index, (calc, (result, error)) in enumerate(zip(calculations, outcomes)):
+            if error is not None:
+                errors[index] = error
+            else:
+                calc.result = result
+        return errors
+
     def __repr__(self):
         """
         String representation of the calculation for debugging.
@@ -228,6 +296,24 @@ class Calculation(Base, AbstractCalculation):
         "polymorphic_identity": "calculation",
         #"with_polymorphic": "*"  # Eager load all subclass columns (commented out)
     }
+    __table_args__ = (
+        # Composite indexes matching the real access paths. Both keep the
+        # newest-first order of the list endpoint, so a page is an index range
+        # scan with no sort step; user_id alone is served by their prefix.
+        #
+        # A user's history, keyset-paginated:
+        # WHERE user_id = ? AND (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC
+        Index(
+            "ix_calculations_user_id_created_at_desc",
+            "user_id", literal_column("created_at").desc(), literal_column("id").desc(),
+        ),
+        # A user's history of one type (list ?type=, stats, summary triggers):
+        # WHERE user_id = ? AND type = ? [AND created_at ...] ORDER BY created_at DESC, id DESC
+        Index(
+            "ix_calculations_user_id_type_created_at",
+            "user_id", "type", literal_column("created_at").desc(), literal_column("id").desc(),
+        ),
+    )
 
 class Addition(Calculation):
     """
@@ -240,7 +326,8 @@ class Addition(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "addition"}
 
-    def get_result(self) -> float:
+    @staticmethod
+    def compute(inputs: List[float]) -> float:
         """
         Calculate the sum of all input values.
         
@@ -252,11 +339,11 @@ class Addition(Calculation):
         Raises:
             ValueError: If inputs are not a list or if fewer than 2 numbers provided
         """
-        if not isinstance(self.inputs, list):
+        if not isinstance(inputs, INPUT_SEQUENCE_TYPES):
             raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
+        if len(inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
-        return sum(self.inputs)
+        return sum(inputs)
 
 class Subtraction(Calculation):
     """
@@ -269,7 +356,8 @@ class Subtraction(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "subtraction"}
 
-    def get_result(self) -> float:
+    @staticmethod
+    def compute(inputs: List[float]) -> float:
         """
         Calculate the result of subtracting subsequent values from the first value.
         
@@ -281,12 +369,12 @@ class Subtraction(Calculation):
         Raises:
             ValueError: If inputs are not a list or if fewer than 2 numbers provided
         """
-        if not isinstance(self.inputs, list):
+        if not isinstance(inputs, INPUT_SEQUENCE_TYPES):
             raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
+        if len(inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
+        result = inputs[0]
+        for value in inputs[1:]:
             result -= value
         return result
 
@@ -301,7 +389,8 @@ class Multiplication(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "multiplication"}
 
-    def get_result(self) -> float:
+    @staticmethod
+    def compute(inputs: List[float]) -> float:
         """
         Calculate the product of all input values.
         
@@ -311,12 +400,12 @@ class Multiplication(Calculation):
         Raises:
             ValueError: If inputs are not a list or if fewer than 2 numbers provided
         """
-        if not isinstance(self.inputs, list):
+        if not isinstance(inputs, INPUT_SEQUENCE_TYPES):
             raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
+        if len(inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
         result = 1
-        for value in self.inputs:
+        for value in inputs:
             result *= value
         return result
 
@@ -334,7 +423,8 @@ class Division(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "division"}
 
-    def get_result(self) -> float:
+    @staticmethod
+    def compute(inputs: List[float]) -> float:
         """
         Calculate the result of dividing the first value by all subsequent values.
         
@@ -348,12 +438,12 @@ class Division(Calculation):
             ValueError: If inputs are not a list, if fewer than 2 numbers provided,
                         or if attempting to divide by zero
         """
-        if not isinstance(self.inputs, list):
+        if not isinstance(inputs, INPUT_SEQUENCE_TYPES):
             raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
+        if len(inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
+        result = inputs[0]
+        for value in inputs[1:]:
             if value == 0:
                 raise ValueError("Cannot divide by zero.")
             result /= value
@@ -369,13 +459,14 @@ class Modulus(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "modulus"}
 
-    def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
+    @staticmethod
+    def compute(inputs: List[float]) -> float:
+        if not isinstance(inputs, INPUT_SEQUENCE_TYPES):
             raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
+        if len(inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
+        result = inputs[0]
+        for value in inputs[1:]:
             if value == 0:
                 raise ValueError("Cannot perform modulus by zero.")
             result %= value
@@ -392,12 +483,13 @@ class Exponentiate(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "exponentiate"}
 
-    def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
+    @staticmethod
+    def compute(inputs: List[float]) -> float:
+        if not isinstance(inputs, INPUT_SEQUENCE_TYPES):
             raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
+        if len(inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
+        result = inputs[0]
+        for value in inputs[1:]:
             result **= value
         return result
\ No newline at end of file
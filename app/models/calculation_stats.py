@@ -0,0 +1,189 @@
+# app/models/calculation_stats.py
+"""
+Per-user calculation summary table.
+
+user_calculation_stats holds one row per (user, calculation type, day) with
+the count, result count/sum/min/max and last activity of that group, so
+dashboards and reports read a handful of rows instead of scanning a user's
+whole history.
+
+The table is maintained by database triggers on `calculations`, so every
+write path (ORM, multi-row INSERT, COPY, bulk UPDATE/DELETE) keeps it in
+sync inside the writing transaction:
+
+- PostgreSQL: statement-level triggers with transition tables, so a
+  10,000-row batch or COPY costs one aggregated upsert, not 10,000. The
+  trigger functions only run DML (no temp tables), so single-row PUTs and
+  DELETEs do not churn the system catalogs
+- SQLite: row-level triggers with the same effect
+
+The triggers are installed whenever the tables are created with
+Base.metadata.create_all(); `python -m app.scripts.rebuild_calculation_stats`
+(re)installs them and recomputes the table from `calculations` to repair drift.
+"""
+
+from sqlalchemy import Column, Date, DateTime, DDL, Float, ForeignKey, Integer, String, event
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database import Base
+
+
+class UserCalculationStats(Base):
+    """Aggregates of one user's calculations of one type created on one day."""
+
+    __tablename__ = "user_calculation_stats"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    type = Column(String(50), primary_key=True)
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    result_count = Column(Integer, nullable=False, default=0)  # rows with a non-NULL result
+    result_sum = Column(Float, nullable=False, default=0.0)
+    min_result = Column(Float, nullable=True)
+    max_result = Column(Float, nullable=True)
+    last_activity = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<UserCalculationStats(user_id={self.user_id}, type={self.type}, day={self.day}, count={self.count})>"
+
+
+# --- PostgreSQL: statement-level triggers -------------------------------------
+
+POSTGRES_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION user_calculation_stats_add() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO user_calculation_stats AS s
+            (user_id, type, day, count, result_count, result_sum, min_result, max_result, last_activity)
+        SELECT user_id, type, created_at::date, count(*), count(result), coalesce(sum(result), 0),
+               min(result), max(result), max(updated_at)
+        FROM new_rows
+        GROUP BY user_id, type, created_at::date
+        ON CONFLICT (user_id, type, day) DO UPDATE SET
+            count = s.count + EXCLUDED.count,
+            result_count = s.result_count + EXCLUDED.result_count,
+            result_sum = s.result_sum + EXCLUDED.result_sum,
+            min_result = LEAST(s.min_result, EXCLUDED.min_result),
+            max_result = GREATEST(s.max_result, EXCLUDED.max_result),
+            last_activity = GREATEST(s.last_activity, EXCLUDED.last_activity);
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION user_calculation_stats_remove() RETURNS trigger AS $$
+    BEGIN
+        -- min/max cannot be decremented: re-read them where a boundary value left
+        -- (AFTER triggers see the statement's changes in calculations)
+        WITH r AS (
+            SELECT user_id, type, created_at::date AS day, count(*) AS count, count(result) AS result_count,
+                   coalesce(sum(result), 0) AS result_sum, min(result) AS min_result, max(result) AS max_result
+            FROM old_rows
+            GROUP BY user_id, type, created_at::date
+        )
+        UPDATE user_calculation_stats s SET
+            count = s.count - r.count,
+            result_count = s.result_count - r.result_count,
+            result_sum = s.result_sum - r.result_sum,
+            min_result = CASE WHEN r.min_result <= s.min_result THEN (
+                SELECT min(c.result) FROM calculations c
+                WHERE c.user_id = r.user_id AND c.type = r.type
+                  AND c.created_at >= r.day AND c.created_at < r.day + 1
+            ) ELSE s.min_result END,
+            max_result = CASE WHEN r.max_result >= s.max_result THEN (
+                SELECT max(c.result) FROM calculations c
+                WHERE c.user_id = r.user_id AND c.type = r.type
+                  AND c.created_at >= r.day AND c.created_at < r.day + 1
+            ) ELSE s.max_result END,
+            last_activity = GREATEST(s.last_activity, now() AT TIME ZONE 'utc')
+        FROM r
+        WHERE s.user_id = r.user_id AND s.type = r.type AND s.day = r.day;
+
+        DELETE FROM user_calculation_stats s
+        USING (SELECT DISTINCT user_id, type, created_at::date AS day FROM old_rows) r
+        WHERE s.user_id = r.user_id AND s.type = r.type AND s.day = r.day AND s.count <= 0;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS user_calculation_stats_insert ON calculations",
+    "DROP TRIGGER IF EXISTS user_calculation_stats_update_old ON calculations",
+    "DROP TRIGGER IF EXISTS user_calculation_stats_update_new ON calculations",
+    "DROP TRIGGER IF EXISTS user_calculation_stats_delete ON calculations",
+    """
+    CREATE TRIGGER user_calculation_stats_insert AFTER INSERT ON calculations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_calculation_stats_add()
+    """,
+    # Updates add the new rows and take the old ones out; either order gives the
+    # same result, since removal re-reads min/max from the already-updated table
+    """
+    CREATE TRIGGER user_calculation_stats_update_new AFTER UPDATE ON calculations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_calculation_stats_add()
+    """,
+    """
+    CREATE TRIGGER user_calculation_stats_update_old AFTER UPDATE ON calculations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_calculation_stats_remove()
+    """,
+    """
+    CREATE TRIGGER user_calculation_stats_delete AFTER DELETE ON calculations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_calculation_stats_remove()
+    """,
+]
+
+# --- SQLite: row-level triggers -----------------------------------------------
+
+_SQLITE_ADD_NEW = """
+    INSERT INTO user_calculation_stats
+        (user_id, type, day, count, result_count, result_sum, min_result, max_result, last_activity)
+    VALUES (NEW.user_id, NEW.type, date(NEW.created_at), 1, NEW.result IS NOT NULL,
+            coalesce(NEW.result, 0), NEW.result, NEW.result, NEW.updated_at)
+    ON CONFLICT (user_id, type, day) DO UPDATE SET
+        count = count + 1,
+        result_count = result_count + excluded.result_count,
+        result_sum = result_sum + excluded.result_sum,
+        min_result = coalesce(min(min_result, excluded.min_result), min_result, excluded.min_result),
+        max_result = coalesce(max(max_result, excluded.max_result), max_result, excluded.max_result),
+        last_activity = coalesce(max(last_activity, excluded.last_activity), last_activity, excluded.last_activity);
+"""
+
+_SQLITE_REMOVE_OLD = """
+    UPDATE user_calculation_stats SET
+        count = count - 1,
+        result_count = result_count - (OLD.result IS NOT NULL),
+        result_sum = result_sum - coalesce(OLD.result, 0),
+        min_result = (SELECT min(result) FROM calculations c
+                      WHERE c.user_id = OLD.user_id AND c.type = OLD.type AND date(c.created_at) = date(OLD.created_at)),
+        max_result = (SELECT max(result) FROM calculations c
+                      WHERE c.user_id = OLD.user_id AND c.type = OLD.type AND date(c.created_at) = date(OLD.created_at)),
+        last_activity = datetime('now')
+    WHERE user_id = OLD.user_id AND type = OLD.type AND day = date(OLD.created_at);
+    DELETE FROM user_calculation_stats
+    WHERE user_id = OLD.user_id AND type = OLD.type AND day = date(OLD.created_at) AND count <= 0;
+"""
+
+SQLITE_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS user_calculation_stats_insert",
+    "DROP TRIGGER IF EXISTS user_calculation_stats_update",
+    "DROP TRIGGER IF EXISTS user_calculation_stats_delete",
+    f"CREATE TRIGGER user_calculation_stats_insert AFTER INSERT ON calculations BEGIN {_SQLITE_ADD_NEW} END",
+    f"CREATE TRIGGER user_calculation_stats_update AFTER UPDATE ON calculations BEGIN {_SQLITE_REMOVE_OLD} {_SQLITE_ADD_NEW} END",
+    f"CREATE TRIGGER user_calculation_stats_delete AFTER DELETE ON calculations BEGIN {_SQLITE_REMOVE_OLD} END",
+]
+
+
+def trigger_statements(dialect_name: str):
+    """DDL statements that install the summary triggers for a dialect."""
+    if dialect_name == "postgresql":
+        return POSTGRES_TRIGGERS
+    if dialect_name == "sqlite":
+        return SQLITE_TRIGGERS
+    return []
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_triggers(target, connection, **kw):
+    # Runs once all tables exist, so both calculations and the summary table are there
+    for statement in trigger_statements(connection.dialect.name):
+        connection.execute(DDL(statement))
@@ -0,0 +1,63 @@
+# app/models/types.py
+"""
+Custom column types.
+
+Float64Array stores a list of numbers as native float64 values:
+
+- PostgreSQL: DOUBLE PRECISION[] so the database can index, unnest and
+  aggregate inputs (e.g. SELECT avg(x) FROM calculations, unnest(inputs) x)
+- Other databases: a little-endian float64 blob (8 bytes per value)
+
+Values are read back as array('d'), which shares its buffer with NumPy via
+np.frombuffer() and compares and iterates like a list of floats.
+"""
+
+import sys
+from array import array
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects.postgresql import ARRAY, DOUBLE_PRECISION
+from sqlalchemy.types import TypeDecorator
+
+
+def pack_float64(values) -> bytes:
+    """Encode numbers as a little-endian float64 blob."""
+    packed = array("d", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_float64(blob: bytes) -> array:
+    """Decode a little-endian float64 blob into array('d')."""
+    values = array("d")
+    values.frombytes(blob)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class Float64Array(TypeDecorator):
+    """A list of floats stored as DOUBLE PRECISION[] or a float64 blob."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(ARRAY(DOUBLE_PRECISION))
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == "postgresql":
+            return [float(v) for v in value]
+        return pack_float64(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == "postgresql":
+            return array("d", value)
+        return unpack_float64(value)
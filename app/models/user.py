@@ -17,7 +17,7 @@ The User model is designed to follow security best practices:
 
 import uuid
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import Column, String, Boolean, DateTime, or_
+from sqlalchemy import Column, String, Boolean, DateTime, or_, select
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 from app.core.config import get_settings
@@ -56,10 +56,8 @@ class User(Base):
     
     # Primary key and identifying fields
     id = Column(PG_UUID(as_uuid=True), 
-                primary_key=True, 
-                default=uuid.uuid4,  # Auto-generate UUIDs
-                unique=True, 
-                index=True)          # Index for faster lookups
+                primary_key=True,    # The primary key is already unique and indexed
+                default=uuid.uuid4)  # Auto-generate UUIDs
     
     username = Column(String(50), 
                       unique=True,    # Prevent duplicate usernames 
@@ -160,6 +158,53 @@ class User(Base):
         from app.auth.jwt import get_password_hash
         return get_password_hash(password)
 
+    @classmethod
+    def _validate_registration_password(cls, user_data: dict) -> str:
+        """Return the registration password, raising ValueError if it is too short."""
+        password = user_data.get("password")
+        if not password or len(password) < 6:
+            raise ValueError("Password must be at least 6 characters long")
+        return password
+
+    @classmethod
+    def _duplicate_filter(cls, user_data: dict):
+        """Filter matching an existing user with the same email or username."""
+        return or_(cls.email == user_data["email"], cls.username == user_data["username"])
+
+    @classmethod
+    def _login_filter(cls, username_or_email: str):
+        """Filter matching a user by username or email."""
+        return or_(cls.username == username_or_email, cls.email == username_or_email)
+
+    @classmethod
+    def _from_registration(cls, user_data: dict, hashed_password: str) -> "User":
+        """Build a new, active, unverified user from registration data."""
+        return cls(
+            first_name=user_data["first_name"],
+            last_name=user_data["last_name"],
+            email=user_data["email"],
+            username=user_data["username"],
+            password=hashed_password,
+            is_active=True,
+            is_verified=False
+        )
+
+    @classmethod
+    def _login_result(cls, user: "User") -> dict:
+        """Stamp last_login and issue a fresh access/refresh token pair."""
+        user.last_login = utcnow()
+        access_token = cls.create_access_token({"sub": str(user.id)})
+        refresh_token = cls.create_refresh_token({"sub": str(user.id)})
+        expires_at = utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_at": expires_at,
+            "user": user
+        }
+
     @classmethod
     def register(cls, db, user_data: dict):
         """
@@ -175,28 +220,46 @@ class User(Base):
         Raises:
             ValueError: If password is invalid or username/email already exists
         """
-        password = user_data.get("password")
-        if not password or len(password) < 6:
-            raise ValueError("Password must be at least 6 characters long")
+        password = cls._validate_registration_password(user_data)
         
         # Check for duplicate email or username
-        existing_user = db.query(cls).filter(
-            or_(cls.email == user_data["email"], cls.username == user_data["username"])
-        ).first()
+        existing_user = db.query(cls).filter(cls._duplicate_filter(user_data)).first()
         if existing_user:
             raise ValueError("Username or email already exists")
         
         # Create new user instance
-        hashed_password = cls.hash_password(password)
-        user = cls(
-            first_name=user_data["first_name"],
-            last_name=user_data["last_name"],
-            email=user_data["email"],
-            username=user_data["username"],
-            password=hashed_password,
-            is_active=True,
-            is_verified=False
-        )
+        user = cls._from_registration(user_data, cls.hash_password(password))
+        db.add(user)
+        return user
+
+    @classmethod
+    async def register_async(cls, db, user_data: dict):
+        """
+        Register a new user using an AsyncSession.
+
+        Same behaviour as register(); the bcrypt hash runs on the bounded
+        password-hashing pool (app.auth.hashing).
+
+        Args:
+            db: SQLAlchemy AsyncSession
+            user_data: Dictionary containing user registration data
+            
+        Returns:
+            User: The newly created user instance
+            
+        Raises:
+            ValueError: If password is invalid or username/email already exists
+            HTTPException: 503 if the password-hashing pool is saturated
+        """
+        from app.auth.hashing import password_hasher
+        password = cls._validate_registration_password(user_data)
+
+        result = await db.execute(select(cls).where(cls._duplicate_filter(user_data)).limit(1))
+        if result.scalars().first():
+            raise ValueError("Username or email already exists")
+
+        hashed_password = await password_hasher.hash(password)
+        user = cls._from_registration(user_data, hashed_password)
         db.add(user)
         return user
 
@@ -213,29 +276,46 @@ class User(Base):
         Returns:
             dict: Authentication result with tokens and user data, or None if authentication fails
         """
-        user = db.query(cls).filter(
-            or_(cls.username == username_or_email, cls.email == username_or_email)
-        ).first()
+        user = db.query(cls).filter(cls._login_filter(username_or_email)).first()
 
         if not user or not user.verify_password(password):
             return None
 
-        # Update the last_login timestamp
-        user.last_login = utcnow()
+        # Update the last_login timestamp and generate tokens
+        result = cls._login_result(user)
         db.flush()
+        return result
 
-        # Generate tokens
-        access_token = cls.create_access_token({"sub": str(user.id)})
-        refresh_token = cls.create_refresh_token({"sub": str(user.id)})
-        expires_at = utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    @classmethod
+    async def authenticate_async(cls, db, username_or_email: str, password: str):
+        """
+        Authenticate a user by username/email and password using an AsyncSession.
 
-        return {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "token_type": "bearer",
-            "expires_at": expires_at,
-            "user": user
-        }
+        Same behaviour as authenticate(); the bcrypt check runs on the bounded
+        password-hashing pool (app.auth.hashing).
+        
+        Args:
+            db: SQLAlchemy AsyncSession
+            username_or_email: Username or email to authenticate
+            password: Password to verify
+            
+        Returns:
+            dict: Authentication result with tokens and user data, or None if authentication fails
+
+        Raises:
+            HTTPException: 503 if the password-hashing pool is saturated
+        """
+        from app.auth.hashing import password_hasher
+        result = await db.execute(select(cls).where(cls._login_filter(username_or_email)).limit(1))
+        user = result.scalars().first()
+
+        if not user or not await password_hasher.verify(password, user.password):
+            return None
+
+        # Update the last_login timestamp and generate tokens
+        login_result = cls._login_result(user)
+        await db.flush()
+        return login_result
 
     @classmethod
     def create_access_token(cls, data: dict) -> str:
@@ -0,0 +1,195 @@
+# app/operations/vectorized.py
+"""
+Module: vectorized.py
+
+Columnar evaluation engine for calculations.
+
+The calculation models in app.models.calculation evaluate one row at a time
+by looping over self.inputs in Python. When many calculations of the same
+type need evaluating at once (batch creation, recompute, bulk import), this
+module packs their inputs into a padded 2-D float64 array (one row per
+calculation) and folds the columns left-to-right with NumPy, so the Python
+loop runs once per *column* instead of once per *value*.
+
+Results are bit-for-bit identical to the scalar get_result() path:
+- Every step is applied in the same left-to-right order as the scalar loop
+  (no pairwise summation), and only to rows that still have inputs left.
+- Zero divisors in division/modulus are reported per row with the same
+  messages the models raise; the rest of the batch is unaffected.
+- NumPy's SIMD power kernel is not bit-identical to the C library pow()
+  that Python floats use, so exponentiation steps apply Python's float
+  power element-wise. Rows that overflow or leave the real numbers are
+  re-run through the scalar path so they fail the same way it does.
+
+Functions:
+- evaluate(calculation_type, inputs) -> (results, errors)
+- evaluate_many(items) -> list of (result, error) pairs in request order
+"""
+
+from array import array
+from functools import reduce
+from itertools import chain
+import operator
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Row = Sequence[float]
+
+_NOT_A_LIST = "Inputs must be a list of numbers."
+_TOO_SHORT = "Inputs must be a list with at least two numbers."
+
+
+def _py_pow(base: float, exponent: float) -> float:
+    """Python float power, mapping failures to NaN so the row gets re-checked."""
+    try:
+        value = base ** exponent
+    except (OverflowError, ZeroDivisionError):
+        return float("nan")
+    return value if isinstance(value, float) else float("nan")
+
+
+_pow_elementwise = np.frompyfunc(_py_pow, 2, 1)
+
+
+def _power(acc: np.ndarray, col: np.ndarray) -> np.ndarray:
+    return _pow_elementwise(acc, col).astype(np.float64)
+
+
+# type -> (step ufunc, zero-divisor message or None, scalar fallback step)
+_OPERATIONS = {
+    "addition": (np.add, None, operator.add),
+    "subtraction": (np.subtract, None, operator.sub),
+    "multiplication": (np.multiply, None, operator.mul),
+    "division": (np.divide, "Cannot divide by zero.", operator.truediv),
+    "modulus": (np.mod, "Cannot perform modulus by zero.", operator.mod),
+    "exponentiate": (_power, None, operator.pow),
+}
+
+
+def _scalar(calculation_type: str, row: Row) -> Tuple[Optional[float], Optional[str]]:
+    """Evaluate one row the way the model's get_result() loop does."""
+    step = _OPERATIONS[calculation_type][2]
+    try:
+        value = reduce(step, row[1:], row[0])
+    except (ArithmeticError, ValueError) as e:
+        return None, str(e)
+    if not isinstance(value, float):
+        return None, "Result is not a real number."
+    return value, None
+
+
+def evaluate(calculation_type: str, inputs: Sequence[Row]) -> Tuple[np.ndarray, Dict[int, str]]:
+    """
+    Evaluate many calculations of one type in a single pass.
+
+    Args:
+        calculation_type: One of the supported calculation types (e.g. "division")
+        inputs: One list of numeric inputs per calculation
+
+    Returns:
+        tuple: (results, errors) where results is a float64 array aligned with
+        inputs (NaN for rejected rows) and errors maps row index -> message
+
+    Raises:
+        ValueError: If calculation_type is not supported
+    """
+    calculation_type = calculation_type.lower()
+    if calculation_type not in _OPERATIONS:
+        raise ValueError(f"Unsupported calculation type: {calculation_type}")
+    step, zero_message, _ = _OPERATIONS[calculation_type]
+
+    n = len(inputs)
+    errors: Dict[int, str] = {}
+    lengths = np.zeros(n, dtype=np.intp)
+    for i, row in enumerate(inputs):
+        if not isinstance(row, (list, array)):
+            errors[i] = _NOT_A_LIST
+        elif len(row) < 2:
+            errors[i] = _TOO_SHORT
+        else:
+            lengths[i] = len(row)
+
+    results = np.full(n, np.nan)
+    if not lengths.any():
+        return results, errors
+
+    width = int(lengths.max())
+    matrix = np.zeros((n, width))
+    try:
+        # Fast path: a row-major boolean mask fills each row's prefix in order
+        flat = np.fromiter(
+            chain.from_iterable(inputs[i] for i in np.flatnonzero(lengths)),
+            dtype=np.float64,
+            count=int(lengths.sum()),
+        )
+        matrix[np.arange(width) < lengths[:, None]] = flat
+    except (TypeError, ValueError):
+        # Some row holds a non-number; fill row by row to find it
+        for i in np.flatnonzero(lengths):
+            try:
+                matrix[i, :lengths[i]] = inputs[i]
+            except (TypeError, ValueError):
+                errors[int(i)] = _NOT_A_LIST
+                lengths[i] = 0
+
+    valid = lengths > 0
+    fallback = np.zeros(n, dtype=bool)
+    # The scalar sum() starts from integer 0, which turns -0.0 into 0.0
+    acc = matrix[:, 0] + 0.0 if calculation_type == "addition" else matrix[:, 0].copy()
+    with np.errstate(all="ignore"):
+        for j in range(1, width):
+            col = matrix[:, j]
+            active = valid & (lengths > j)
+            if zero_message is not None:
+                zero = active & (col == 0)
+                for i in np.flatnonzero(zero):
+                    errors[int(i)] = zero_message
+                valid &= ~zero
+                active &= ~zero
+            rows = np.flatnonzero(active)
+            if rows.size:
+                acc[rows] = step(acc[rows], col[rows])
+            if calculation_type == "exponentiate":
+                fallback |= active & ~np.isfinite(acc)
+
+    for i in np.flatnonzero(fallback):
+        value, error = _scalar(calculation_type, inputs[i])
+        if error is not None:
+            errors[int(i)] = error
+            valid[i] = False
+        else:
+            acc[i] = value
+
+    results[valid] = acc[valid]
+    return results, errors
+
+
+def evaluate_many(items: Sequence[Tuple[str, Row]]) -> List[Tuple[Optional[float], Optional[str]]]:
+    """
+    Evaluate a mixed list of calculations, grouping them by type.
+
+    Args:
+        items: (calculation_type, inputs) pairs
+
+    Returns:
+        list: (result, error) for each item in the original order; exactly
+        one of the two is None
+    """
+    groups: Dict[str, List[int]] = {}
+    for index, (calculation_type, _) in enumerate(items):
+        groups.setdefault(calculation_type.lower(), []).append(index)
+
+    out: List[Tuple[Optional[float], Optional[str]]] = [(None, None)] * len(items)
+    for calculation_type, indexes in groups.items():
+        if calculation_type not in _OPERATIONS:
+            for index in indexes:
+                out[index] = (None, f"Unsupported calculation type: {items[index][0]}")
+            continue
+        results, errors = evaluate(calculation_type, [items[i][1] for i in indexes])
+        for position, index in enumerate(indexes):
+            if position in errors:
+                out[index] = (None, errors[position])
+            else:
+                out[index] = (float(results[position]), None)
+    return out
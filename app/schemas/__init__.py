@@ -14,7 +14,19 @@ from .calculation import (
     CalculationBase,
     CalculationCreate,
     CalculationUpdate,
-    CalculationResponse
+    CalculationResponse,
+    CalculationBatchError,
+    CalculationBatchResponse,
+    CalculationResult,
+    CalculationBatchResultResponse,
+    CalculationImportResponse,
+    CalculationBulkDelete,
+    CalculationBulkDeleteResponse,
+    CalculationBulkUpdateItem,
+    CalculationBulkUpdateResponse,
+    CalculationTypeStats,
+    CalculationDailyCount,
+    CalculationStatsResponse
 )
 
 __all__ = [
@@ -32,4 +44,16 @@ __all__ = [
     'CalculationCreate',
     'CalculationUpdate',
     'CalculationResponse',
+    'CalculationBatchError',
+    'CalculationBatchResponse',
+    'CalculationResult',
+    'CalculationBatchResultResponse',
+    'CalculationImportResponse',
+    'CalculationBulkDelete',
+    'CalculationBulkDeleteResponse',
+    'CalculationBulkUpdateItem',
+    'CalculationBulkUpdateResponse',
+    'CalculationTypeStats',
+    'CalculationDailyCount',
+    'CalculationStatsResponse',
 ]
\ No newline at end of file
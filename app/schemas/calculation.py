@@ -12,11 +12,13 @@ The schemas use Pydantic's validation system to ensure data integrity and provid
 clear error messages when validation fails.
 """
 
+from array import array
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict, model_validator, field_validator
-from typing import List, Optional, Literal
+from functools import lru_cache
+from pydantic import BaseModel, Field, ConfigDict, create_model, model_validator, field_validator
+from typing import List, Optional, Literal, Tuple, Type
 from uuid import UUID
-from datetime import datetime
+from datetime import date as date_type, datetime
 
 class CalculationType(str, Enum):
     """
@@ -106,6 +108,9 @@ class CalculationBase(BaseModel):
         Raises:
             ValueError: If the input is not a list
         """
+        if isinstance(v, array):
+            # Inputs loaded from the database arrive as array('d')
+            return v.tolist()
         if not isinstance(v, list):
             raise ValueError("Input should be a valid list")
         return v
@@ -273,3 +278,197 @@ class CalculationResponse(CalculationBase):
             }
         }
     )
+
+# Fields a client can pick with ?fields=, in CalculationResponse's order
+CALCULATION_RESPONSE_FIELDS = tuple(CalculationResponse.model_fields)
+
+def parse_calculation_fields(value: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse a sparse fieldset such as "id,type,result".
+    
+    Returns:
+        The requested fields in CalculationResponse order, or () for all fields
+    
+    Raises:
+        ValueError: If a name is not a CalculationResponse field
+    """
+    if not value:
+        return ()
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested.difference(CALCULATION_RESPONSE_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Choose from: {', '.join(CALCULATION_RESPONSE_FIELDS)}."
+        )
+    return tuple(name for name in CALCULATION_RESPONSE_FIELDS if name in requested)
+
+@lru_cache(maxsize=None)
+def calculation_fields_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    CalculationResponse narrowed to `fields`: the response model of a
+    ?fields= read. Built once per field set (at most 2**7 of them).
+    """
+    return create_model(
+        "CalculationFieldsResponse",
+        **{
+            name: (CalculationResponse.model_fields[name].annotation, CalculationResponse.model_fields[name])
+            for name in fields
+        },
+    )
+
+class CalculationBatchError(BaseModel):
+    """
+    A single rejected item from a batch request.
+
+    Items are validated and evaluated independently, so one bad item
+    (e.g. a zero divisor) is reported here instead of failing the batch.
+    """
+    index: int = Field(
+        ...,
+        description="Zero-based position of the rejected item in the request",
+        example=3
+    )
+    detail: str = Field(
+        ...,
+        description="Why the item was rejected",
+        example="Cannot divide by zero."
+    )
+
+class CalculationBatchResponse(BaseModel):
+    """
+    Schema for the result of POST /calculations/batch.
+
+    - created: the calculations that were stored, in request order
+    - errors: the items that were rejected, with their request positions
+    """
+    created: List[CalculationResponse] = Field(
+        default_factory=list,
+        description="Calculations that were created"
+    )
+    errors: List[CalculationBatchError] = Field(
+        default_factory=list,
+        description="Items that could not be created"
+    )
+
+class CalculationResult(CalculationBase):
+    """
+    Schema for a computed-but-not-stored calculation (POST /compute).
+
+    Echoes the validated type and inputs alongside the result; there is no
+    id, owner or timestamps because nothing is persisted.
+    """
+    result: float = Field(
+        ...,
+        description="Result of the calculation",
+        example=15.5
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {"type": "addition", "inputs": [10.5, 3, 2], "result": 15.5}
+        }
+    )
+
+class CalculationBatchResultResponse(BaseModel):
+    """
+    Schema for the result of POST /compute/batch.
+
+    - results: the computed calculations, in request order
+    - errors: the items that were rejected, with their request positions
+    """
+    results: List[CalculationResult] = Field(
+        default_factory=list,
+        description="Calculations that were computed"
+    )
+    errors: List[CalculationBatchError] = Field(
+        default_factory=list,
+        description="Items that could not be computed"
+    )
+
+class CalculationImportResponse(BaseModel):
+    """
+    Schema for the result of POST /calculations/import.
+
+    - imported / rejected: how many records were stored / refused
+    - errors_url: where to download the rejected records (NDJSON), if any
+    """
+    import_id: UUID = Field(..., description="Identifier of this import")
+    imported: int = Field(..., description="Number of calculations stored")
+    rejected: int = Field(..., description="Number of records that were rejected")
+    errors_url: Optional[str] = Field(
+        None,
+        description="URL of the NDJSON file listing rejected records, if any"
+    )
+
+class CalculationBulkDelete(BaseModel):
+    """
+    Which calculations DELETE /calculations removes.
+
+    Criteria are combined with AND and always limited to the caller's own
+    calculations; at least one must be given, so an empty body never wipes
+    a user's history.
+    """
+    ids: Optional[List[UUID]] = Field(None, description="Only these calculations")
+    type: Optional[CalculationType] = Field(None, description="Only calculations of this type")
+    created_from: Optional[datetime] = Field(None, description="Only calculations created at or after this time")
+    created_to: Optional[datetime] = Field(None, description="Only calculations created before this time")
+
+    @model_validator(mode='after')
+    def require_criteria(self) -> "CalculationBulkDelete":
+        """Reject requests that name no ids and no filter."""
+        if self.ids is None and self.type is None and self.created_from is None and self.created_to is None:
+            raise ValueError("Give ids or at least one of type, created_from, created_to")
+        return self
+
+class CalculationBulkDeleteResponse(BaseModel):
+    """Schema for the result of DELETE /calculations."""
+    deleted: int = Field(..., description="Number of calculations deleted", example=42)
+
+class CalculationBulkUpdateItem(CalculationUpdate):
+    """One edit in a PATCH /calculations request: new inputs for a calculation."""
+    id: UUID = Field(..., description="Calculation to update")
+    inputs: List[float] = Field(
+        ...,
+        description="New inputs; the result is recomputed",
+        example=[42, 7],
+        min_items=2
+    )
+
+class CalculationBulkUpdateResponse(BaseModel):
+    """
+    Schema for the result of PATCH /calculations.
+
+    - updated: how many calculations got new inputs and results
+    - errors: the items that were rejected, with their request positions
+    """
+    updated: int = Field(..., description="Number of calculations updated")
+    errors: List[CalculationBatchError] = Field(
+        default_factory=list,
+        description="Items that could not be applied"
+    )
+
+class CalculationTypeStats(BaseModel):
+    """Aggregates over one calculation type's results."""
+    type: CalculationType = Field(..., description="Calculation type")
+    count: int = Field(..., description="Number of calculations of this type")
+    min_result: Optional[float] = Field(None, description="Smallest result")
+    max_result: Optional[float] = Field(None, description="Largest result")
+    avg_result: Optional[float] = Field(None, description="Mean result")
+
+class CalculationDailyCount(BaseModel):
+    """Number of calculations created on one (UTC) day."""
+    date: date_type = Field(..., description="Day the calculations were created")
+    count: int = Field(..., description="Number of calculations created that day")
+
+class CalculationStatsResponse(BaseModel):
+    """
+    Schema for GET /calculations/stats.
+
+    - total: number of calculations
+    - by_type: per-type count and result min/max/avg
+    - daily: calculations created per day, oldest first
+    """
+    total: int = Field(..., description="Total number of calculations")
+    by_type: List[CalculationTypeStats] = Field(default_factory=list)
+    daily: List[CalculationDailyCount] = Field(default_factory=list)
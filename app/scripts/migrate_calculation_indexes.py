@@ -0,0 +1,88 @@
+# app/scripts/migrate_calculation_indexes.py
+"""
+Replace the single-column calculation indexes with the composite ones.
+
+Databases created before the composite indexes were declared still carry
+ix_calculations_user_id, ix_calculations_type, the ascending keyset index
+and a redundant unique index on users.id (the primary key already is one).
+Run once per database (it is a no-op when already migrated):
+
+    python -m app.scripts.migrate_calculation_indexes
+
+On PostgreSQL the new indexes are built with CREATE INDEX CONCURRENTLY and
+the old ones removed with DROP INDEX CONCURRENTLY, so writes to calculations
+are never blocked. Each statement runs in autocommit mode, since CONCURRENTLY
+cannot run inside a transaction; the new indexes are built before the old
+ones are dropped, so queries always have an index to use.
+"""
+
+from typing import List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.database import engine as default_engine
+
+NEW_INDEXES = {
+    "ix_calculations_user_id_created_at_desc":
+        "calculations (user_id, created_at DESC, id DESC)",
+    "ix_calculations_user_id_type_created_at":
+        "calculations (user_id, type, created_at DESC, id DESC)",
+}
+
+OLD_INDEXES = [
+    "ix_calculations_user_id",
+    "ix_calculations_type",
+    "ix_calculations_user_id_created_at_id",
+    "ix_users_id",
+]
+
+
+def migration_steps(dialect_name: str) -> List[str]:
+    """Index DDL for a dialect, new indexes first."""
+    concurrently = " CONCURRENTLY" if dialect_name == "postgresql" else ""
+    steps = [
+        f"CREATE INDEX{concurrently} IF NOT EXISTS {name} ON {target}"
+        for name, target in NEW_INDEXES.items()
+    ]
+    steps += [f"DROP INDEX{concurrently} IF EXISTS {name}" for name in OLD_INDEXES]
+    return steps
+
+
+def needs_migration(engine: Engine) -> bool:
+    """True if a new index is missing or an old one is still there."""
+    inspector = inspect(engine)
+    if not inspector.has_table("calculations"):
+        return False
+    present = {index["name"] for index in inspector.get_indexes("calculations")}
+    present |= {index["name"] for index in inspector.get_indexes("users")}
+    return bool(set(NEW_INDEXES) - present or set(OLD_INDEXES) & present)
+
+
+def migrate(engine: Engine = default_engine) -> bool:
+    """
+    Build the composite indexes and drop the redundant ones.
+
+    Returns:
+        bool: True if indexes were changed, False if nothing needed doing
+    """
+    if not needs_migration(engine):
+        return False
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if engine.dialect.name == "postgresql":
+            # A failed CONCURRENTLY build leaves an INVALID index behind that
+            # IF NOT EXISTS would skip; drop those so they are rebuilt
+            invalid = conn.execute(text(
+                "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE NOT i.indisvalid AND c.relname = ANY(:names)"
+            ), {"names": list(NEW_INDEXES)}).scalars().all()
+            for name in invalid:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        for statement in migration_steps(engine.dialect.name):
+            conn.execute(text(statement))
+    return True
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Migrated calculation indexes" if migrate() else "Calculation indexes are already migrated")
@@ -0,0 +1,81 @@
+# app/scripts/migrate_inputs_to_float64.py
+"""
+Migrate calculations.inputs from JSON to the native numeric column type.
+
+Existing databases created before inputs became a Float64Array column still
+hold JSON lists. Run once per database (it is a no-op when already migrated):
+
+    python -m app.scripts.migrate_inputs_to_float64
+
+- PostgreSQL: the JSON values are converted to DOUBLE PRECISION[] in SQL
+- Other databases: rows are re-encoded as float64 blobs in batches
+"""
+
+import json
+
+from sqlalchemy import JSON, inspect, text
+from sqlalchemy.engine import Engine
+
+from app.database import engine as default_engine
+from app.models.types import pack_float64
+
+BATCH_SIZE = 1000
+
+POSTGRES_STEPS = [
+    "ALTER TABLE calculations ADD COLUMN inputs_f8 DOUBLE PRECISION[]",
+    # ALTER COLUMN ... USING cannot contain a subquery, hence the extra column
+    """
+    UPDATE calculations SET inputs_f8 = ARRAY(
+        SELECT value::double precision
+        FROM jsonb_array_elements_text(inputs::jsonb) WITH ORDINALITY AS t(value, position)
+        ORDER BY position
+    )
+    """,
+    "ALTER TABLE calculations DROP COLUMN inputs",
+    "ALTER TABLE calculations RENAME COLUMN inputs_f8 TO inputs",
+    "ALTER TABLE calculations ALTER COLUMN inputs SET NOT NULL",
+]
+
+
+def needs_migration(engine: Engine) -> bool:
+    """True if calculations.inputs is still a JSON column."""
+    inspector = inspect(engine)
+    if not inspector.has_table("calculations"):
+        return False
+    columns = {column["name"]: column["type"] for column in inspector.get_columns("calculations")}
+    return isinstance(columns.get("inputs"), JSON)
+
+
+def migrate(engine: Engine = default_engine) -> bool:
+    """
+    Convert calculations.inputs to the Float64Array storage format.
+
+    Returns:
+        bool: True if rows were migrated, False if nothing needed doing
+    """
+    if not needs_migration(engine):
+        return False
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            for statement in POSTGRES_STEPS:
+                conn.execute(text(statement))
+            return True
+
+        conn.execute(text("ALTER TABLE calculations ADD COLUMN inputs_f8 BLOB"))
+        rows = conn.execute(text("SELECT id, inputs FROM calculations")).fetchall()
+        for start in range(0, len(rows), BATCH_SIZE):
+            conn.execute(
+                text("UPDATE calculations SET inputs_f8 = :blob WHERE id = :id"),
+                [
+                    {"id": row_id, "blob": pack_float64(json.loads(inputs) if isinstance(inputs, str) else inputs)}
+                    for row_id, inputs in rows[start:start + BATCH_SIZE]
+                ],
+            )
+        conn.execute(text("ALTER TABLE calculations DROP COLUMN inputs"))
+        conn.execute(text("ALTER TABLE calculations RENAME COLUMN inputs_f8 TO inputs"))
+    return True
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Migrated calculations.inputs" if migrate() else "calculations.inputs is already migrated")
@@ -0,0 +1,70 @@
+# app/scripts/rebuild_calculation_stats.py
+"""
+Rebuild the user_calculation_stats summary table from calculations.
+
+The summary is kept up to date by triggers, but rows can drift if the
+triggers were missing for a while (e.g. a database restored from a dump
+taken before they existed) or the table was edited by hand. This recomputes
+it in one transaction and (re)installs the triggers:
+
+    python -m app.scripts.rebuild_calculation_stats            # every user
+    python -m app.scripts.rebuild_calculation_stats <user_id>  # one user
+"""
+
+import sys
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import DDL, delete, func, insert, select
+from sqlalchemy.engine import Engine
+
+from app.database import engine as default_engine
+from app.models.calculation import Calculation
+from app.models.calculation_stats import UserCalculationStats, trigger_statements
+
+
+def rebuild(engine: Engine = default_engine, user_id: Optional[UUID] = None) -> int:
+    """
+    Recompute the summary rows of one user, or of every user.
+
+    Returns:
+        int: Number of summary rows written
+    """
+    UserCalculationStats.__table__.create(bind=engine, checkfirst=True)
+    day = func.date(Calculation.created_at)
+    groups = (
+        select(
+            Calculation.user_id,
+            Calculation.type,
+            day,
+            func.count(),
+            func.count(Calculation.result),
+            func.coalesce(func.sum(Calculation.result), 0.0),
+            func.min(Calculation.result),
+            func.max(Calculation.result),
+            func.max(Calculation.updated_at),
+        )
+        .group_by(Calculation.user_id, Calculation.type, day)
+    )
+    stale = delete(UserCalculationStats)
+    if user_id is not None:
+        groups = groups.where(Calculation.user_id == user_id)
+        stale = stale.where(UserCalculationStats.user_id == user_id)
+
+    with engine.begin() as conn:
+        for statement in trigger_statements(engine.dialect.name):
+            conn.execute(DDL(statement))
+        conn.execute(stale)
+        result = conn.execute(
+            insert(UserCalculationStats).from_select(
+                ["user_id", "type", "day", "count", "result_count", "result_sum",
+                 "min_result", "max_result", "last_activity"],
+                groups,
+            )
+        )
+        return result.rowcount
+
+
+if __name__ == "__main__":  # pragma: no cover
+    target = UUID(sys.argv[1]) if len(sys.argv) > 1 else None
+    print(f"Rebuilt {rebuild(user_id=target)} summary rows")
@@ -0,0 +1,217 @@
+"""Initial schema: users, calculations and the calculation summary table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY, DOUBLE_PRECISION, UUID
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Frozen copies of the schema as of this revision: later changes to
+# app.models must not rewrite what this migration creates
+
+# app.models.types.Float64Array: DOUBLE PRECISION[] on PostgreSQL, a float64 blob elsewhere
+INPUTS_TYPE = sa.LargeBinary().with_variant(ARRAY(DOUBLE_PRECISION), "postgresql")
+
+# Summary table triggers (app.models.calculation_stats)
+POSTGRES_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION user_calculation_stats_add() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO user_calculation_stats AS s
+            (user_id, type, day, count, result_count, result_sum, min_result, max_result, last_activity)
+        SELECT user_id, type, created_at::date, count(*), count(result), coalesce(sum(result), 0),
+               min(result), max(result), max(updated_at)
+        FROM new_rows
+        GROUP BY user_id, type, created_at::date
+        ON CONFLICT (user_id, type, day) DO UPDATE SET
+            count = s.count + EXCLUDED.count,
+            result_count = s.result_count + EXCLUDED.result_count,
+            result_sum = s.result_sum + EXCLUDED.result_sum,
+            min_result = LEAST(s.min_result, EXCLUDED.min_result),
+            max_result = GREATEST(s.max_result, EXCLUDED.max_result),
+            last_activity = GREATEST(s.last_activity, EXCLUDED.last_activity);
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION user_calculation_stats_remove() RETURNS trigger AS $$
+    BEGIN
+        CREATE TEMP TABLE IF NOT EXISTS user_calculation_stats_removed
+            (user_id uuid, type varchar(50), day date, count bigint, result_count bigint,
+             result_sum double precision, min_result double precision, max_result double precision)
+            ON COMMIT DROP;
+        TRUNCATE user_calculation_stats_removed;
+        INSERT INTO user_calculation_stats_removed
+        SELECT user_id, type, created_at::date, count(*), count(result), coalesce(sum(result), 0),
+               min(result), max(result)
+        FROM old_rows
+        GROUP BY user_id, type, created_at::date;
+
+        UPDATE user_calculation_stats s SET
+            count = s.count - r.count,
+            result_count = s.result_count - r.result_count,
+            result_sum = s.result_sum - r.result_sum,
+            last_activity = GREATEST(s.last_activity, now() AT TIME ZONE 'utc')
+        FROM user_calculation_stats_removed r
+        WHERE s.user_id = r.user_id AND s.type = r.type AND s.day = r.day;
+
+        -- min/max cannot be decremented: re-read them where a boundary value left
+        UPDATE user_calculation_stats s SET
+            min_result = m.min_result,
+            max_result = m.max_result
+        FROM user_calculation_stats_removed r
+        CROSS JOIN LATERAL (
+            SELECT min(c.result) AS min_result, max(c.result) AS max_result
+            FROM calculations c
+            WHERE c.user_id = r.user_id AND c.type = r.type
+              AND c.created_at >= r.day AND c.created_at < r.day + 1
+        ) m
+        WHERE s.user_id = r.user_id AND s.type = r.type AND s.day = r.day
+          AND (r.min_result <= s.min_result OR r.max_result >= s.max_result);
+
+        DELETE FROM user_calculation_stats s
+        USING user_calculation_stats_removed r
+        WHERE s.user_id = r.user_id AND s.type = r.type AND s.day = r.day AND s.count <= 0;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS user_calculation_stats_insert ON calculations",
+    "DROP TRIGGER IF EXISTS user_calculation_stats_update_old ON calculations",
+    "DROP TRIGGER IF EXISTS user_calculation_stats_update_new ON calculations",
+    "DROP TRIGGER IF EXISTS user_calculation_stats_delete ON calculations",
+    """
+    CREATE TRIGGER user_calculation_stats_insert AFTER INSERT ON calculations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_calculation_stats_add()
+    """,
+    # Updates add the new rows and take the old ones out; either order gives the
+    # same result, since removal re-reads min/max from the already-updated table
+    """
+    CREATE TRIGGER user_calculation_stats_update_new AFTER UPDATE ON calculations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_calculation_stats_add()
+    """,
+    """
+    CREATE TRIGGER user_calculation_stats_update_old AFTER UPDATE ON calculations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_calculation_stats_remove()
+    """,
+    """
+    CREATE TRIGGER user_calculation_stats_delete AFTER DELETE ON calculations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_calculation_stats_remove()
+    """,
+]
+
+# --- SQLite: row-level triggers -----------------------------------------------
+
+_SQLITE_ADD_NEW = """
+    INSERT INTO user_calculation_stats
+        (user_id, type, day, count, result_count, result_sum, min_result, max_result, last_activity)
+    VALUES (NEW.user_id, NEW.type, date(NEW.created_at), 1, NEW.result IS NOT NULL,
+            coalesce(NEW.result, 0), NEW.result, NEW.result, NEW.updated_at)
+    ON CONFLICT (user_id, type, day) DO UPDATE SET
+        count = count + 1,
+        result_count = result_count + excluded.result_count,
+        result_sum = result_sum + excluded.result_sum,
+        min_result = coalesce(min(min_result, excluded.min_result), min_result, excluded.min_result),
+        max_result = coalesce(max(max_result, excluded.max_result), max_result, excluded.max_result),
+        last_activity = coalesce(max(last_activity, excluded.last_activity), last_activity, excluded.last_activity);
+"""
+
+_SQLITE_REMOVE_OLD = """
+    UPDATE user_calculation_stats SET
+        count = count - 1,
+        result_count = result_count - (OLD.result IS NOT NULL),
+        result_sum = result_sum - coalesce(OLD.result, 0),
+        min_result = (SELECT min(result) FROM calculations c
+                      WHERE c.user_id = OLD.user_id AND c.type = OLD.type AND date(c.created_at) = date(OLD.created_at)),
+        max_result = (SELECT max(result) FROM calculations c
+                      WHERE c.user_id = OLD.user_id AND c.type = OLD.type AND date(c.created_at) = date(OLD.created_at)),
+        last_activity = datetime('now')
+    WHERE user_id = OLD.user_id AND type = OLD.type AND day = date(OLD.created_at);
+    DELETE FROM user_calculation_stats
+    WHERE user_id = OLD.user_id AND type = OLD.type AND day = date(OLD.created_at) AND count <= 0;
+"""
+
+SQLITE_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS user_calculation_stats_insert",
+    "DROP TRIGGER IF EXISTS user_calculation_stats_update",
+    "DROP TRIGGER IF EXISTS user_calculation_stats_delete",
+    f"CREATE TRIGGER user_calculation_stats_insert AFTER INSERT ON calculations BEGIN {_SQLITE_ADD_NEW} END",
+    f"CREATE TRIGGER user_calculation_stats_update AFTER UPDATE ON calculations BEGIN {_SQLITE_REMOVE_OLD} {_SQLITE_ADD_NEW} END",
+    f"CREATE TRIGGER user_calculation_stats_delete AFTER DELETE ON calculations BEGIN {_SQLITE_REMOVE_OLD} END",
+]
+
+TRIGGERS = {"postgresql": POSTGRES_TRIGGERS, "sqlite": SQLITE_TRIGGERS}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("username", sa.String(50), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("first_name", sa.String(50), nullable=False),
+        sa.Column("last_name", sa.String(50), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_login", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "calculations",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("type", sa.String(50), nullable=False),
+        sa.Column("inputs", INPUTS_TYPE, nullable=False),
+        sa.Column("result", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_calculations_user_id_created_at_desc", "calculations",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_calculations_user_id_type_created_at", "calculations",
+        ["user_id", "type", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+    op.create_table(
+        "user_calculation_stats",
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("type", sa.String(50), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("result_count", sa.Integer(), nullable=False),
+        sa.Column("result_sum", sa.Float(), nullable=False),
+        sa.Column("min_result", sa.Float(), nullable=True),
+        sa.Column("max_result", sa.Float(), nullable=True),
+        sa.Column("last_activity", sa.DateTime(), nullable=True),
+    )
+    for statement in TRIGGERS.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        op.execute("DROP FUNCTION IF EXISTS user_calculation_stats_add() CASCADE")
+        op.execute("DROP FUNCTION IF EXISTS user_calculation_stats_remove() CASCADE")
+    op.drop_table("user_calculation_stats")
+    op.drop_table("calculations")
+    op.drop_table("users")
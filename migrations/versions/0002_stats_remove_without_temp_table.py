@@ -0,0 +1,107 @@
+"""Recompute removed calculation stats without a temp table
+
+user_calculation_stats_remove() created and truncated a temp table on
+every UPDATE/DELETE of calculations; it now aggregates old_rows in a CTE.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Frozen copies of user_calculation_stats_remove() after and before this revision
+REMOVE_FUNCTION = """
+    CREATE OR REPLACE FUNCTION user_calculation_stats_remove() RETURNS trigger AS $$
+    BEGIN
+        -- min/max cannot be decremented: re-read them where a boundary value left
+        -- (AFTER triggers see the statement's changes in calculations)
+        WITH r AS (
+            SELECT user_id, type, created_at::date AS day, count(*) AS count, count(result) AS result_count,
+                   coalesce(sum(result), 0) AS result_sum, min(result) AS min_result, max(result) AS max_result
+            FROM old_rows
+            GROUP BY user_id, type, created_at::date
+        )
+        UPDATE user_calculation_stats s SET
+            count = s.count - r.count,
+            result_count = s.result_count - r.result_count,
+            result_sum = s.result_sum - r.result_sum,
+            min_result = CASE WHEN r.min_result <= s.min_result THEN (
+                SELECT min(c.result) FROM calculations c
+                WHERE c.user_id = r.user_id AND c.type = r.type
+                  AND c.created_at >= r.day AND c.created_at < r.day + 1
+            ) ELSE s.min_result END,
+            max_result = CASE WHEN r.max_result >= s.max_result THEN (
+                SELECT max(c.result) FROM calculations c
+                WHERE c.user_id = r.user_id AND c.type = r.type
+                  AND c.created_at >= r.day AND c.created_at < r.day + 1
+            ) ELSE s.max_result END,
+            last_activity = GREATEST(s.last_activity, now() AT TIME ZONE 'utc')
+        FROM r
+        WHERE s.user_id = r.user_id AND s.type = r.type AND s.day = r.day;
+
+        DELETE FROM user_calculation_stats s
+        USING (SELECT DISTINCT user_id, type, created_at::date AS day FROM old_rows) r
+        WHERE s.user_id = r.user_id AND s.type = r.type AND s.day = r.day AND s.count <= 0;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+"""
+
+PREVIOUS_REMOVE_FUNCTION = """
+    CREATE OR REPLACE FUNCTION user_calculation_stats_remove() RETURNS trigger AS $$
+    BEGIN
+        CREATE TEMP TABLE IF NOT EXISTS user_calculation_stats_removed
+            (user_id uuid, type varchar(50), day date, count bigint, result_count bigint,
+             result_sum double precision, min_result double precision, max_result double precision)
+            ON COMMIT DROP;
+        TRUNCATE user_calculation_stats_removed;
+        INSERT INTO user_calculation_stats_removed
+        SELECT user_id, type, created_at::date, count(*), count(result), coalesce(sum(result), 0),
+               min(result), max(result)
+        FROM old_rows
+        GROUP BY user_id, type, created_at::date;
+
+        UPDATE user_calculation_stats s SET
+            count = s.count - r.count,
+            result_count = s.result_count - r.result_count,
+            result_sum = s.result_sum - r.result_sum,
+            last_activity = GREATEST(s.last_activity, now() AT TIME ZONE 'utc')
+        FROM user_calculation_stats_removed r
+        WHERE s.user_id = r.user_id AND s.type = r.type AND s.day = r.day;
+
+        -- min/max cannot be decremented: re-read them where a boundary value left
+        UPDATE user_calculation_stats s SET
+            min_result = m.min_result,
+            max_result = m.max_result
+        FROM user_calculation_stats_removed r
+        CROSS JOIN LATERAL (
+            SELECT min(c.result) AS min_result, max(c.result) AS max_result
+            FROM calculations c
+            WHERE c.user_id = r.user_id AND c.type = r.type
+              AND c.created_at >= r.day AND c.created_at < r.day + 1
+        ) m
+        WHERE s.user_id = r.user_id AND s.type = r.type AND s.day = r.day
+          AND (r.min_result <= s.min_result OR r.max_result >= s.max_result);
+
+        DELETE FROM user_calculation_stats s
+        USING user_calculation_stats_removed r
+        WHERE s.user_id = r.user_id AND s.type = r.type AND s.day = r.day AND s.count <= 0;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    # CREATE OR REPLACE FUNCTION; the trigger definitions and SQLite are unchanged
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(REMOVE_FUNCTION)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(PREVIOUS_REMOVE_FUNCTION)
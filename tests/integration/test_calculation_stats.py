@@ -0,0 +1,66 @@
+# tests/integration/test_calculation_stats.py
+
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Calculation, User, UserCalculationStats
+from app.scripts.rebuild_calculation_stats import rebuild
+
+
+def _summary(session, user_id):
+    rows = session.execute(
+        select(UserCalculationStats).where(UserCalculationStats.user_id == user_id)
+    ).scalars()
+    return {
+        row.type: (row.count, row.result_count, row.result_sum, row.min_result, row.max_result)
+        for row in rows
+    }
+
+
+def test_triggers_maintain_summary_and_rebuild_repairs_drift(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    user = User(first_name="A", last_name="B", email="a@example.com", username="ab", password="x")
+    session.add(user)
+    session.flush()
+    calcs = [
+        Calculation.create("addition", user.id, [1, 2]),
+        Calculation.create("addition", user.id, [10, 20]),
+        Calculation.create("division", user.id, [9, 3]),
+    ]
+    for calc in calcs:
+        calc.result = calc.get_result()
+    session.add_all(calcs)
+    session.commit()
+    assert _summary(session, user.id) == {
+        "addition": (2, 2, 33.0, 3.0, 30.0),
+        "division": (1, 1, 3.0, 3.0, 3.0),
+    }
+
+    # Removing the max recomputes it; removing the last row of a group drops the group
+    session.delete(calcs[1])
+    session.delete(calcs[2])
+    session.commit()
+    assert _summary(session, user.id) == {"addition": (1, 1, 3.0, 3.0, 3.0)}
+
+    # Simulate drift, then repair it
+    session.execute(delete(UserCalculationStats))
+    session.commit()
+    assert _summary(session, user.id) == {}
+    assert rebuild(engine, user.id) == 1
+    assert _summary(session, user.id) == {"addition": (1, 1, 3.0, 3.0, 3.0)}
+    assert rebuild(engine) == 1
+    session.close()
+    engine.dispose()
+
+
+def test_postgres_triggers_run_no_ddl():
+    # The remove trigger fires on every UPDATE/DELETE; DDL there would churn the catalogs
+    from app.models.calculation_stats import POSTGRES_TRIGGERS
+    functions = [statement for statement in POSTGRES_TRIGGERS if "CREATE OR REPLACE FUNCTION" in statement]
+    assert len(functions) == 2
+    for function in functions:
+        body = function.split("BEGIN", 1)[1].upper()
+        assert "CREATE " not in body and "TRUNCATE" not in body and "DROP " not in body
@@ -39,10 +39,11 @@ def mock_verify_token():
         yield mock
 
 # Test get_current_user with valid token and complete payload
-def test_get_current_user_valid_token_existing_user(mock_verify_token):
+@pytest.mark.asyncio
+async def test_get_current_user_valid_token_existing_user(mock_verify_token):
     mock_verify_token.return_value = sample_user_data
 
-    user_response = get_current_user(token="validtoken")
+    user_response = await get_current_user(token="validtoken")
 
     assert isinstance(user_response, UserResponse)
     assert user_response.id == sample_user_data["id"]
@@ -58,11 +59,12 @@ def test_get_current_user_valid_token_existing_user(mock_verify_token):
     mock_verify_token.assert_called_once_with("validtoken")
 
 # Test get_current_user with invalid token (returns None)
-def test_get_current_user_invalid_token(mock_verify_token):
+@pytest.mark.asyncio
+async def test_get_current_user_invalid_token(mock_verify_token):
     mock_verify_token.return_value = None
 
     with pytest.raises(HTTPException) as exc_info:
-        get_current_user(token="invalidtoken")
+        await get_current_user(token="invalidtoken")
 
     assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
     assert exc_info.value.detail == "Could not validate credentials"
@@ -70,12 +72,13 @@ def test_get_current_user_invalid_token(mock_verify_token):
     mock_verify_token.assert_called_once_with("invalidtoken")
 
 # Test get_current_user with valid token but incomplete payload (simulate missing fields)
-def test_get_current_user_valid_token_incomplete_payload(mock_verify_token):
+@pytest.mark.asyncio
+async def test_get_current_user_valid_token_incomplete_payload(mock_verify_token):
     # Return an empty dict simulating missing required fields
     mock_verify_token.return_value = {}
 
     with pytest.raises(HTTPException) as exc_info:
-        get_current_user(token="validtoken")
+        await get_current_user(token="validtoken")
 
     assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
     assert exc_info.value.detail == "Could not validate credentials"
@@ -83,23 +86,81 @@ def test_get_current_user_valid_token_incomplete_payload(mock_verify_token):
     mock_verify_token.assert_called_once_with("validtoken")
 
 # Test get_current_active_user with an active user
-def test_get_current_active_user_active(mock_verify_token):
+@pytest.mark.asyncio
+async def test_get_current_active_user_active(mock_verify_token):
     mock_verify_token.return_value = sample_user_data
 
-    current_user = get_current_user(token="validtoken")
-    active_user = get_current_active_user(current_user=current_user)
+    current_user = await get_current_user(token="validtoken")
+    active_user = await get_current_active_user(current_user=current_user)
 
     assert isinstance(active_user, UserResponse)
     assert active_user.is_active is True
 
 # Test get_current_active_user with an inactive user
-def test_get_current_active_user_inactive(mock_verify_token):
+@pytest.mark.asyncio
+async def test_get_current_active_user_inactive(mock_verify_token):
     mock_verify_token.return_value = inactive_user_data
 
-    current_user = get_current_user(token="validtoken")
+    current_user = await get_current_user(token="validtoken")
 
     with pytest.raises(HTTPException) as exc_info:
-        get_current_active_user(current_user=current_user)
+        await get_current_active_user(current_user=current_user)
 
     assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
     assert exc_info.value.detail == "Inactive user"
+
+# Verified-token cache: repeat calls skip verification; revocation is honoured
+@pytest.mark.asyncio
+async def test_get_current_user_caches_verified_token():
+    from app.auth.token_cache import token_cache, token_claims
+    token_cache.clear()
+    user_id = uuid4()
+    token = User.create_access_token({"sub": str(user_id)})
+
+    with patch.object(User, 'verify_token', wraps=User.verify_token) as spy:
+        first = await get_current_user(token=token)
+        second = await get_current_user(token=token)
+    assert first.id == second.id == user_id
+    assert spy.call_count == 1
+    assert token_cache.stats()["hits"] == 1
+
+    _, jti = token_claims(token)
+    token_cache.revoke(jti, 60)
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(token=token)
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+    token_cache.clear()
+
+@pytest.mark.asyncio
+async def test_get_current_user_honours_revocations_from_other_workers(monkeypatch):
+    import time
+    import fakeredis
+    from app.auth import redis as blacklist
+    from app.auth.token_cache import token_cache, token_claims
+    from app.core.redis_client import ManagedRedis
+
+    redis = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(blacklist, "redis_client", ManagedRedis(client=redis))
+    monkeypatch.setattr(blacklist, "blacklist_filter", blacklist.BlacklistFilter(1000, 0.001, sync_interval=0))
+    token_cache.clear()
+    token = User.create_access_token({"sub": str(uuid4())})
+    assert await get_current_user(token=token)  # cached by this worker
+
+    # Another worker revokes the token: it only writes to the shared Redis
+    _, jti = token_claims(token)
+    await redis.zadd(blacklist.BLACKLIST_INDEX_KEY, {jti: time.time()})
+
+    await blacklist.sync_revocations()
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(token=token)
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+    token_cache.clear()
+
+def test_auth_dependencies_run_on_the_event_loop():
+    # Sync dependencies would send every authenticated request through the threadpool
+    import inspect
+    from app.auth.redis import sync_revocations
+    from app.core.replicas import get_read_db
+    for dependency in (get_current_user, get_current_active_user, sync_revocations):
+        assert inspect.iscoroutinefunction(dependency)
+    assert inspect.isasyncgenfunction(get_read_db)
@@ -1,32 +1,39 @@
+import fakeredis
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from uuid import uuid4
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_async_db, get_async_engine, get_async_sessionmaker
 from app.auth.dependencies import get_current_user
 from app.auth.jwt import get_password_hash
+from app.core.redis_client import ManagedRedis
 from app.models import User, Calculation
 
-# --- Test Database Setup ---
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# /metrics/* require this bearer token (set by the client fixture)
+METRICS_TOKEN = "test-metrics-token"
+METRICS_HEADERS = {"Authorization": f"Bearer {METRICS_TOKEN}"}
 
 # --- Pytest Fixture for the Test Client ---
 
 @pytest.fixture(scope="function")
-def client():
+def client(tmp_path, monkeypatch):
     """
     A fixture that creates a new database and client for each test.
     This ensures complete test isolation.
+
+    The database is a temporary SQLite file so the sync engine used for
+    setup and the async engine used by the endpoints see the same data.
     """
-    # 1. Create all tables in the in-memory database
+    database_url = f"sqlite:///{tmp_path / 'test.db'}"
+    engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    # 1. Create all tables in the test database
     Base.metadata.create_all(bind=engine)
     
     # 2. Set up dependency overrides using a local session
@@ -41,16 +48,31 @@ def client():
     db.add(test_user)
     db.commit()
 
-    def override_get_db():
-        yield db
+    # NullPool: each request runs on its own event loop, so never reuse connections
+    async_engine = get_async_engine(database_url, poolclass=NullPool)
+    AsyncTestingSessionLocal = get_async_sessionmaker(async_engine)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as session:
+            yield session
 
     def override_get_current_user():
         # Query the user from the test session to ensure it's attached
         return db.query(User).filter(User.id == test_user.id).first()
 
-    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     app.dependency_overrides[get_current_user] = override_get_current_user
 
+    from app.core import metrics
+    monkeypatch.setattr(metrics.settings, "METRICS_TOKEN", METRICS_TOKEN)
+
+    # A reachable Redis, so list versions are shared as between real workers
+    from app.core.list_cache import list_cache
+    from app.core.replicas import replica_router
+    shared_redis = ManagedRedis(client=fakeredis.FakeAsyncRedis())
+    monkeypatch.setattr(list_cache, "redis", shared_redis)
+    monkeypatch.setattr(replica_router, "redis", shared_redis)
+
     # 3. Yield the client for the test to use
     yield TestClient(app)
 
@@ -58,6 +80,7 @@ def client():
     db.close()
     app.dependency_overrides.clear()
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
 
 
 # --- HTML Web Route Tests ---
@@ -77,3 +100,728 @@ def test_html_web_routes(client, path):
     assert "text/html" in response.headers['content-type']
 
 
+
+# --- Calculation Browse (Pagination) Tests ---
+
+def _create_calculations(client, count, calc_type="addition"):
+    ids = []
+    for i in range(count):
+        response = client.post("/calculations", json={"type": calc_type, "inputs": [i, 1]})
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+    return ids
+
+def test_list_calculations_keyset_pagination(client):
+    """Following X-Next-Cursor walks the whole history newest-first without repeats."""
+    created = _create_calculations(client, 5)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["after"] = cursor
+        response = client.get("/calculations", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(calc["id"] for calc in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(created)
+    assert len(seen) == len(set(seen))
+
+def _created_on_days(tmp_path, ids, calc_type="addition"):
+    """Backdate calculations to noon on 2024-01-01, 01-02, ... in order; returns their ids by day."""
+    from datetime import datetime
+    from uuid import UUID
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with engine.begin() as conn:
+        for day, calc_id in enumerate(ids, start=1):
+            conn.execute(
+                Calculation.__table__.update()
+                .where(Calculation.__table__.c.id == UUID(calc_id))
+                .values(created_at=datetime(2024, 1, day, 12))
+            )
+    engine.dispose()
+    return dict(enumerate(ids, start=1))
+
+def test_list_calculations_created_range_bounds(client, tmp_path):
+    """created_from is inclusive and created_to exclusive."""
+    by_day = _created_on_days(tmp_path, _create_calculations(client, 5))
+
+    def listed(**params):
+        response = client.get("/calculations", params=params)
+        assert response.status_code == 200
+        return [calc["id"] for calc in response.json()]
+
+    assert listed(created_from="2024-01-02T12:00:00", created_to="2024-01-04T12:00:00") == [by_day[3], by_day[2]]
+    assert listed(created_from="2024-01-04T12:00:01") == [by_day[5]]
+    assert listed(created_to="2024-01-02T12:00:00") == [by_day[1]]
+    assert listed(created_from="2024-01-03T00:00:00", created_to="2024-01-03T00:00:00") == []
+
+def test_list_calculations_created_range_with_type_and_cursor(client, tmp_path):
+    additions = _created_on_days(tmp_path, _create_calculations(client, 6))
+    subtractions = _created_on_days(tmp_path, _create_calculations(client, 6, "subtraction"))
+    params = {"type": "addition", "created_from": "2024-01-02T00:00:00", "created_to": "2024-01-06T00:00:00", "limit": 2}
+
+    first = client.get("/calculations", params=params)
+    assert [calc["id"] for calc in first.json()] == [additions[5], additions[4]]
+    second = client.get("/calculations", params={**params, "after": first.headers["X-Next-Cursor"]})
+    assert [calc["id"] for calc in second.json()] == [additions[3], additions[2]]
+    assert "X-Next-Cursor" not in second.headers  # day 1 is outside the range
+    assert not {calc["id"] for calc in first.json() + second.json()} & set(subtractions.values())
+
+    back = client.get("/calculations", params={**params, "before": second.headers["X-Prev-Cursor"]})
+    assert [calc["id"] for calc in back.json()] == [additions[5], additions[4]]
+
+def test_list_calculations_before_cursor_returns_previous_page(client):
+    _create_calculations(client, 4)
+    first = client.get("/calculations", params={"limit": 2})
+    second = client.get("/calculations", params={"limit": 2, "after": first.headers["X-Next-Cursor"]})
+    assert "X-Prev-Cursor" in second.headers
+
+    back = client.get("/calculations", params={"limit": 2, "before": second.headers["X-Prev-Cursor"]})
+    assert [c["id"] for c in back.json()] == [c["id"] for c in first.json()]
+
+def test_list_calculations_filters_by_type(client):
+    _create_calculations(client, 2, "addition")
+    _create_calculations(client, 3, "multiplication")
+    response = client.get("/calculations", params={"type": "multiplication"})
+    assert response.status_code == 200
+    assert [c["type"] for c in response.json()] == ["multiplication"] * 3
+
+def test_list_calculations_invalid_cursor(client):
+    response = client.get("/calculations", params={"after": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor."
+
+# --- Batch Create Tests ---
+
+def test_create_calculations_batch(client):
+    """Valid items are stored in order; bad items are reported without failing the batch."""
+    payload = [
+        {"type": "addition", "inputs": [1, 2]},
+        {"type": "division", "inputs": [1, 0]},
+        {"type": "modulus", "inputs": [5, 0]},
+        {"type": "teleportation", "inputs": [1, 2]},
+        {"type": "multiplication", "inputs": [3, 4]},
+    ]
+    response = client.post("/calculations/batch", json=payload)
+    assert response.status_code == 201
+    data = response.json()
+
+    assert [(c["type"], c["result"]) for c in data["created"]] == [("addition", 3), ("multiplication", 12)]
+    assert [e["index"] for e in data["errors"]] == [1, 2, 3]
+    assert "Cannot divide by zero" in data["errors"][0]["detail"]
+    assert data["errors"][1]["detail"] == "Cannot perform modulus by zero."
+
+    listed = client.get("/calculations").json()
+    assert {c["id"] for c in listed} == {c["id"] for c in data["created"]}
+
+def test_create_calculations_batch_too_large(client, monkeypatch):
+    from app.main import settings
+    monkeypatch.setattr(settings, "CALCULATION_BATCH_MAX_ITEMS", 2)
+    payload = [{"type": "addition", "inputs": [1, 2]}] * 3
+    response = client.post("/calculations/batch", json=payload)
+    assert response.status_code == 413
+
+# --- Stateless Compute Tests ---
+
+def test_compute_does_not_touch_database(client):
+    """POST /compute returns the result without requesting a DB session."""
+    async def fail_get_db():
+        raise AssertionError("compute must not request a database session")
+        yield
+
+    app.dependency_overrides[get_async_db] = fail_get_db
+    response = client.post("/compute", json={"type": "exponentiate", "inputs": [2, 3]})
+    assert response.status_code == 200
+    assert response.json() == {"type": "exponentiate", "inputs": [2.0, 3.0], "result": 8.0}
+
+def test_compute_reports_operation_errors(client):
+    response = client.post("/compute", json={"type": "modulus", "inputs": [5, 0]})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cannot perform modulus by zero."
+
+def test_compute_batch(client):
+    payload = [
+        {"type": "addition", "inputs": [1, 2]},
+        {"type": "division", "inputs": [1, 0]},
+        {"type": "subtraction", "inputs": [10, 4]},
+    ]
+    response = client.post("/compute/batch", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["result"] for r in data["results"]] == [3, 6]
+    assert [e["index"] for e in data["errors"]] == [1]
+
+    # Nothing was stored
+    assert client.get("/calculations").json() == []
+
+# --- Async Endpoint Round-Trip Tests ---
+
+def test_register_and_login_async(client):
+    payload = {
+        "first_name": "Async", "last_name": "User",
+        "email": "async.user@example.com", "username": "asyncuser",
+        "password": "SecurePass123!", "confirm_password": "SecurePass123!",
+    }
+    response = client.post("/auth/register", json=payload)
+    assert response.status_code == 201
+    assert response.json()["username"] == "asyncuser"
+
+    duplicate = client.post("/auth/register", json=payload)
+    assert duplicate.status_code == 400
+
+    login = client.post("/auth/login", json={"username": "asyncuser", "password": "SecurePass123!"})
+    assert login.status_code == 200
+    assert login.json()["access_token"]
+
+    bad_login = client.post("/auth/login", json={"username": "asyncuser", "password": "WrongPass123!"})
+    assert bad_login.status_code == 401
+
+def test_logout_revokes_the_token_on_every_worker(client, monkeypatch):
+    from app.auth import redis as blacklist
+    from app.auth.token_cache import token_cache
+    monkeypatch.setattr(blacklist, "redis_client", ManagedRedis(client=fakeredis.FakeAsyncRedis()))
+    monkeypatch.setattr(blacklist, "blacklist_filter", blacklist.BlacklistFilter(1000, 0.001, sync_interval=60))
+    del app.dependency_overrides[get_current_user]  # authenticate for real
+    token_cache.clear()
+    token = client.post("/auth/login", json={"username": "testuser", "password": "testpassword123"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/calculations", headers=headers).status_code == 200
+
+    assert client.post("/auth/logout", headers=headers).status_code == 204
+    assert client.get("/calculations", headers=headers).status_code == 401
+
+    # A worker that never cached the token finds it through the blacklist
+    token_cache.clear()
+    assert client.get("/calculations", headers=headers).status_code == 401
+    assert blacklist.blacklist_filter.stats()["redis_checks"] >= 1
+    token_cache.clear()
+
+def test_read_update_delete_calculation_async(client):
+    calc_id = client.post("/calculations", json={"type": "addition", "inputs": [1, 2]}).json()["id"]
+
+    assert client.get(f"/calculations/{calc_id}").json()["result"] == 3
+
+    updated = client.put(f"/calculations/{calc_id}", json={"inputs": [5, 5]})
+    assert updated.status_code == 200
+    assert updated.json()["result"] == 10
+
+    assert client.delete(f"/calculations/{calc_id}").status_code == 204
+    assert client.get(f"/calculations/{calc_id}").status_code == 404
+
+def test_repeated_update_reuses_cached_results(client, monkeypatch):
+    from app.core import bulk
+    from app.core.result_cache import ResultCache
+    cache = ResultCache(max_entries=100, ttl_seconds=60)
+    monkeypatch.setattr(bulk, "result_cache", cache)
+    calc_id = client.post("/calculations", json={"type": "division", "inputs": [8, 2]}).json()["id"]
+
+    assert client.put(f"/calculations/{calc_id}", json={"inputs": [9, 3]}).json()["result"] == 3
+    misses = cache.stats()["misses"]
+    assert misses == len(bulk.CALCULATION_TYPES)
+
+    # The same edit again is answered from the cache for every type
+    assert client.put(f"/calculations/{calc_id}", json={"inputs": [9, 3]}).json()["result"] == 3
+    assert cache.stats()["misses"] == misses
+    assert cache.stats()["local_hits"] == len(bulk.CALCULATION_TYPES)
+
+# --- Metrics Tests ---
+
+def test_db_pool_metrics(client):
+    response = client.get("/metrics/db-pool", headers=METRICS_HEADERS)
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"sync", "async"}
+    assert all("pool_class" in stats for stats in data.values())
+
+def test_metrics_require_the_metrics_token(client, monkeypatch):
+    from app.core import metrics
+    assert client.get("/metrics/replicas").status_code == 401
+    assert client.get("/metrics/replicas", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics/replicas", headers=METRICS_HEADERS).status_code == 200
+
+    monkeypatch.setattr(metrics.settings, "METRICS_TOKEN", None)  # not configured: disabled
+    assert client.get("/metrics/replicas", headers=METRICS_HEADERS).status_code == 404
+
+def test_login_rejected_when_password_hasher_saturated(client, monkeypatch):
+    from app.auth.hashing import password_hasher
+    monkeypatch.setattr(password_hasher, "limit", 0)
+    response = client.post("/auth/login", json={"username": "testuser", "password": "testpassword123"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/metrics/password-hasher", headers=METRICS_HEADERS).json()["rejected"] >= 1
+
+# --- List Cache Tests ---
+
+def test_list_calculations_served_from_cache_until_write(client):
+    from app.core.list_cache import list_cache
+    _create_calculations(client, 2)
+
+    first = client.get("/calculations", params={"limit": 10})
+    hits = list_cache.stats()["hits"]
+    second = client.get("/calculations", params={"limit": 10})
+    assert list_cache.stats()["hits"] == hits + 1
+    assert second.content == first.content
+
+    # A write bumps the user's list version, so the next read re-queries
+    calc_id = first.json()[0]["id"]
+    assert client.delete(f"/calculations/{calc_id}").status_code == 204
+    third = client.get("/calculations", params={"limit": 10})
+    assert [c["id"] for c in third.json()] == [c["id"] for c in first.json()[1:]]
+
+# --- Conditional GET Tests ---
+
+def test_get_calculation_etag_and_304(client):
+    calc_id = client.post("/calculations", json={"type": "addition", "inputs": [1, 2]}).json()["id"]
+
+    first = client.get(f"/calculations/{calc_id}")
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and first.headers["Cache-Control"] == "private, no-cache"
+
+    unchanged = client.get(f"/calculations/{calc_id}", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert client.get(f"/calculations/{calc_id}", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+    client.put(f"/calculations/{calc_id}", json={"inputs": [2, 2]})
+    changed = client.get(f"/calculations/{calc_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+def test_list_calculations_etag_follows_list_version(client):
+    _create_calculations(client, 2)
+    first = client.get("/calculations")
+    etag = first.headers["ETag"]
+
+    assert client.get("/calculations", headers={"If-None-Match": etag}).status_code == 304
+    # Different query, different representation
+    assert client.get("/calculations", params={"limit": 1}, headers={"If-None-Match": etag}).status_code == 200
+
+    _create_calculations(client, 1)
+    refreshed = client.get("/calculations", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert len(refreshed.json()) == 3
+
+def test_list_calculations_not_cached_without_shared_redis(client, monkeypatch):
+    from app.core.list_cache import list_cache
+    monkeypatch.setattr(list_cache, "redis", ManagedRedis(url=None))  # per-worker counters only
+    list_cache.clear()
+    _create_calculations(client, 1)
+    first = client.get("/calculations")
+    assert "ETag" not in first.headers
+    assert client.get("/calculations", headers={"If-None-Match": "*"}).status_code == 200
+    assert list_cache.stats()["entries"] == 0
+
+# --- Export Tests ---
+
+def test_export_calculations_ndjson(client, monkeypatch):
+    import json
+    from app.main import settings
+    monkeypatch.setattr(settings, "EXPORT_YIELD_PER", 2)  # force several partitions
+    created = _create_calculations(client, 5)
+
+    response = client.get("/calculations/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert 'filename="calculations.ndjson"' in response.headers["content-disposition"]
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(r["id"] for r in records) == sorted(created)
+    assert records[0]["inputs"] == [4.0, 1.0] and records[0]["result"] == 5.0
+
+def test_export_ndjson_writes_non_finite_results_as_null(client, tmp_path):
+    import json
+    calc_id = client.post("/calculations", json={"type": "exponentiate", "inputs": [10, 2]}).json()["id"]
+    # A result stored as +inf, e.g. a power that overflowed before results were checked
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with engine.begin() as conn:
+        conn.execute(Calculation.__table__.update().values(result=float("inf")))
+    engine.dispose()
+
+    line = client.get("/calculations/export").text.strip()
+    assert "Infinity" not in line
+    record = json.loads(line, parse_constant=lambda name: pytest.fail(f"invalid JSON constant {name}"))
+    assert (record["id"], record["result"]) == (calc_id, None)
+
+def test_export_calculations_csv(client):
+    import csv, io, json
+    _create_calculations(client, 3, "multiplication")
+    response = client.get("/calculations/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 3
+    assert json.loads(rows[-1]["inputs"]) == [0.0, 1.0]
+    assert {row["type"] for row in rows} == {"multiplication"}
+
+def test_export_rejects_unknown_format(client):
+    assert client.get("/calculations/export", params={"format": "xml"}).status_code == 422
+
+# --- Bulk Import Tests ---
+
+def test_import_calculations_ndjson_with_error_file(client, monkeypatch, tmp_path):
+    import json
+    from app.main import settings
+    monkeypatch.setattr(settings, "IMPORT_ERROR_DIR", str(tmp_path / "errors"))
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)  # several batches
+    upload = "\n".join([
+        json.dumps({"type": "addition", "inputs": [1, 2]}),
+        json.dumps({"type": "division", "inputs": [1, 0]}),
+        "{not json",
+        "",
+        json.dumps({"type": "multiplication", "inputs": [3, 4]}),
+        json.dumps({"type": "exponentiate", "inputs": [2, 10]}),
+    ]).encode()
+
+    response = client.post("/calculations/import", content=upload)
+    assert response.status_code == 201
+    data = response.json()
+    assert (data["imported"], data["rejected"]) == (3, 2)
+
+    stored = client.get("/calculations").json()
+    assert sorted(c["result"] for c in stored) == [3, 12, 1024]
+
+    errors = client.get(data["errors_url"])
+    assert errors.status_code == 200
+    entries = [json.loads(line) for line in errors.text.splitlines()]
+    assert sorted(e["line"] for e in entries) == [2, 3]
+    assert any("divide by zero" in e["detail"] for e in entries)
+
+def test_import_error_files_expire(client, monkeypatch, tmp_path):
+    import os
+    from app.core.importer import settings
+    monkeypatch.setattr(settings, "IMPORT_ERROR_DIR", str(tmp_path / "errors"))
+    monkeypatch.setattr(settings, "IMPORT_ERROR_TTL_SECONDS", 3600)
+    errors_url = client.post("/calculations/import", content=b"{not json").json()["errors_url"]
+    [name] = os.listdir(tmp_path / "errors")
+    assert client.get(errors_url).status_code == 200
+
+    # Two hours later the file is past its TTL: deleted, not served
+    old = os.path.getmtime(tmp_path / "errors" / name) - 7200
+    os.utime(tmp_path / "errors" / name, (old, old))
+    assert client.get(errors_url).status_code == 404
+    assert os.listdir(tmp_path / "errors") == []
+
+def test_import_calculations_csv_round_trips_export(client):
+    _create_calculations(client, 3, "subtraction")
+    exported = client.get("/calculations/export", params={"format": "csv"}).content
+
+    response = client.post("/calculations/import", params={"format": "csv"}, content=exported)
+    assert response.status_code == 201
+    assert response.json()["imported"] == 3
+    assert response.json()["errors_url"] is None
+    assert len(client.get("/calculations").json()) == 6
+
+def test_import_csv_requires_type_and_inputs_columns(client):
+    response = client.post("/calculations/import", params={"format": "csv"}, content=b"a,b\n1,2\n")
+    assert response.status_code == 400
+
+# --- Stats Tests ---
+
+def test_calculation_stats(client):
+    for calc_type, inputs in [("addition", [1, 2]), ("addition", [10, 20]), ("division", [9, 3])]:
+        client.post("/calculations", json={"type": calc_type, "inputs": inputs})
+
+    response = client.get("/calculations/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert data["by_type"] == [
+        {"type": "addition", "count": 2, "min_result": 3.0, "max_result": 30.0, "avg_result": 16.5},
+        {"type": "division", "count": 1, "min_result": 3.0, "max_result": 3.0, "avg_result": 3.0},
+    ]
+    assert len(data["daily"]) == 1 and data["daily"][0]["count"] == 3
+
+def test_calculation_stats_empty_and_filtered(client):
+    _create_calculations(client, 2)
+    response = client.get("/calculations/stats", params={"created_from": "2999-01-01T00:00:00"})
+    assert response.json() == {"total": 0, "by_type": [], "daily": []}
+
+def test_calculation_stats_summary_tracks_writes(client):
+    ids = _create_calculations(client, 3)
+    client.post("/calculations/batch", json=[{"type": "multiplication", "inputs": [2, 5]}])
+    client.post("/calculations/import", content=b'{"type": "division", "inputs": [9, 3]}\n')
+    assert client.put(f"/calculations/{ids[0]}", json={"inputs": [100, 1]}).status_code == 200
+    assert client.delete(f"/calculations/{ids[1]}").status_code == 204
+
+    summary = client.get("/calculations/stats").json()
+    live = client.get("/calculations/stats", params={"source": "live"}).json()
+    assert summary == live
+    assert summary["total"] == 4
+    assert {stats["type"]: stats["count"] for stats in summary["by_type"]} == {
+        "addition": 2, "division": 1, "multiplication": 1,
+    }
+
+def test_fast_json_responses_match_default_path(client, monkeypatch):
+    from app.main import settings
+    monkeypatch.setattr(settings, "LIST_CACHE_MAX_ENTRIES", 0)
+    _create_calculations(client, 3)
+
+    def responses():
+        created = client.post("/calculations", json={"type": "division", "inputs": [1, 3]})
+        calc_id = created.json()["id"]
+        updated = client.put(f"/calculations/{calc_id}", json={"inputs": [1e20, 1e-5]})
+        single = client.get(f"/calculations/{calc_id}")
+        client.delete(f"/calculations/{calc_id}")
+        listing = client.get("/calculations")
+        return created, updated, single, listing
+
+    default = responses()
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    fast = responses()
+
+    volatile = ("id", "created_at", "updated_at")
+    for slow_response, fast_response in zip(default[:3], fast[:3]):
+        assert fast_response.status_code == slow_response.status_code
+        assert fast_response.headers["content-type"] == "application/json"
+        # A new calculation each run: only its id and timestamps may differ
+        strip = lambda data: {k: v for k, v in data.items() if k not in volatile}
+        assert strip(fast_response.json()) == strip(slow_response.json())
+    assert fast[2].headers["ETag"] and fast[2].headers["Cache-Control"] == default[2].headers["Cache-Control"]
+    # Same stored calculations, listed from Core rows: byte-identical page
+    assert fast[3].content == default[3].content
+
+def test_sparse_fieldsets(client):
+    _create_calculations(client, 3)
+
+    response = client.get("/calculations", params={"fields": "id,type,result", "limit": 2})
+    assert response.status_code == 200
+    page = response.json()
+    assert [list(item) for item in page] == [["type", "id", "result"]] * 2
+    full = client.get("/calculations", params={"limit": 2}).json()
+    assert page == [{k: item[k] for k in ("type", "id", "result")} for item in full]
+    assert len(response.content) < len(client.get("/calculations", params={"limit": 2}).content)
+
+    # Cursors still work on a projected page
+    rest = client.get("/calculations", params={"fields": "id", "after": response.headers["X-Next-Cursor"]})
+    assert [item["id"] for item in rest.json()] == [item["id"] for item in client.get("/calculations").json()[2:]]
+
+    calc_id = page[0]["id"]
+    single = client.get(f"/calculations/{calc_id}", params={"fields": "result"})
+    assert single.json() == {"result": full[0]["result"]}
+    assert single.headers["ETag"] != client.get(f"/calculations/{calc_id}").headers["ETag"]
+    assert client.get(f"/calculations/{calc_id}", params={"fields": "result"},
+                      headers={"If-None-Match": single.headers["ETag"]}).status_code == 304
+
+    assert client.get("/calculations", params={"fields": "id,secret"}).status_code == 400
+    assert client.get(f"/calculations/{calc_id}", params={"fields": "secret"}).status_code == 400
+
+def test_bulk_delete_by_ids_and_filter(client, monkeypatch):
+    from app.core import bulk
+    monkeypatch.setattr(bulk, "IN_CHUNK_SIZE", 1)  # exercise the chunked IN path
+    ids = _create_calculations(client, 3)
+    division_ids = _create_calculations(client, 2, calc_type="division")
+
+    assert client.request("DELETE", "/calculations", json={}).status_code == 422  # no criteria
+    response = client.request("DELETE", "/calculations", json={"ids": [ids[0], ids[1], str(uuid4())]})
+    assert response.status_code == 200
+    assert response.json() == {"deleted": 2}
+
+    response = client.request("DELETE", "/calculations", json={"type": "division"})
+    assert response.json() == {"deleted": 2}
+    remaining = [item["id"] for item in client.get("/calculations").json()]
+    assert remaining == [ids[2]]
+    assert client.get(f"/calculations/{division_ids[0]}").status_code == 404
+
+    response = client.request("DELETE", "/calculations", json={"created_from": "2999-01-01T00:00:00"})
+    assert response.json() == {"deleted": 0}
+    assert client.get("/calculations/stats").json()["total"] == 1
+
+def test_bulk_delete_too_many_ids(client, monkeypatch):
+    from app.main import settings
+    monkeypatch.setattr(settings, "CALCULATION_BULK_MAX_IDS", 2)
+    response = client.request("DELETE", "/calculations", json={"ids": [str(uuid4()) for _ in range(3)]})
+    assert response.status_code == 413
+
+def test_bulk_update_recomputes_results(client):
+    ids = _create_calculations(client, 2)
+    division_id = _create_calculations(client, 1, calc_type="division")[0]
+    payload = [
+        {"id": ids[0], "inputs": [10, 20]},
+        {"id": division_id, "inputs": [1, 0]},   # zero divisor
+        {"id": str(uuid4()), "inputs": [1, 2]},  # unknown
+        {"id": ids[1], "inputs": [1]},           # too few inputs
+        {"id": ids[1], "inputs": [2.5, 2.5]},
+    ]
+    response = client.patch("/calculations", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated"] == 2
+    assert [error["index"] for error in data["errors"]] == [1, 2, 3]
+
+    assert client.get(f"/calculations/{ids[0]}").json()["result"] == 30
+    assert client.get(f"/calculations/{ids[1]}").json()["inputs"] == [2.5, 2.5]
+    assert client.get(f"/calculations/{division_id}").json()["inputs"] == [0, 1]  # unchanged
+
+def test_bulk_update_is_one_statement_counting_rows_it_changed(client, monkeypatch):
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from app.core import bulk
+
+    ids = _create_calculations(client, 3)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "calculations" in statement:
+            statements.append(statement.split()[0])
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = client.patch("/calculations", json=[{"id": calc_id, "inputs": [4, 4]} for calc_id in ids])
+        assert response.json() == {"updated": 3, "errors": []}
+        assert statements == ["UPDATE"]
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    # Repeated ids are rejected, not counted twice; small chunks give the same result
+    monkeypatch.setattr(bulk, "IN_CHUNK_SIZE", 10)
+    payload = [{"id": ids[0], "inputs": [1, 1]}, {"id": ids[0], "inputs": [2, 2]}, {"id": ids[1], "inputs": [3, 3]}]
+    response = client.patch("/calculations", json=payload).json()
+    assert response["updated"] == 2
+    assert [error["index"] for error in response["errors"]] == [1]
+    assert client.get(f"/calculations/{ids[0]}").json()["result"] == 2
+
+    # Rows deleted before the update are not counted
+    client.delete(f"/calculations/{ids[2]}")
+    response = client.patch("/calculations", json=[{"id": ids[2], "inputs": [1, 2]}]).json()
+    assert response == {"updated": 0, "errors": [{"index": 0, "detail": "Calculation not found."}]}
+
+def test_update_and_delete_are_single_statements(client):
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    calc_id = _create_calculations(client, 1, calc_type="division")[0]
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "calculations" in statement:
+            statements.append(statement.split()[0])
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = client.put(f"/calculations/{calc_id}", json={"inputs": [9, 3]})
+        assert response.status_code == 200 and response.json()["result"] == 3.0
+        assert statements == ["UPDATE"]
+
+        statements.clear()
+        assert client.delete(f"/calculations/{calc_id}").status_code == 204
+        assert statements == ["DELETE"]
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+def test_update_rejections_leave_row_unchanged(client):
+    calc_id = _create_calculations(client, 1, calc_type="division")[0]
+    before = client.get(f"/calculations/{calc_id}").json()
+
+    response = client.put(f"/calculations/{calc_id}", json={"inputs": [1, 0]})
+    assert response.status_code == 400
+    assert "divide by zero" in response.json()["detail"].lower()
+    assert client.get(f"/calculations/{calc_id}").json() == before
+
+    assert client.put(f"/calculations/{uuid4()}", json={"inputs": [1, 2]}).status_code == 404
+    assert client.delete(f"/calculations/{uuid4()}").status_code == 404
+
+# --- Read Replica Tests ---
+
+@pytest.fixture
+def replicas(client, tmp_path):
+    """
+    Two SQLite files standing in for read replicas. Yields replicate(), which
+    copies the primary into them (replication catching up).
+    """
+    import shutil
+    from app.core.replicas import replica_router
+
+    paths = [tmp_path / f"replica{n}.db" for n in (1, 2)]
+
+    def replicate():
+        for path in paths:
+            shutil.copyfile(tmp_path / "test.db", path)
+
+    replicate()
+    replica_router.configure(
+        [f"sqlite:///{path}" for path in paths],
+        engine_factory=lambda url: get_async_engine(url, poolclass=NullPool),
+    )
+    yield replicate
+    replica_router.configure([])
+
+def _expire_read_your_writes(user_id):
+    import asyncio
+    from app.core.replicas import replica_router
+    asyncio.run(replica_router.redis.delete(replica_router._sticky_key(user_id)))
+
+def test_reads_round_robin_over_replicas_after_writes_expire(client, replicas):
+    calc_id = _create_calculations(client, 1)[0]
+    user_id = client.get("/calculations").json()[0]["user_id"]  # read-your-writes: from the primary
+    assert client.get("/metrics/replicas", headers=METRICS_HEADERS).json()["sticky_reads"] == 1
+
+    replicas()
+    _expire_read_your_writes(user_id)
+    assert client.get(f"/calculations/{calc_id}").json()["id"] == calc_id
+    assert client.get(f"/calculations/{calc_id}?fields=result").json() == {"result": 1.0}
+    assert client.get("/calculations/stats").json()["total"] == 1
+    metrics = client.get("/metrics/replicas", headers=METRICS_HEADERS).json()
+    assert [replica["reads"] for replica in metrics["replicas"]] == [2, 1]
+    assert metrics["primary_reads"] == 1
+
+    # A new write is read back from the primary until the window expires...
+    new_id = _create_calculations(client, 1)[0]
+    assert client.get(f"/calculations/{new_id}").status_code == 200
+    # ...after which it is only visible once the replicas have it
+    _expire_read_your_writes(user_id)
+    assert client.get(f"/calculations/{new_id}").status_code == 404
+    replicas()
+    assert client.get(f"/calculations/{new_id}").status_code == 200
+    assert len(client.get("/calculations/export").text.splitlines()) == 2
+
+def test_writer_is_sticky_before_list_version_changes(client, replicas, monkeypatch):
+    from app.core.list_cache import list_cache
+    from app.core.replicas import replica_router
+
+    # A read racing the write must not see the new version on a replica
+    sticky_when_invalidated = []
+    invalidate = list_cache.invalidate
+
+    async def checking_invalidate(owner_id):
+        sticky_when_invalidated.append(await replica_router.is_sticky(owner_id))
+        await invalidate(owner_id)
+
+    monkeypatch.setattr(list_cache, "invalidate", checking_invalidate)
+    _create_calculations(client, 1)
+    assert sticky_when_invalidated == [True]
+
+def test_lagging_and_failed_replicas_are_skipped(client, replicas, monkeypatch):
+    from unittest.mock import AsyncMock
+    from app.core.replicas import replica_router
+
+    lagging, broken = replica_router.replicas
+    monkeypatch.setattr(lagging, "measure_lag", AsyncMock(return_value=60.0))
+    monkeypatch.setattr(broken, "measure_lag", AsyncMock(side_effect=OSError("connection refused")))
+
+    calc_id = _create_calculations(client, 1)[0]  # not replicated
+    user_id = client.get(f"/calculations/{calc_id}").json()["user_id"]
+    _expire_read_your_writes(user_id)
+    assert client.get(f"/calculations/{calc_id}").status_code == 200  # both skipped: primary
+
+    metrics = client.get("/metrics/replicas", headers=METRICS_HEADERS).json()
+    assert metrics["lagging_skips"] == 2
+    assert [(replica["lag_seconds"], replica["healthy"]) for replica in metrics["replicas"]] == [(60.0, True), (None, False)]
+    assert metrics["replica_reads"] == 0
+
+def test_login_reads_the_user_from_the_primary(client, replicas, tmp_path):
+    import sqlite3
+    from app.core.replicas import replica_router
+
+    # The password changes on the primary; the replicas still have the old hash
+    with sqlite3.connect(tmp_path / "test.db") as conn:
+        conn.execute("UPDATE users SET password = ? WHERE username = 'testuser'", (get_password_hash("newpassword456"),))
+    assert client.post("/auth/login", json={"username": "testuser", "password": "testpassword123"}).status_code == 401
+    assert client.post("/auth/login", json={"username": "testuser", "password": "newpassword456"}).status_code == 200
+    assert replica_router.stats()["replica_reads"] == 0
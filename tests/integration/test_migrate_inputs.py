@@ -0,0 +1,63 @@
+# tests/integration/test_migrate_inputs.py
+
+import json
+from array import array
+from uuid import uuid4
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Calculation, User
+from app.scripts.migrate_inputs_to_float64 import migrate, needs_migration
+
+
+def test_json_inputs_are_migrated_to_float64(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=engine)
+    user_id, calc_id = uuid4(), uuid4()
+
+    # Recreate the pre-migration layout: inputs as a JSON column
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE calculations DROP COLUMN inputs"))
+        conn.execute(text("ALTER TABLE calculations ADD COLUMN inputs JSON"))
+        conn.execute(
+            text("INSERT INTO users (id, first_name, last_name, email, username, password, is_active, is_verified, created_at, updated_at) "
+                 "VALUES (:id, 'A', 'B', 'a@example.com', 'ab', 'x', 1, 0, '2024-01-01', '2024-01-01')"),
+            {"id": user_id.hex},
+        )
+        conn.execute(
+            text("INSERT INTO calculations (id, user_id, type, inputs, result, created_at, updated_at) "
+                 "VALUES (:id, :user_id, 'addition', :inputs, 3.5, '2024-01-01', '2024-01-01')"),
+            {"id": calc_id.hex, "user_id": user_id.hex, "inputs": json.dumps([1, 2.5])},
+        )
+    assert needs_migration(engine)
+
+    assert migrate(engine) is True
+    assert migrate(engine) is False  # idempotent
+
+    session = sessionmaker(bind=engine)()
+    calc = session.query(Calculation).filter(Calculation.id == calc_id).one()
+    assert calc.inputs == array("d", [1.0, 2.5])
+    assert calc.get_result() == 3.5
+    session.close()
+    engine.dispose()
+
+
+def test_float64_column_round_trips_through_orm(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    user = User(first_name="A", last_name="B", email="a@example.com", username="ab", password="x")
+    session.add(user)
+    session.flush()
+    calc = Calculation.create("division", user.id, [1e308, -0.0, 0.1])
+    session.add(calc)
+    session.commit()
+    session.expire_all()
+
+    loaded = session.get(Calculation, calc.id)
+    assert isinstance(loaded.inputs, array)
+    assert list(loaded.inputs) == [1e308, -0.0, 0.1]
+    session.close()
+    engine.dispose()
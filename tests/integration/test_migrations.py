@@ -0,0 +1,99 @@
+# tests/integration/test_migrations.py
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.config import settings
+from app.core.schema_version import SCHEMA_VERSION, SchemaVersionError, check_schema_version, stored_version
+from app.database import Base
+from app.database_init import MIGRATION_LOCK_KEY, alembic_config, drop_db, init_db, migration_lock
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_schema_version_is_alembic_head():
+    assert ScriptDirectory.from_config(alembic_config()).get_current_head() == SCHEMA_VERSION
+
+
+def test_revisions_do_not_import_application_code():
+    # Revisions are history: importing live models would let a later edit rewrite them
+    script = ScriptDirectory.from_config(alembic_config())
+    for revision in script.walk_revisions():
+        with open(revision.path, encoding="utf-8") as source:
+            code = source.read()
+        assert "from app" not in code and "import app" not in code, revision.path
+
+
+def test_migrations_build_the_model_schema(engine):
+    init_db(engine)
+    with engine.connect() as conn:
+        assert stored_version(conn) == SCHEMA_VERSION
+        # Types are not compared: SQLite reflects the PostgreSQL UUID columns as NUMERIC
+        context = MigrationContext.configure(conn, opts={"compare_type": False})
+        assert compare_metadata(context, Base.metadata) == []
+        triggers = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars().all()
+    assert len(triggers) == 3
+
+    init_db(engine)  # idempotent
+    drop_db(engine)
+    assert inspect(engine).get_table_names() == []
+
+
+def test_legacy_create_all_database_is_adopted(engine):
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        assert stored_version(conn) is None
+
+    init_db(engine)
+    with engine.connect() as conn:
+        assert stored_version(conn) == SCHEMA_VERSION
+
+
+def test_check_schema_version(engine):
+    with engine.connect() as conn:
+        with pytest.raises(SchemaVersionError, match="app.database_init"):
+            check_schema_version(conn)
+    init_db(engine)
+    with engine.connect() as conn:
+        assert check_schema_version(conn) == SCHEMA_VERSION
+        conn.execute(text("UPDATE alembic_version SET version_num = 'old'"))
+        with pytest.raises(SchemaVersionError, match="at old"):
+            check_schema_version(conn)
+
+
+@pytest.mark.skipif(not settings.DATABASE_URL.startswith("postgresql"), reason="advisory locks are PostgreSQL-only")
+def test_migration_lock_is_held_across_adoption_and_upgrade():
+    engine = create_engine(settings.DATABASE_URL)
+    try:
+        with engine.connect() as other:
+            def try_lock() -> bool:
+                locked = other.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}).scalar()
+                if locked:
+                    other.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+                return locked
+
+            with migration_lock(engine):
+                assert not try_lock()
+                with engine.begin() as conn:  # the migrations' own connections are not blocked
+                    conn.execute(text("SELECT 1"))
+                assert not try_lock()
+            assert try_lock()
+    finally:
+        engine.dispose()
+
+
+def test_startup_leaves_no_idle_sync_connection():
+    from fastapi.testclient import TestClient
+    from app.database import engine
+    from app.main import app
+
+    with TestClient(app):
+        assert engine.pool.checkedin() == 0
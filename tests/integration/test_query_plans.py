@@ -0,0 +1,141 @@
+# tests/integration/test_query_plans.py
+"""
+Query-plan regression tests: the hot calculation queries must be index range
+scans with no sort step. Plans come from SQLite's EXPLAIN QUERY PLAN, and
+from PostgreSQL's EXPLAIN (FORMAT JSON) when the suite runs against it.
+"""
+
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import create_engine, func, inspect, select, text, tuple_
+
+from app.core.config import settings
+from app.database import Base
+from app.models import Calculation
+from app.scripts.migrate_calculation_indexes import migrate, needs_migration
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def _plan(engine, query) -> str:
+    compiled = query.compile(dialect=engine.dialect)
+    params = tuple(str(compiled.params[name]) for name in compiled.positiontup)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+def _history(calc_type=None):
+    query = select(Calculation).where(Calculation.user_id == uuid4())
+    if calc_type is not None:
+        query = query.where(Calculation.type == calc_type)
+    return query
+
+
+def _postgres_plan_nodes(engine, query) -> list:
+    """Every node of the PostgreSQL plan for query, flattened."""
+    compiled = query.compile(dialect=engine.dialect)
+    params = {name: str(value) if isinstance(value, UUID) else value for name, value in compiled.params.items()}
+    with engine.begin() as conn:
+        # An empty test table is cheapest to read whole; ask what the plan is
+        # when the planner has to use an index, as it does on a real table
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        conn.exec_driver_sql("SET LOCAL enable_bitmapscan = off")
+        [[plan]] = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params).fetchall()
+    nodes, pending = [], [plan[0]["Plan"]]
+    while pending:
+        node = pending.pop()
+        nodes.append(node)
+        pending.extend(node.get("Plans", []))
+    return nodes
+
+
+HOT_QUERIES = [
+    # Newest-first page after a cursor (GET /calculations?after=)
+    (
+        _history()
+        .where(tuple_(Calculation.created_at, Calculation.id) < tuple_(datetime(2024, 1, 1), str(uuid4())))
+        .order_by(Calculation.created_at.desc(), Calculation.id.desc()).limit(21),
+        "ix_calculations_user_id_created_at_desc",
+    ),
+    # Page before a cursor walks the same index backwards (GET /calculations?before=)
+    (
+        _history()
+        .where(tuple_(Calculation.created_at, Calculation.id) > tuple_(datetime(2024, 1, 1), str(uuid4())))
+        .order_by(Calculation.created_at.asc(), Calculation.id.asc()).limit(21),
+        "ix_calculations_user_id_created_at_desc",
+    ),
+    # One type within a time range (GET /calculations?type=&created_from=)
+    (
+        _history("addition")
+        .where(Calculation.created_at >= datetime(2024, 1, 1))
+        .order_by(Calculation.created_at.desc(), Calculation.id.desc()).limit(21),
+        "ix_calculations_user_id_type_created_at",
+    ),
+    # Per-type statistics (GET /calculations/stats?source=live)
+    (
+        select(Calculation.type, func.count())
+        .where(Calculation.user_id == uuid4())
+        .group_by(Calculation.type),
+        "ix_calculations_user_id_type_created_at",
+    ),
+]
+
+
+@pytest.mark.parametrize("query, index", HOT_QUERIES)
+def test_hot_queries_use_composite_indexes(engine, query, index):
+    plan = _plan(engine, query)
+    assert f"INDEX {index}" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+    assert "SCAN calculations" not in plan, plan
+
+
+@pytest.mark.skipif(not settings.DATABASE_URL.startswith("postgresql"), reason="PostgreSQL plans need PostgreSQL")
+@pytest.mark.parametrize("query, index", HOT_QUERIES)
+def test_hot_queries_use_composite_indexes_on_postgres(query, index):
+    engine = create_engine(settings.DATABASE_URL)  # migrated by the session fixture
+    try:
+        nodes = _postgres_plan_nodes(engine, query)
+    finally:
+        engine.dispose()
+    node_types = [node["Node Type"] for node in nodes]
+    assert any(
+        node["Node Type"] in ("Index Scan", "Index Only Scan") and node.get("Index Name") == index
+        for node in nodes
+    ), nodes
+    assert "Sort" not in node_types and "Incremental Sort" not in node_types, nodes
+    assert "Seq Scan" not in node_types, nodes
+
+
+def test_redundant_indexes_are_not_created(engine):
+    inspector = inspect(engine)
+    calculation_indexes = {index["name"] for index in inspector.get_indexes("calculations")}
+    assert calculation_indexes == {
+        "ix_calculations_user_id_created_at_desc",
+        "ix_calculations_user_id_type_created_at",
+    }
+    assert "ix_users_id" not in {index["name"] for index in inspector.get_indexes("users")}
+
+
+def test_migration_replaces_legacy_indexes(engine):
+    # Recreate the pre-migration layout
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_calculations_user_id_created_at_desc"))
+        conn.execute(text("DROP INDEX ix_calculations_user_id_type_created_at"))
+        conn.execute(text("CREATE INDEX ix_calculations_user_id ON calculations (user_id)"))
+        conn.execute(text("CREATE INDEX ix_calculations_type ON calculations (type)"))
+        conn.execute(text("CREATE INDEX ix_calculations_user_id_created_at_id ON calculations (user_id, created_at, id)"))
+        conn.execute(text("CREATE UNIQUE INDEX ix_users_id ON users (id)"))
+    assert needs_migration(engine)
+
+    assert migrate(engine) is True
+    assert migrate(engine) is False  # idempotent
+    test_redundant_indexes_are_not_created(engine)
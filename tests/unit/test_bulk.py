@@ -0,0 +1,26 @@
+# tests/unit/test_bulk.py
+
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.bulk import CALCULATION_TYPES, _array_literal, _edit_values, evaluate_for_every_type
+
+
+def test_evaluate_for_every_type():
+    [(results, errors)] = evaluate_for_every_type([[6, 0]])
+    assert set(results) | set(errors) == set(CALCULATION_TYPES)
+    assert results["addition"] == 6.0
+    assert "division" in errors
+
+
+def test_postgresql_edits_are_one_unnest_of_arrays():
+    rows = [{"id": uuid4(), "inputs": [1.5, 2.0], "results": {"addition": 3.5}} for _ in range(5000)]
+    [(source, inputs)] = _edit_values(rows, "postgresql")
+    sql = str(source.select().compile(dialect=postgresql.dialect()))
+    assert "unnest(" in sql and sql.count("%(") == 3 + len(CALCULATION_TYPES)  # one parameter per column
+
+
+def test_array_literal_round_trips():
+    assert _array_literal([0.1, 1e20, float("inf"), -float("inf")]) == "{0.1,1e+20,Infinity,-Infinity}"
+    assert _array_literal([float("nan")]) == "{NaN}"
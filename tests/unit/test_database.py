@@ -2,8 +2,9 @@ import pytest
 from unittest.mock import patch
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db, get_engine, get_sessionmaker
+from app.database import get_db, get_engine, get_sessionmaker, get_async_db, get_async_database_url
 
 def test_get_engine_and_sessionmaker():
     """
@@ -48,4 +49,27 @@ def test_get_db_yields_session_and_closes():
             next(db_generator)
         
         # 4. Assert that the .close() method was called exactly once
-        mock_close.assert_called_once()
\ No newline at end of file
+        mock_close.assert_called_once()
+
+
+@pytest.mark.parametrize("sync_url, async_url", [
+    ("postgresql://user:pw@localhost:5432/db", "postgresql+asyncpg://user:pw@localhost:5432/db"),
+    ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+    ("postgresql+asyncpg://user:pw@localhost/db", "postgresql+asyncpg://user:pw@localhost/db"),
+])
+def test_get_async_database_url(sync_url, async_url):
+    """Sync URLs are mapped onto their async driver; async URLs pass through."""
+    assert get_async_database_url(sync_url) == async_url
+
+
+@pytest.mark.asyncio
+async def test_get_async_db_yields_async_session():
+    """get_async_db yields an AsyncSession and closes it when the generator finishes."""
+    db_generator = get_async_db()
+    session = await db_generator.__anext__()
+    assert isinstance(session, AsyncSession)
+
+    with patch.object(session, 'close', wraps=session.close) as mock_close:
+        with pytest.raises(StopAsyncIteration):
+            await db_generator.__anext__()
+        mock_close.assert_called_once()
@@ -0,0 +1,91 @@
+# tests/unit/test_fast_json.py
+"""Parity of the msgspec response path with CalculationResponse serialization."""
+
+from array import array
+from collections import namedtuple
+from datetime import datetime, timezone
+from typing import List
+from uuid import uuid4
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.core.fast_json import CALCULATION_FIELDS, dumps_calculation, dumps_calculations
+from app.models.calculation import Calculation
+from app.schemas.calculation import CalculationResponse
+
+Row = namedtuple("Row", CALCULATION_FIELDS)
+
+list_adapter = TypeAdapter(List[CalculationResponse])
+
+TIMESTAMPS = [
+    datetime(2025, 1, 1),
+    datetime(2025, 1, 1, 12, 30, 5, 120000),
+    datetime(2025, 1, 1, 12, 30, 5, 1, tzinfo=timezone.utc),
+]
+
+VALUES = [
+    ([1, 2], 3),
+    ([0.1, 0.2], 0.30000000000000004),
+    ([1e20, 2.5e-5], 1e20),
+    ([-0.0, 5e-324], 5e-324),
+    ([1e308, 1e308], float("inf")),
+    ([123456789012345678, 1], 1.2345678901234568e17),
+]
+
+
+def _calculations():
+    calcs = []
+    for (inputs, result), created_at in zip(VALUES, TIMESTAMPS * 2):
+        calc = Calculation.create("addition", uuid4(), inputs)
+        calc.id, calc.result = uuid4(), result
+        calc.created_at = calc.updated_at = created_at
+        calcs.append(calc)
+    return calcs
+
+
+def _expected_one(calc) -> bytes:
+    return CalculationResponse.model_validate(calc, from_attributes=True).model_dump_json().encode()
+
+
+@pytest.mark.parametrize("calc", _calculations(), ids=lambda calc: repr(calc.inputs))
+def test_single_calculation_is_byte_identical(calc):
+    assert dumps_calculation(calc) == _expected_one(calc)
+
+
+def test_list_is_byte_identical_for_orm_objects_and_rows():
+    calcs = _calculations()
+    expected = list_adapter.dump_json(list_adapter.validate_python(calcs, from_attributes=True))
+    assert dumps_calculations(calcs) == expected
+
+    # Core rows, as selected by the list endpoint (inputs come back as array('d'))
+    rows = [
+        Row(*(array("d", calc.inputs) if field == "inputs" else getattr(calc, field) for field in CALCULATION_FIELDS))
+        for calc in calcs
+    ]
+    assert dumps_calculations(rows) == expected
+    assert dumps_calculations([]) == b"[]"
+
+
+@pytest.mark.parametrize("fields", [("id", "type", "result"), ("inputs",), ("created_at", "updated_at")])
+def test_sparse_fieldsets_match_full_response_subset(fields):
+    import json
+    from app.core.fast_json import dumps_calculation_fields, dumps_calculations_fields
+
+    calcs = _calculations()
+    Partial = namedtuple("Partial", fields)
+    rows = [Partial(*(getattr(calc, field) for field in fields)) for calc in calcs]
+
+    validated = dumps_calculations_fields(rows, fields)
+    assert dumps_calculations_fields(rows, fields, validate=False) == validated
+    assert json.loads(validated) == [
+        {field: value for field, value in json.loads(_expected_one(calc)).items() if field in fields}
+        for calc in calcs
+    ]
+    assert dumps_calculation_fields(rows[0], fields) == dumps_calculation_fields(rows[0], fields, validate=False)
+
+
+def test_projection_columns_select_only_requested_and_required():
+    from app.core.fast_json import projection_columns
+    columns = projection_columns(("result", "type"), "created_at", "id")
+    assert [column.key for column in columns] == ["type", "id", "created_at", "result"]
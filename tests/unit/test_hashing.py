@@ -0,0 +1,43 @@
+# tests/unit/test_hashing.py
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth.hashing import PasswordHasherPool
+from app.auth.jwt import get_password_hash, verify_password
+
+
+@pytest.mark.asyncio
+async def test_process_pool_hash_and_verify_round_trip():
+    hasher = PasswordHasherPool(workers=1, max_queue=4)
+    try:
+        hashed = await hasher.hash("SecurePass123!")
+        assert verify_password("SecurePass123!", hashed)
+        assert await hasher.verify("SecurePass123!", get_password_hash("SecurePass123!"))
+        assert not await hasher.verify("WrongPass123!", hashed)
+    finally:
+        hasher.shutdown()
+    assert hasher.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_with_503():
+    """With one worker and one queue slot busy, the third call fails fast."""
+    hasher = PasswordHasherPool(workers=0, max_queue=1)
+    release = threading.Event()
+
+    busy = [asyncio.create_task(hasher.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    assert hasher.stats()["in_flight"] == 2
+
+    with pytest.raises(HTTPException) as exc_info:
+        await hasher.run(release.wait)
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "1"
+
+    release.set()
+    await asyncio.gather(*busy)
+    assert hasher.stats() == {"workers": 0, "max_queue": 1, "in_flight": 0, "rejected": 1}
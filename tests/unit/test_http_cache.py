@@ -0,0 +1,25 @@
+# tests/unit/test_http_cache.py
+
+from app.core.http_cache import etag_matches, make_etag, not_modified
+
+
+def test_make_etag_is_quoted_and_stable():
+    etag = make_etag("id", "2024-01-01T00:00:00")
+    assert etag == make_etag("id", "2024-01-01T00:00:00")
+    assert etag != make_etag("id", "2024-01-01T00:00:01")
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_etag_matches_lists_weak_tags_and_wildcard():
+    etag = make_etag("x")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_not_modified_response():
+    response = not_modified('"abc"')
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"abc"'
@@ -0,0 +1,49 @@
+# tests/unit/test_importer.py
+
+import time
+
+import pytest
+
+from app.core.importer import RecordError, iter_lines, iter_records
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+@pytest.mark.asyncio
+async def test_lines_split_across_chunks_keep_their_numbers():
+    lines = await _collect(iter_lines(_chunks(b"ab", b"c\n\nde", b"f\r\ng", b"h")))
+    assert lines == [(1, "abc"), (3, "def"), (4, "gh")]
+
+
+@pytest.mark.asyncio
+async def test_overlong_lines_become_row_errors(monkeypatch):
+    from app.core.importer import settings
+    monkeypatch.setattr(settings, "IMPORT_MAX_LINE_BYTES", 10)
+    lines = await _collect(iter_lines(_chunks(b"ok\n", b"x" * 6, b"x" * 6, b"\nfine\n", b"y" * 20)))
+    assert lines[0] == (1, "ok")
+    assert lines[1][0] == 2 and isinstance(lines[1][1], RecordError)
+    assert lines[2] == (3, "fine")
+    assert lines[3][0] == 4 and isinstance(lines[3][1], RecordError)
+
+    records = await _collect(iter_records(_chunks(b'{"a": 1}\n', b"z" * 20), "ndjson"))
+    assert records[0] == (1, {"a": 1})
+    assert "longer than 10 bytes" in str(records[1][1])
+    with pytest.raises(ValueError, match="CSV header"):
+        await _collect(iter_records(_chunks(b"type,inputs,extra\n"), "csv"))
+
+
+@pytest.mark.asyncio
+async def test_long_unterminated_line_is_linear():
+    # 8 MB in 1 KB chunks: re-splitting the whole buffer per chunk would take minutes
+    chunk = b"x" * 1024
+    started = time.perf_counter()
+    lines = await _collect(iter_lines(_chunks(*[chunk] * 8192), max_line_bytes=16 * 1024 * 1024))
+    assert time.perf_counter() - started < 5
+    assert [(number, len(text)) for number, text in lines] == [(1, 8 * 1024 * 1024)]
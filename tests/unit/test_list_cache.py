@@ -0,0 +1,86 @@
+# tests/unit/test_list_cache.py
+
+from uuid import uuid4
+
+import fakeredis
+import pytest
+
+from app.core.list_cache import ListCache
+from app.core.redis_client import ManagedRedis
+
+
+@pytest.mark.asyncio
+async def test_invalidate_bumps_version_and_hides_old_pages():
+    cache = ListCache(max_entries=10, ttl_seconds=60, redis=ManagedRedis(client=fakeredis.FakeAsyncRedis()))
+    owner = uuid4()
+    version = await cache.version(owner)
+    cache.put(owner, version, "page-1", b"[]", {"X-Next-Cursor": "abc"})
+    assert cache.get(owner, version, "page-1") == (b"[]", {"X-Next-Cursor": "abc"})
+
+    await cache.invalidate(owner)
+    new_version = await cache.version(owner)
+    assert new_version == version + 1
+    assert cache.get(owner, new_version, "page-1") is None
+
+    # Other users are unaffected
+    other = uuid4()
+    other_version = await cache.version(other)
+    await cache.invalidate(owner)
+    assert await cache.version(other) == other_version
+
+
+@pytest.mark.asyncio
+async def test_versions_are_shared_between_workers():
+    server = fakeredis.FakeServer()
+    worker_a = ListCache(max_entries=10, ttl_seconds=60, redis=ManagedRedis(client=fakeredis.FakeAsyncRedis(server=server)))
+    worker_b = ListCache(max_entries=10, ttl_seconds=60, redis=ManagedRedis(client=fakeredis.FakeAsyncRedis(server=server)))
+    owner = uuid4()
+    worker_b.put(owner, await worker_b.version(owner), "page", b"[]", {})
+
+    await worker_a.invalidate(owner)
+    assert worker_b.get(owner, await worker_b.version(owner), "page") is None
+
+
+def test_lru_bound_and_ttl():
+    cache = ListCache(max_entries=1, ttl_seconds=60, redis=ManagedRedis(url=None))
+    cache.put("u", 0, "a", b"a", {})
+    cache.put("u", 0, "b", b"b", {})
+    assert cache.get("u", 0, "a") is None
+    assert cache.get("u", 0, "b") == (b"b", {})
+
+    expired = ListCache(max_entries=10, ttl_seconds=0, redis=ManagedRedis(url=None))
+    expired.put("u", 0, "a", b"a", {})
+    assert expired.get("u", 0, "a") is None
+
+
+@pytest.mark.asyncio
+async def test_no_version_without_redis():
+    cache = ListCache(max_entries=10, ttl_seconds=60, redis=ManagedRedis(url=None))
+    owner = uuid4()
+    assert await cache.version(owner) is None
+    await cache.invalidate(owner)
+    assert await cache.version(owner) is None
+    assert cache.stats()["unshared"] == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidations_made_during_an_outage_are_replayed(monkeypatch):
+    from app.core.redis_client import settings
+    monkeypatch.setattr(settings, "REDIS_BREAKER_FAILURES", 1)
+    monkeypatch.setattr(settings, "REDIS_BREAKER_RESET_SECONDS", 0)
+    server = fakeredis.FakeServer()
+    worker_a = ListCache(max_entries=10, ttl_seconds=60, redis=ManagedRedis(client=fakeredis.FakeAsyncRedis(server=server)))
+    worker_b = ListCache(max_entries=10, ttl_seconds=60, redis=ManagedRedis(client=fakeredis.FakeAsyncRedis(server=server)))
+    owner = uuid4()
+    version = await worker_a.version(owner)
+    worker_a.put(owner, version, "page", b"[]", {})
+
+    # Worker B's write during the outage never reaches Redis...
+    server.connected = False
+    await worker_b.invalidate(owner)
+    assert await worker_a.version(owner) is None  # ...so A stops trusting its cache
+
+    # Once Redis is back, B replays the bump and A's old page is stale everywhere
+    server.connected = True
+    assert await worker_b.version(owner) == version + 1
+    assert await worker_a.version(owner) == version + 1
@@ -0,0 +1,61 @@
+# tests/unit/test_metrics.py
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.metrics import Histogram, InstrumentedQueuePool, pool_stats
+from app.database import get_pool_kwargs
+
+
+def test_histogram_cumulative_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 1, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(4.05)
+
+
+def test_instrumented_pool_records_waits_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.01,
+    )
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        stats = pool_stats(engine.pool)
+        assert stats["checked_out"] == 1
+
+        # The only connection is in use, so a second checkout times out
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    stats = pool_stats(engine.pool)
+    assert stats["pool_class"] == "InstrumentedQueuePool"
+    assert stats["size"] == 1 and stats["max_overflow"] == 0
+    assert stats["checked_out"] == 0 and stats["checked_in"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["wait_seconds"]["count"] == 2
+
+    # dispose() recreates the pool but keeps its metrics
+    engine.dispose()
+    assert pool_stats(engine.pool)["timeouts"] == 1
+    engine.dispose()
+
+
+def test_get_pool_kwargs_uses_settings_for_server_databases(monkeypatch):
+    from app.database import settings
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 5)
+
+    assert get_pool_kwargs("sqlite:///app.db") == {}
+
+    kwargs = get_pool_kwargs("postgresql://user:pw@localhost/db")
+    assert kwargs["poolclass"] is InstrumentedQueuePool
+    assert kwargs["pool_size"] == 20 and kwargs["max_overflow"] == 5
+
+    async_kwargs = get_pool_kwargs("postgresql://user:pw@localhost/db", async_driver=True)
+    assert async_kwargs["poolclass"].__name__ == "InstrumentedAsyncQueuePool"
@@ -0,0 +1,137 @@
+# tests/unit/test_redis_client.py
+
+import time
+
+import fakeredis
+import pytest
+
+from app.core.redis_client import InMemoryTTLStore, ManagedRedis
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def client(server):
+    return ManagedRedis(client=fakeredis.FakeAsyncRedis(server=server))
+
+
+@pytest.mark.asyncio
+async def test_commands_go_to_redis_when_healthy(client, server):
+    await client.set("key", "value", ex=60)
+    assert await client.get("key") == b"value"
+    assert await fakeredis.FakeAsyncRedis(server=server).get("key") == b"value"
+    assert client.stats()["fallback_ops"] == 0
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_memory_and_opens_breaker(client, server, monkeypatch):
+    from app.core.redis_client import settings
+    monkeypatch.setattr(settings, "REDIS_BREAKER_FAILURES", 2)
+    server.connected = False
+
+    await client.set("blacklist:jti", "1", ex=60)
+    assert await client.exists("blacklist:jti") == 1
+    assert client.state == ManagedRedis.OPEN
+    assert client.stats()["fallback_ops"] == 2
+
+    # While open, Redis is not tried at all
+    await client.get("blacklist:jti")
+    assert client.failures == 2
+
+
+@pytest.mark.asyncio
+async def test_half_open_trial_closes_breaker(client, server, monkeypatch):
+    from app.core.redis_client import settings
+    monkeypatch.setattr(settings, "REDIS_BREAKER_FAILURES", 1)
+    monkeypatch.setattr(settings, "REDIS_BREAKER_RESET_SECONDS", 0.01)
+    server.connected = False
+    await client.set("revoked", "1", ex=60)
+    assert client.state == ManagedRedis.OPEN
+
+    time.sleep(0.02)
+    assert client.state == ManagedRedis.HALF_OPEN
+    server.connected = True
+    assert await client.exists("revoked") == 0  # the trial reads Redis
+    assert client.state == ManagedRedis.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_outage_writes_are_not_served_after_recovery(client, server, monkeypatch):
+    from app.core.redis_client import settings
+    monkeypatch.setattr(settings, "REDIS_BREAKER_FAILURES", 5)
+    server.connected = False
+    await client.set("version", "7")
+    assert await client.get("version") == b"7"  # from the fallback
+
+    server.connected = True
+    assert await client.get("version") is None  # Redis never had it
+    await client.set("other", "1")
+    server.connected = False
+    assert await client.get("version") is None  # the fallback was cleared
+
+
+@pytest.mark.asyncio
+async def test_half_open_lets_one_trial_through(client, server, monkeypatch):
+    import asyncio
+    from app.core.redis_client import settings
+    monkeypatch.setattr(settings, "REDIS_BREAKER_FAILURES", 1)
+    monkeypatch.setattr(settings, "REDIS_BREAKER_RESET_SECONDS", 0.01)
+    server.connected = False
+    await client.get("key")
+    time.sleep(0.02)
+    server.connected = True
+
+    release, calls = asyncio.Event(), []
+    redis = client._get_client()
+    real_get = redis.get
+
+    async def slow_get(*args, **kwargs):
+        calls.append(args)
+        await release.wait()
+        return await real_get(*args, **kwargs)
+    monkeypatch.setattr(redis, "get", slow_get)
+
+    trial = asyncio.ensure_future(client.get("key"))
+    await asyncio.sleep(0)
+    fallback_ops = client.stats()["fallback_ops"]
+    await asyncio.gather(*(client.get("key") for _ in range(5)))
+    assert len(calls) == 1  # the others used the fallback
+    assert client.stats()["fallback_ops"] == fallback_ops + 5
+
+    release.set()
+    await trial
+    assert client.state == ManagedRedis.CLOSED
+    await client.get("key")
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_connect_never_raises_when_redis_is_down(client, server):
+    server.connected = False
+    await client.connect()
+    assert client.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_only_client():
+    client = ManagedRedis(url=None)
+    await client.connect()
+    assert await client.incr("counter") == 1
+    assert await client.incr("counter") == 2
+    assert client.stats()["backend"] == "memory"
+
+
+@pytest.mark.asyncio
+async def test_in_memory_store_expires_keys_and_sorted_sets():
+    store = InMemoryTTLStore()
+    await store.set("short", "1", ex=0.01)
+    await store.zadd("index", {"a": 1.0, "b": 2.0, "c": 3.0})
+    time.sleep(0.02)
+
+    assert await store.get("short") is None
+    assert await store.zrangebyscore("index", 2, "+inf", withscores=True) == [(b"b", 2.0), (b"c", 3.0)]
+    assert await store.zremrangebyscore("index", "-inf", 1) == 1
+    assert await store.zrangebyscore("index", "-inf", "+inf") == [b"b", b"c"]
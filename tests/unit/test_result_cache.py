@@ -0,0 +1,76 @@
+# tests/unit/test_result_cache.py
+
+import fakeredis
+import pytest
+
+from app.core.redis_client import ManagedRedis
+from app.core.result_cache import ResultCache, result_key
+
+
+def test_result_key_is_canonical():
+    assert result_key("addition", [2, 3]) == result_key("Addition", [2.0, 3.0])
+    assert result_key("addition", [2, 3]) != result_key("subtraction", [2, 3])
+    assert result_key("division", [1, 0.0]) != result_key("division", [1, -0.0])
+
+
+class CountingCompute:
+    def __init__(self, value):
+        self.value, self.calls = value, 0
+
+    def __call__(self):
+        self.calls += 1
+        if isinstance(self.value, Exception):
+            raise self.value
+        return self.value
+
+
+@pytest.mark.asyncio
+async def test_local_tier_memoizes_results():
+    cache = ResultCache(max_entries=10, ttl_seconds=60)
+    compute = CountingCompute(8.0)
+    assert await cache.get_or_compute("exponentiate", [2, 3], compute) == 8.0
+    assert await cache.get_or_compute("exponentiate", [2.0, 3.0], compute) == 8.0
+    assert compute.calls == 1
+    assert cache.stats()["local_hits"] == 1 and cache.stats()["hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_failures_and_non_real_results_are_not_cached():
+    cache = ResultCache(max_entries=10, ttl_seconds=60)
+    failing = CountingCompute(ValueError("Cannot divide by zero."))
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await cache.get_or_compute("division", [1, 0], failing)
+    assert failing.calls == 2
+
+    complex_result = CountingCompute(complex(0, 2))
+    await cache.get_or_compute("exponentiate", [-4, 0.5], complex_result)
+    await cache.get_or_compute("exponentiate", [-4, 0.5], complex_result)
+    assert complex_result.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_disabled_cache():
+    cache = ResultCache(max_entries=1, ttl_seconds=60)
+    await cache.get_or_compute("addition", [1, 1], CountingCompute(2.0))
+    await cache.get_or_compute("addition", [2, 2], CountingCompute(4.0))
+    assert cache.stats()["entries"] == 1
+
+    disabled = ResultCache(max_entries=0, ttl_seconds=60)
+    compute = CountingCompute(2.0)
+    await disabled.get_or_compute("addition", [1, 1], compute)
+    await disabled.get_or_compute("addition", [1, 1], compute)
+    assert compute.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_between_workers():
+    redis = ManagedRedis(client=fakeredis.FakeAsyncRedis())
+    worker_a = ResultCache(max_entries=10, ttl_seconds=60, use_redis=True, redis=redis)
+    worker_b = ResultCache(max_entries=10, ttl_seconds=60, use_redis=True, redis=redis)
+
+    await worker_a.get_or_compute("division", [1, 3], CountingCompute(1 / 3))
+    compute = CountingCompute(None)
+    assert await worker_b.get_or_compute("division", [1, 3], compute) == 1 / 3
+    assert compute.calls == 0
+    assert worker_b.stats()["redis_hits"] == 1
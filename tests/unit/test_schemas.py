@@ -71,4 +71,24 @@ def test_password_update_same_as_current():
             current_password="OldPass123!",
             new_password="OldPass123!",
             confirm_new_password="OldPass123!"
-        )
\ No newline at end of file
+        )
+
+
+# --- Tests for calculation sparse fieldsets ---
+
+def test_parse_calculation_fields():
+    """Requested fields come back in response order, deduplicated; empty means all."""
+    from app.schemas.calculation import parse_calculation_fields
+    assert parse_calculation_fields("result, id,type,id") == ("type", "id", "result")
+    assert parse_calculation_fields(None) == ()
+    assert parse_calculation_fields(" , ") == ()
+    with pytest.raises(ValueError, match="Unknown fields: password"):
+        parse_calculation_fields("id,password")
+
+
+def test_calculation_fields_model_is_cached_subset():
+    """The lightweight model keeps only the requested fields and is built once."""
+    from app.schemas.calculation import calculation_fields_model
+    model = calculation_fields_model(("id", "result"))
+    assert list(model.model_fields) == ["id", "result"]
+    assert calculation_fields_model(("id", "result")) is model
@@ -0,0 +1,23 @@
+# tests/unit/test_stats.py
+
+from datetime import date
+
+from app.core.stats import rollup
+
+
+def test_rollup_combines_groups_per_type_and_day():
+    groups = [
+        ("addition", "2024-01-01", 2, 2, 1.0, 5.0, 6.0),
+        ("addition", "2024-01-02", 1, 1, -3.0, -3.0, -3.0),
+        ("division", date(2024, 1, 2), 1, 0, None, None, None),
+    ]
+    stats = rollup(groups)
+    assert stats["total"] == 4
+    assert stats["by_type"][0] == {
+        "type": "addition", "count": 3, "min_result": -3.0, "max_result": 5.0, "avg_result": 1.0,
+    }
+    assert stats["by_type"][1]["avg_result"] is None
+    assert stats["daily"] == [
+        {"date": date(2024, 1, 1), "count": 2},
+        {"date": date(2024, 1, 2), "count": 2},
+    ]
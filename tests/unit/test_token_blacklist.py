@@ -0,0 +1,90 @@
+# tests/unit/test_token_blacklist.py
+
+import fakeredis
+import pytest
+
+from app.auth import redis as blacklist
+from app.auth.bloom import BloomFilter
+from app.auth.redis import BlacklistFilter
+from app.core.redis_client import ManagedRedis
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    members = [f"jti-{i}" for i in range(1000)]
+    for jti in members:
+        bloom.add(jti)
+
+    assert all(jti in bloom for jti in members)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300  # ~1% expected
+
+
+def test_bloom_filter_rejects_bad_parameters():
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0, error_rate=0.01)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Point the blacklist at an in-process fake Redis with an empty local filter."""
+    redis = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(blacklist, "redis_client", ManagedRedis(client=redis))
+    monkeypatch.setattr(blacklist, "blacklist_filter", BlacklistFilter(1000, 0.001, sync_interval=60))
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_only_probable_positives_reach_redis(fake_redis):
+    await blacklist.add_to_blacklist("revoked-jti", 60)
+
+    assert await blacklist.is_blacklisted("revoked-jti")
+    for i in range(200):
+        assert not await blacklist.is_blacklisted(f"live-jti-{i}")
+
+    stats = blacklist.blacklist_filter.stats()
+    assert stats["checks"] == 201
+    assert stats["redis_checks"] <= 2  # the revoked JTI plus at most a rare false positive
+
+
+@pytest.mark.asyncio
+async def test_filter_picks_up_revocations_from_other_workers(fake_redis):
+    # Another worker shares Redis but not this process's filter
+    other_worker = BlacklistFilter(1000, 0.001, sync_interval=60)
+    await other_worker.sync(fake_redis)
+    assert not other_worker.might_contain("revoked-jti")
+
+    await blacklist.add_to_blacklist("revoked-jti", 60)
+    await other_worker.sync(fake_redis)  # not due yet
+    assert not other_worker.might_contain("revoked-jti")
+
+    await other_worker.sync(fake_redis, force=True)
+    assert other_worker.might_contain("revoked-jti")
+
+
+@pytest.mark.asyncio
+async def test_full_filter_is_rebuilt_from_redis(fake_redis):
+    small = BlacklistFilter(capacity=2, error_rate=0.01, sync_interval=60)
+    for jti in ("a", "b", "c"):
+        small.add(jti)
+    await fake_redis.zadd(blacklist.BLACKLIST_INDEX_KEY, {"b": 1.0})
+
+    await small.sync(fake_redis, force=True)
+    assert small.filter.count == 1
+    assert small.might_contain("b")
+
+
+@pytest.mark.asyncio
+async def test_sync_revokes_cached_tokens_of_other_workers(fake_redis):
+    from app.auth.token_cache import TokenCache
+    # This worker has the token cached; the revocation is made by another one
+    cache = TokenCache(max_entries=10, ttl_seconds=300)
+    worker = BlacklistFilter(1000, 0.001, sync_interval=60, cache=cache)
+    cache.put("token", "principal", exp=9e9, jti="revoked-jti")
+
+    await blacklist.add_to_blacklist("revoked-jti", 60)
+    assert cache.get("token") == "principal"
+
+    await worker.sync(fake_redis, force=True)
+    assert cache.get("token") is None
+    assert cache.is_revoked("revoked-jti")
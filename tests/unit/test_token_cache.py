@@ -0,0 +1,58 @@
+# tests/unit/test_token_cache.py
+
+import time
+
+from app.auth.token_cache import TokenCache, token_claims
+from app.models.user import User
+
+
+def test_hit_and_miss_counters():
+    cache = TokenCache(max_entries=10, ttl_seconds=60)
+    assert cache.get("token-a") is None
+    cache.put("token-a", "alice", exp=time.time() + 60, jti="a")
+    assert cache.get("token-a") == "alice"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TokenCache(max_entries=2, ttl_seconds=60)
+    exp = time.time() + 60
+    cache.put("a", 1, exp)
+    cache.put("b", 2, exp)
+    cache.get("a")
+    cache.put("c", 3, exp)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_entries_expire_with_token_or_ttl():
+    cache = TokenCache(max_entries=10, ttl_seconds=60)
+    cache.put("expired", 1, exp=time.time() - 1)
+    assert cache.get("expired") is None
+
+    short_ttl = TokenCache(max_entries=10, ttl_seconds=0.01)
+    short_ttl.put("token", 1, exp=time.time() + 60)
+    time.sleep(0.02)
+    assert short_ttl.get("token") is None
+
+
+def test_revoked_jti_is_not_served_or_recached():
+    cache = TokenCache(max_entries=10, ttl_seconds=60)
+    exp = time.time() + 60
+    cache.put("token", "alice", exp, jti="jti-1")
+    cache.revoke("jti-1", 60)
+
+    assert cache.is_revoked("jti-1")
+    assert cache.get("token") is None
+    cache.put("token", "alice", exp, jti="jti-1")
+    assert cache.stats()["entries"] == 0
+
+
+def test_token_claims_reads_exp_and_jti():
+    token = User.create_access_token({"sub": "4f7a2c4e-1b5b-4a57-9a1e-2c9f0f5d1b11"})
+    exp, jti = token_claims(token)
+    assert exp > time.time() and jti
+    assert token_claims("not-a-jwt") is None
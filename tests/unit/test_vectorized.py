@@ -0,0 +1,95 @@
+# tests/unit/test_vectorized.py
+
+import math
+import random
+from uuid import uuid4
+
+import pytest
+
+from app.models.calculation import Calculation
+from app.operations.vectorized import evaluate, evaluate_many
+
+CALCULATION_TYPES = ["addition", "subtraction", "multiplication", "division", "modulus", "exponentiate"]
+
+
+def _scalar_result(calculation_type, inputs):
+    """Result of the model's own get_result(), or None if it raises."""
+    calc = Calculation.create(calculation_type=calculation_type, user_id=uuid4(), inputs=inputs)
+    try:
+        return calc.get_result()
+    except (ArithmeticError, ValueError):
+        return None
+
+
+@pytest.mark.parametrize("calculation_type", CALCULATION_TYPES)
+def test_evaluate_matches_scalar_path_exactly(calculation_type):
+    """Vectorized results are bit-identical to get_result() for every row."""
+    rng = random.Random(601)
+    rows = [
+        [rng.choice([rng.uniform(-50, 50), rng.uniform(0, 3), float(rng.randint(-5, 5))])
+         for _ in range(rng.randint(2, 7))]
+        for _ in range(2000)
+    ]
+    results, errors = evaluate(calculation_type, rows)
+
+    for i, row in enumerate(rows):
+        expected = _scalar_result(calculation_type, row)
+        if expected is None or isinstance(expected, complex):
+            assert i in errors
+        else:
+            assert i not in errors
+            assert results[i] == expected or (math.isnan(expected) and math.isnan(results[i]))
+            assert math.copysign(1, results[i]) == math.copysign(1, expected)
+
+
+def test_evaluate_reports_zero_divisors_per_row():
+    results, errors = evaluate("division", [[10, 2], [10, 0, 5], [9, 3, 3]])
+    assert results[0] == 5 and results[2] == 1
+    assert errors == {1: "Cannot divide by zero."}
+
+    _, errors = evaluate("modulus", [[10, 3], [10, 0]])
+    assert errors == {1: "Cannot perform modulus by zero."}
+
+
+def test_evaluate_invalid_rows():
+    _, errors = evaluate("addition", [[1, 2], [1], "nope", [1, "x"]])
+    assert errors == {
+        1: "Inputs must be a list with at least two numbers.",
+        2: "Inputs must be a list of numbers.",
+        3: "Inputs must be a list of numbers.",
+    }
+
+
+def test_evaluate_exponentiate_failures_match_scalar():
+    results, errors = evaluate("exponentiate", [[2, 10], [0.0, -1], [-8, 1 / 3], [1e308, 2, 0]])
+    assert results[0] == 1024
+    assert set(errors) == {1, 2, 3}
+
+
+def test_evaluate_unsupported_type():
+    with pytest.raises(ValueError, match="Unsupported calculation type"):
+        evaluate("teleportation", [[1, 2]])
+
+
+def test_evaluate_many_keeps_request_order():
+    outcomes = evaluate_many([
+        ("multiplication", [2, 3]),
+        ("addition", [1, 1]),
+        ("division", [1, 0]),
+        ("teleportation", [1, 2]),
+    ])
+    assert outcomes[0] == (6, None)
+    assert outcomes[1] == (2, None)
+    assert outcomes[2] == (None, "Cannot divide by zero.")
+    assert outcomes[3] == (None, "Unsupported calculation type: teleportation")
+
+
+def test_compute_results_assigns_results():
+    calcs = [
+        Calculation.create("addition", uuid4(), [1, 2, 3]),
+        Calculation.create("division", uuid4(), [1, 0]),
+    ]
+    errors = Calculation.compute_results(calcs)
+    assert calcs[0].result == 6
+    assert calcs[1].result is None
+    assert errors == {1: "Cannot divide by zero."}